@@ -0,0 +1,276 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+"""
+Benchmarks the tmdbsimple client with the Search* pipelines of the plugin
+against a local ReplayServer, so results do not depend on the live API,
+an API key or the network.
+
+	python benchmarks/bench_tmdb.py                   compare with baseline.json
+	python benchmarks/bench_tmdb.py --save-baseline   store a new baseline
+
+The scenarios run SearchMain.getSearchData (every menu selection, with
+empty row caches), SearchMovie.getResult (movie and tv),
+SearchSeason.getResult (20 seasons) and SearchPeople.getResult with the
+enigma2 stand-ins of the tests, so they need twisted like the plugin.
+Synthetic fixtures are generated unless --fixtures points to recorded ones.
+"""
+
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import importlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests"))
+
+import tmdbsimple as tmdb  # noqa: E402, pylint: disable=C0413
+from tmdbsimple.images import DEFAULTS as IMAGE_DEFAULTS  # noqa: E402, pylint: disable=C0413
+from standins import loadPlugin  # noqa: E402, pylint: disable=C0413
+
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+LANG = "de"
+MOVIE_ID = 603
+TV_ID = 1399
+SEASONS = 20
+EPISODES = 20
+TOLERANCE = 0.25
+# untimed calls per scenario, keep lazy imports and connection setup out of the percentiles
+WARMUP = 1
+
+
+def text(length, seed=0):
+	words = ["lorem", "ipsum", "dolor", "sit", "amet", "consetetur", "sadipscing", "elitr", "sed", "diam"]
+	return " ".join(words[(seed + i) % len(words)] for i in range(length // 6))
+
+
+def person(i):
+	return {"id": 1000 + i, "name": "Person %s" % i, "character": "Character %s" % i, "job": ["Director", "Writer", "Producer"][i % 3], "profile_path": "/p%s.jpg" % i, "credit_id": "c%s" % i, "popularity": 1.5}
+
+
+def credits(cast=60, crew=120):
+	return {"id": MOVIE_ID, "cast": [person(i) for i in range(cast)], "crew": [person(i) for i in range(crew)]}
+
+
+def movie():
+	return {
+		"id": MOVIE_ID, "title": "Movie", "overview": text(600), "tagline": text(60), "release_date": "1999-03-30",
+		"vote_average": 8.2, "vote_count": 22000, "runtime": 136, "poster_path": "/poster.jpg", "backdrop_path": "/backdrop.jpg",
+		"genres": [{"id": i, "name": "Genre %s" % i} for i in range(3)],
+		"production_countries": [{"iso_3166_1": "US", "name": "United States"}],
+		"production_companies": [{"id": i, "name": "Company %s" % i} for i in range(4)],
+	}
+
+
+def tv():
+	data = movie()
+	data.update({
+		"id": TV_ID, "name": "Show", "first_air_date": "2011-04-17", "origin_country": ["US"], "number_of_seasons": SEASONS,
+		"number_of_episodes": SEASONS * EPISODES, "created_by": [{"name": "Creator"}], "networks": [{"name": "Network"}],
+		"seasons": [{"id": 3000 + n, "season_number": n, "name": "Season %s" % n, "air_date": "2011-04-17", "episode_count": EPISODES} for n in range(1, SEASONS + 1)],
+	})
+	return data
+
+
+def season(n):
+	return {
+		"id": 3000 + n, "name": "Season %s" % n, "air_date": "2011-04-17", "overview": text(300, n), "poster_path": "/s%s.jpg" % n,
+		"episodes": [{"id": 4000 + n * 100 + e, "name": "Episode %s" % e, "episode_number": e, "overview": text(400, e), "still_path": "/e%s.jpg" % e, "crew": [person(i) for i in range(6)], "guest_stars": [person(i) for i in range(8)]} for e in range(1, EPISODES + 1)],
+	}
+
+
+def results(media_type=None):
+	entries = []
+	for i in range(20):
+		entry = movie()
+		entry.update({"id": 5000 + i, "name": "Show %s" % i, "first_air_date": "2011-04-17", "profile_path": None, "popularity": 10.0 + i})
+		entry["media_type"] = media_type or ["movie", "tv", "person"][i % 3]
+		entries.append(entry)
+	return {"page": 1, "total_pages": 5, "total_results": 100, "results": entries}
+
+
+def createFixtures(fixture_dir):
+	recorder = tmdb.Recorder(fixture_dir)
+	base = "https://api.themoviedb.org/3/"
+	fixtures = {
+		"search/multi": results(),
+		"movie/now_playing": results("movie"), "movie/upcoming": results("movie"), "movie/popular": results("movie"), "movie/top_rated": results("movie"),
+		"movie/%s/similar_movies" % MOVIE_ID: results("movie"), "movie/%s/recommendations" % MOVIE_ID: results("movie"),
+		"movie/%s/credits" % MOVIE_ID: credits(),
+		"tv/%s" % TV_ID: tv(), "tv/%s/credits" % TV_ID: credits(),
+		"configuration": {"images": dict(IMAGE_DEFAULTS), "change_keys": []},
+	}
+	info = movie()
+	info.update({"videos": {"results": [{"key": "k%s" % i, "name": "Trailer %s" % i, "site": "YouTube"} for i in range(5)]}, "credits": credits(), "releases": {"countries": [{"iso_3166_1": "DE", "certification": "12"}] * 30}})
+	fixtures["movie/%s" % MOVIE_ID] = info
+	appended = tv()
+	appended.update({"credits": credits(), "content_ratings": {"results": [{"iso_3166_1": "DE", "rating": "16"}] * 20}})
+	fixtures["tv/%s?append_to_response=credits,content_ratings&language=%s" % (TV_ID, LANG)] = appended
+	for n in range(1, SEASONS + 1):
+		fixtures["tv/%s/season/%s" % (TV_ID, n)] = season(n)
+		fixtures["tv/%s/season/%s/credits" % (TV_ID, n)] = credits(40, 0)
+	for path, data in fixtures.items():
+		path, _sep, query = path.partition("?")
+		params = dict(param.split("=") for param in query.split("&")) if query else {}
+		recorder.record(base + path, params, 200, {"Content-Type": "application/json"}, json.dumps(data).encode("utf-8"))
+
+
+def importPlugin(name):
+	# a module of the plugin package, loaded with the enigma2 stand-ins unless the tests did already
+	if "tmdbplugin" not in sys.modules:
+		loadPlugin(tempfile.mkdtemp(prefix="tmdb_volatile_") + "/", LANG)
+	return importlib.import_module("tmdbplugin." + name)
+
+
+def ignore(*_args):
+	return
+
+
+def searchMain(menu_selection):
+	# every view would be a row cache hit after the first one
+	search_cache = importPlugin("SearchCache")
+	search_cache.search_cache.clear()
+	search_cache.page_cache.clear()
+	return importPlugin("SearchMain").SearchMain().getSearchData(menu_selection, "Matrix", MOVIE_ID, 1)
+
+
+def searchMovie(media):
+	importPlugin("SearchMovie").SearchMovie().getResult(MOVIE_ID if media == "movie" else TV_ID, media, ignore)
+
+
+def searchSeason():
+	importPlugin("SearchSeason").SearchSeason().getResult(TV_ID, ignore)
+
+
+def searchPeople(media):
+	importPlugin("SearchPeople").SearchPeople().getResult(MOVIE_ID if media == "movie" else TV_ID, media, ignore)
+
+
+SCENARIOS = [("SearchMain[%s]" % i, searchMain, (i,)) for i in range(7)] + [
+	("SearchMovie[movie]", searchMovie, ("movie",)),
+	("SearchMovie[tv]", searchMovie, ("tv",)),
+	("SearchSeason[%s seasons]" % SEASONS, searchSeason, ()),
+	("SearchPeople[movie]", searchPeople, ("movie",)),
+	("SearchPeople[tv]", searchPeople, ("tv",)),
+]
+
+
+def percentile(values, percent):
+	values = sorted(values)
+	return values[int(round(percent / 100.0 * (len(values) - 1)))]
+
+
+def runScenario(function, args, iterations, warmup=WARMUP):
+	for _i in range(warmup):
+		function(*args)
+	stats = tmdb.STATS = tmdb.Stats()
+	times = []
+	start = time.time()
+	for _i in range(iterations):
+		view_start = time.time()
+		function(*args)
+		times.append(time.time() - view_start)
+	wall = time.time() - start
+	tmdb.STATS = None
+	endpoints = stats.getStats()["endpoints"].values()
+	network = sum(count for entry in endpoints for status, count in entry["status"].items() if status != "none")
+	return {
+		"views_per_s": iterations / wall if wall else 0.0,
+		"p50_ms": percentile(times, 50) * 1000,
+		"p95_ms": percentile(times, 95) * 1000,
+		"p99_ms": percentile(times, 99) * 1000,
+		"requests_per_view": float(network) / iterations,
+		"bytes_per_view": float(sum(entry["bytes"] for entry in endpoints)) / iterations,
+		"wall_s": wall,
+	}
+
+
+def compare(report, baseline, tolerance):
+	regressions = []
+	for name, result in report.items():
+		base = baseline.get(name)
+		if base:
+			for metric in ["p50_ms", "p95_ms", "requests_per_view", "bytes_per_view"]:
+				if result[metric] > base[metric] * (1 + tolerance) + 0.001:
+					regressions.append("%s %s: %.1f > %.1f" % (name, metric, result[metric], base[metric]))
+	return regressions
+
+
+def main(argv):
+	parser = argparse.ArgumentParser(description="Benchmark tmdbsimple and the Search* call sequences")
+	parser.add_argument("--iterations", type=int, default=20)
+	parser.add_argument("--warmup", type=int, default=WARMUP)
+	parser.add_argument("--latency", type=float, default=0.02)
+	parser.add_argument("--jitter", type=float, default=0.005)
+	parser.add_argument("--bandwidth", type=int, default=None)
+	parser.add_argument("--fixtures", default=None)
+	parser.add_argument("--baseline", default=BASELINE)
+	parser.add_argument("--save-baseline", action="store_true")
+	parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+	parser.add_argument("--rate-limit", action="store_true", help="keep the client side rate limiter enabled")
+	args = parser.parse_args(argv)
+
+	fixture_dir = args.fixtures or tempfile.mkdtemp(prefix="tmdb_fixtures_")
+	if not args.fixtures:
+		createFixtures(fixture_dir)
+	server = tmdb.ReplayServer(fixture_dir, latency=args.latency, jitter=args.jitter, bandwidth=args.bandwidth).start()
+	tmdb.API_KEY = "benchmark"
+	tmdb.BASE_URI = server.base_uri
+	tmdb.RESPONSE_CACHE = None
+	if not args.rate_limit:
+		tmdb.RATE_LIMITER = None
+
+	report = {}
+	try:
+		print("%-24s %9s %9s %9s %9s %9s %11s" % ("scenario", "views/s", "p50 ms", "p95 ms", "p99 ms", "req/view", "bytes/view"))
+		for name, function, function_args in SCENARIOS:
+			result = report[name] = runScenario(function, function_args, args.iterations, args.warmup)
+			print("%-24s %9.1f %9.1f %9.1f %9.1f %9.1f %11d" % (
+				name, result["views_per_s"], result["p50_ms"], result["p95_ms"], result["p99_ms"], result["requests_per_view"], result["bytes_per_view"]))
+	finally:
+		server.stop()
+		tmdb.closePools()
+		if not args.fixtures:
+			shutil.rmtree(fixture_dir)
+
+	if args.save_baseline:
+		with open(args.baseline, "w") as f:
+			json.dump(report, f, indent=1, sort_keys=True, separators=(",", ": "))
+		print("baseline saved: %s" % args.baseline)
+		return 0
+	if not os.path.isfile(args.baseline):
+		print("no baseline: %s" % args.baseline)
+		return 0
+	with open(args.baseline) as f:
+		regressions = compare(report, json.load(f), args.tolerance)
+	for regression in regressions:
+		print("REGRESSION %s" % regression)
+	return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,72 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+"""
+Measures the import cost of tmdbsimple in fresh interpreters: the bare
+package import (what plugin boot pays) and the first use of an endpoint
+class (what the first lookup pays).
+
+	python benchmarks/import_time.py [--runs 10]
+"""
+
+
+import os
+import sys
+import argparse
+import subprocess
+
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+STEPS = [
+	("import tmdbsimple", "import tmdbsimple"),
+	("tmdbsimple.Movies", "import tmdbsimple; tmdbsimple.Movies"),
+	("all endpoint classes", "from tmdbsimple import *"),
+]
+SCRIPT = """
+import sys, time
+sys.path.insert(0, %r)
+start = time.time()
+%s
+print("%%f %%d" %% (time.time() - start, len(sys.modules)))
+"""
+
+
+def measure(code, runs):
+	times = []
+	modules = 0
+	for _i in range(runs):
+		output = subprocess.check_output([sys.executable, "-c", SCRIPT % (SRC, code)])
+		elapsed, modules = output.split()
+		times.append(float(elapsed))
+	return min(times) * 1000, sorted(times)[len(times) // 2] * 1000, int(modules)
+
+
+def main(argv):
+	parser = argparse.ArgumentParser(description="Measure tmdbsimple import time")
+	parser.add_argument("--runs", type=int, default=10)
+	args = parser.parse_args(argv)
+	print("%-24s %9s %9s %9s" % ("step", "min ms", "median ms", "modules"))
+	for name, code in STEPS:
+		print("%-24s %9.1f %9.1f %9d" % ((name,) + measure(code, args.runs)))
+
+
+if __name__ == "__main__":
+	main(sys.argv[1:])
@@ -0,0 +1,122 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+import os
+import re
+from twisted.internet import threads
+from Components.config import config
+from . import tmdbsimple as tmdb
+from .Debug import logger
+from .ImageCache import image_cache
+
+
+def initResponseCache():
+	if not config.plugins.tmdb.response_cache.value:
+		if tmdb.RESPONSE_CACHE:
+			tmdb.RESPONSE_CACHE.close()
+			tmdb.RESPONSE_CACHE = None
+	elif tmdb.RESPONSE_CACHE is None:
+		cache_dir = config.plugins.tmdb.cache_dir.value
+		if os.path.isdir(cache_dir):
+			path = os.path.join(cache_dir, "tmdb_cache.db")
+			logger.info("path: %s", path)
+			try:
+				tmdb.RESPONSE_CACHE = tmdb.ResponseCache(path)
+			except Exception as e:
+				logger.error("path: %s, exception: %s", path, e)
+		else:
+			logger.error("cache dir does not exist: %s", cache_dir)
+	if tmdb.RESPONSE_CACHE:
+		tmdb.RESPONSE_CACHE.max_stale = int(config.plugins.tmdb.max_stale.value) * 3600
+
+
+def initChangesSync():
+	if not config.plugins.tmdb.changes_sync.value or tmdb.RESPONSE_CACHE is None:
+		if tmdb.CHANGES_SYNC:
+			tmdb.CHANGES_SYNC.stop()
+			tmdb.CHANGES_SYNC = None
+	elif tmdb.CHANGES_SYNC is None:
+		path = os.path.join(config.plugins.tmdb.cache_dir.value, "tmdb_changes.json")
+		logger.info("path: %s", path)
+		tmdb.CHANGES_SYNC = tmdb.ChangesSync(tmdb.RESPONSE_CACHE, path).start()
+
+
+# TMDB daily id exports, e.g. movie_ids_10_18_2026.json.gz, placed in the cache dir
+EXPORT_FILE = re.compile(r"^(movie|tv_series|person)_ids_.*\.json(\.gz)?$")
+EXPORT_MIN_POPULARITY = 1.0
+
+
+def loadTitleIndex(title_index, cache_dir):
+	title_index.load()
+	for filename in sorted(os.listdir(cache_dir)):
+		match = EXPORT_FILE.match(filename)
+		if match:
+			path = os.path.join(cache_dir, filename)
+			media = {"tv_series": "tv"}.get(match.group(1), match.group(1))
+			count = title_index.importExport(path, media, EXPORT_MIN_POPULARITY)
+			logger.info("imported %s titles from: %s", count, path)
+			os.rename(path, path + ".imported")
+	title_index.save()
+	return title_index.getStats()
+
+
+def initTitleIndex():
+	cache_dir = config.plugins.tmdb.cache_dir.value
+	if tmdb.TITLE_INDEX is None and os.path.isdir(cache_dir):
+		path = os.path.join(cache_dir, "tmdb_titles.json")
+		logger.info("path: %s", path)
+		tmdb.TITLE_INDEX = tmdb.TitleIndex(path)
+		d = threads.deferToThread(loadTitleIndex, tmdb.TITLE_INDEX, cache_dir)
+		d.addCallback(lambda stats: logger.info("title index: %s", stats))
+		d.addErrback(lambda error: logger.error("title index: %s", error))
+
+
+def initImageConfig():
+	cache_dir = config.plugins.tmdb.cache_dir.value
+	path = os.path.join(cache_dir, "tmdb_images.json") if os.path.isdir(cache_dir) else None
+	if tmdb.IMAGE_CONFIG.path != path:
+		logger.info("path: %s", path)
+		tmdb.IMAGE_CONFIG = tmdb.ImageConfig(path, base_url=tmdb.IMAGE_BASE_URI)
+	# getImageUrl only reads the configuration, it is updated here at most every few days
+	d = threads.deferToThread(tmdb.IMAGE_CONFIG.refresh)
+	d.addErrback(lambda error: logger.error("image config: %s", error))
+
+
+def initImageCache():
+	cache_dir = config.plugins.tmdb.cache_dir.value
+	max_size = int(config.plugins.tmdb.image_cache_size.value) * 1024 * 1024
+	directory = os.path.join(cache_dir, "tmdb_pictures") if os.path.isdir(cache_dir) else None
+	d = threads.deferToThread(image_cache.setStore, directory, max_size)
+	d.addErrback(lambda error: logger.error("image cache: %s", error))
+
+
+def initStats():
+	if not config.plugins.tmdb.stats.value:
+		if tmdb.STATS:
+			tmdb.STATS.stop()
+			tmdb.STATS = None
+	elif tmdb.STATS is None:
+		cache_dir = config.plugins.tmdb.cache_dir.value
+		if not os.path.isdir(cache_dir):
+			cache_dir = "/tmp"
+		path = os.path.join(cache_dir, "tmdb_stats.json")
+		logger.info("path: %s", path)
+		tmdb.STATS = tmdb.Stats(path)
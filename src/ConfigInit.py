@@ -19,7 +19,7 @@
 # <http://www.gnu.org/licenses/>.
 
 
-from Components.config import config, ConfigYesNo, ConfigSelection, ConfigSubsection
+from Components.config import config, ConfigYesNo, ConfigSelection, ConfigSubsection, ConfigDirectory
 from .Debug import logger, setLogLevel, log_levels
 
 
@@ -33,7 +33,15 @@ class ConfigInit():
 		config.plugins.tmdb.backdrop_size = ConfigSelection(default="original", choices=["w300", "w780", "w1280", "original"])
 		config.plugins.tmdb.lang = ConfigSelection(default="de", choices=["de", "en", "fr", "es", "pl", "ru", "tr"])
 		config.plugins.tmdb.skip_to_movie = ConfigYesNo(default=True)
+		config.plugins.tmdb.parallel_search = ConfigYesNo(default=True)
+		config.plugins.tmdb.prefetch = ConfigYesNo(default=True)
 		config.plugins.tmdb.key_yellow = ConfigYesNo(default=True)
 		config.plugins.tmdb.internal_api_key = ConfigYesNo(default=True)
+		config.plugins.tmdb.response_cache = ConfigYesNo(default=True)
+		config.plugins.tmdb.cache_dir = ConfigDirectory(default="/media/hdd/")
+		config.plugins.tmdb.image_cache_size = ConfigSelection(default="100", choices=["0", "50", "100", "250", "500", "1000"])
+		config.plugins.tmdb.max_stale = ConfigSelection(default="24", choices=["0", "1", "6", "24", "72", "168"])
+		config.plugins.tmdb.changes_sync = ConfigYesNo(default=True)
+		config.plugins.tmdb.stats = ConfigYesNo(default=False)
 
 		setLogLevel(log_levels[config.plugins.tmdb.debug_log_level.value])
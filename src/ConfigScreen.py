@@ -52,10 +52,18 @@ class ConfigScreen(Screen, ConfigListScreen):
 		self.list = []
 		self.list.append(getConfigListEntry(_("Language:"), config.plugins.tmdb.lang))
 		self.list.append(getConfigListEntry(_("Skip to movie details for single result:"), config.plugins.tmdb.skip_to_movie))
+		self.list.append(getConfigListEntry(_("Search shorter titles in parallel:"), config.plugins.tmdb.parallel_search))
+		self.list.append(getConfigListEntry(_("Prefetch details and neighbouring pages:"), config.plugins.tmdb.prefetch))
 		self.list.append(getConfigListEntry(_("Yellow key for TMDB infos in EPGs:"), config.plugins.tmdb.key_yellow))
 		self.list.append(getConfigListEntry(_("Cover resolution:"), config.plugins.tmdb.cover_size))
 		self.list.append(getConfigListEntry(_("Backdrop resolution:"), config.plugins.tmdb.backdrop_size))
 		self.list.append(getConfigListEntry(_("Use internal TMDB API key:"), config.plugins.tmdb.internal_api_key))
+		self.list.append(getConfigListEntry(_("Cache TMDB responses:"), config.plugins.tmdb.response_cache))
+		self.list.append(getConfigListEntry(_("Cache directory:"), config.plugins.tmdb.cache_dir))
+		self.list.append(getConfigListEntry(_("Picture cache size (MB, 0 = off):"), config.plugins.tmdb.image_cache_size))
+		self.list.append(getConfigListEntry(_("Show outdated cache data while updating (hours, 0 = off):"), config.plugins.tmdb.max_stale))
+		self.list.append(getConfigListEntry(_("Update cache from TMDB changes:"), config.plugins.tmdb.changes_sync))
+		self.list.append(getConfigListEntry(_("Collect request statistics:"), config.plugins.tmdb.stats))
 		self["config"].setList(self.list)
 
 	def changedEntry(self):
@@ -0,0 +1,241 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+import os
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+import six
+from . import tmdbsimple as tmdb
+from .Debug import logger
+from .Utils import temp_dir
+
+
+# RAM tier in /var/volatile, the persistent store size is configured in the setup
+HOT_SIZE = 10 * 1024 * 1024
+# type and ident of the pictures last shown, for callers without url
+MAX_ALIASES = 1000
+# seconds to connect and to wait for a picture
+DOWNLOAD_TIMEOUT = 5
+
+
+def getFileName(url):
+	return hashlib.md5(six.ensure_binary(url)).hexdigest() + ".jpg"
+
+
+class Tier():
+	# the pictures of one directory in least recently used order
+
+	def __init__(self, directory, max_size):
+		self.directory = directory
+		self.max_size = max_size
+		self.files = OrderedDict()
+		self.size = 0
+
+	def scan(self):
+		if not os.path.isdir(self.directory):
+			os.makedirs(self.directory)
+		files = []
+		for name in os.listdir(self.directory):
+			path = self.getPath(name)
+			if name.endswith(".tmp"):
+				os.remove(path)
+			elif os.path.isfile(path):
+				stat = os.stat(path)
+				files.append((stat.st_mtime, name, stat.st_size))
+		for _mtime, name, size in sorted(files):
+			self.put(name, size)
+
+	def getPath(self, name):
+		return os.path.join(self.directory, name)
+
+	def contains(self, name):
+		return name in self.files
+
+	def touch(self, name):
+		self.files[name] = self.files.pop(name)
+
+	def put(self, name, size):
+		self.size += size - self.files.pop(name, 0)
+		self.files[name] = size
+		self.evict()
+
+	def remove(self, name):
+		self.size -= self.files.pop(name, 0)
+		try:
+			os.remove(self.getPath(name))
+		except OSError:
+			pass
+
+	def evict(self):
+		while self.files and self.size > self.max_size:
+			self.remove(next(iter(self.files)))
+
+
+class ImageCache():
+	"""
+	Keeps downloaded pictures in two least recently used tiers: a small
+	RAM tier the pictures are shown from, and an optional persistent store
+	on HDD/flash with a byte budget that survives restarts. Files are named
+	after the url, so a changed picture size is a new picture. Pictures
+	requested without url, e.g. the backdrop in ScreenSeason, are found by
+	type and ident of the last url shown for them.
+	"""
+
+	def __init__(self, hot_dir, hot_size=HOT_SIZE):
+		self.lock = threading.Lock()
+		self.hot = Tier(hot_dir, hot_size)
+		try:
+			self.hot.scan()
+		except OSError as e:
+			logger.error("directory: %s, exception: %s", hot_dir, e)
+		self.store = None
+		self.aliases = OrderedDict()
+		self.hits = 0
+		self.store_hits = 0
+		self.downloads = 0
+
+	def setStore(self, directory, max_size):
+		# scans the directory, run it in a thread
+		with self.lock:
+			store = self.store
+			if not directory or max_size <= 0:
+				self.store = None
+				return
+			if store and store.directory == directory:
+				store.max_size = max_size
+				store.evict()
+				return
+		store = Tier(directory, max_size)
+		store.scan()
+		logger.info("directory: %s, files: %s, size: %s", directory, len(store.files), store.size)
+		with self.lock:
+			self.store = store
+
+	def getName(self, atype, ident, url):
+		key = (atype, str(ident))
+		with self.lock:
+			if url:
+				self.aliases.pop(key, None)
+				self.aliases[key] = url
+				if len(self.aliases) > MAX_ALIASES:
+					self.aliases.popitem(last=False)
+			else:
+				url = self.aliases.get(key)
+		return getFileName(url) if url else None
+
+	def contains(self, name):
+		with self.lock:
+			return self.hot.contains(name)
+
+	def getHotPath(self, name):
+		with self.lock:
+			if name and self.hot.contains(name):
+				self.hot.touch(name)
+				self.hits += 1
+				return self.hot.getPath(name)
+		return None
+
+	def getPath(self, atype, ident):
+		# path of the last picture shown for atype and ident, in either tier
+		name = self.getName(atype, ident, None)
+		with self.lock:
+			if name and self.hot.contains(name):
+				return self.hot.getPath(name)
+			if name and self.store and self.store.contains(name):
+				return self.store.getPath(name)
+		return None
+
+	def getDownloadPath(self, name):
+		# downloads go to the RAM tier, add() registers them when complete
+		return self.hot.getPath(name) + ".tmp"
+
+	def removeDownload(self, name):
+		try:
+			os.remove(self.getDownloadPath(name))
+		except OSError:
+			pass
+
+	def download(self, name, url):
+		# keeps the connection to the image host open for the next picture; run it in a thread
+		tmdb.downloadFile(url, self.getDownloadPath(name), DOWNLOAD_TIMEOUT)
+		self.add(name)
+
+	def add(self, name):
+		path = self.hot.getPath(name)
+		os.rename(path + ".tmp", path)
+		with self.lock:
+			self.hot.put(name, os.path.getsize(path))
+			self.downloads += 1
+
+	def restore(self, name):
+		# copies a picture from the store to the RAM tier, returns its path or None; run it in a thread
+		with self.lock:
+			store = self.store
+			if store is None or not store.contains(name):
+				return None
+		path = self.hot.getPath(name)
+		try:
+			shutil.copyfile(store.getPath(name), path + ".tmp")
+			os.rename(path + ".tmp", path)
+			# the modification time keeps the order of the store across restarts
+			os.utime(store.getPath(name), None)
+		except (IOError, OSError) as e:
+			logger.error("name: %s, exception: %s", name, e)
+			with self.lock:
+				store.remove(name)
+			return None
+		with self.lock:
+			if store.contains(name):
+				store.touch(name)
+			self.hot.put(name, os.path.getsize(path))
+			self.store_hits += 1
+		return path
+
+	def persist(self, name):
+		# copies a downloaded picture to the store; run it in a thread
+		with self.lock:
+			store = self.store
+			if store is None or store.contains(name) or not self.hot.contains(name):
+				return
+		path = store.getPath(name)
+		try:
+			shutil.copyfile(self.hot.getPath(name), path + ".tmp")
+			os.rename(path + ".tmp", path)
+		except (IOError, OSError) as e:
+			logger.error("name: %s, exception: %s", name, e)
+			return
+		with self.lock:
+			store.put(name, os.path.getsize(path))
+
+	def getStats(self):
+		with self.lock:
+			stats = {
+				"hot_files": len(self.hot.files), "hot_size": self.hot.size,
+				"hits": self.hits, "store_hits": self.store_hits, "downloads": self.downloads
+			}
+			if self.store:
+				stats.update({"store_files": len(self.store.files), "store_size": self.store.size})
+		return stats
+
+
+image_cache = ImageCache(temp_dir)
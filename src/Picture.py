@@ -20,11 +20,14 @@
 
 
 import os
-from twisted.internet import reactor, threads
-from twisted.web.client import downloadPage
+from twisted.internet import threads
 from Tools.LoadPixmap import LoadPixmap
 from .Debug import logger
-from .Utils import temp_dir
+from .ImageCache import image_cache
+
+
+# callbacks waiting for a picture being restored or downloaded, by file name
+pending = {}
 
 
 class Picture():
@@ -33,12 +36,45 @@ class Picture():
 
 	def showPicture(self, pixmap, atype, ident, url):
 		logger.info("atype: %s, ident: %s, url: %s", atype, ident, url)
-		path = temp_dir + atype + str(ident) + ".jpg"
-		if url and not url.endswith("None") and not os.path.isfile(path):
-			threads.deferToThread(self.__downloadPicture, pixmap, url, path, self.__showPicture)
+		name = image_cache.getName(atype, ident, url)
+		path = image_cache.getHotPath(name)
+		if name and not path:
+			self.loadPicture(name, url, lambda path: self.__showPicture(pixmap, path))
 		else:
 			self.__showPicture(pixmap, path)
 
+	def prefetchPicture(self, atype, ident, url):
+		# puts a picture into the image cache without showing it
+		name = image_cache.getName(atype, ident, url)
+		if name and not image_cache.contains(name):
+			self.loadPicture(name, url, None)
+
+	def loadPicture(self, name, url, callback):
+		# restores the picture from the store or downloads it, a picture already on its way is not loaded twice
+		if name in pending:
+			pending[name].append(callback)
+			return
+		pending[name] = [callback]
+		d = threads.deferToThread(image_cache.restore, name)
+		d.addCallback(self.__gotRestored, name, url)
+		d.addErrback(self.__gotError, name, url)
+
+	def __gotRestored(self, path, name, url):
+		if path or not url:
+			self.__gotPicture(name, path)
+		else:
+			self.__downloadPicture(name, url)
+
+	def __gotError(self, error, name, url):
+		logger.debug("error: %s, url: %s", error, url)
+		image_cache.removeDownload(name)
+		self.__gotPicture(name, None)
+
+	def __gotPicture(self, name, path):
+		for callback in pending.pop(name, []):
+			if callback:
+				callback(path)
+
 	def __showPicture(self, pixmap, path):
 		logger.info("path: %s", path)
 		if pixmap and pixmap.instance:
@@ -49,13 +85,12 @@ class Picture():
 				pixmap.instance.setPixmap(LoadPixmap(path))
 				pixmap.show()
 
-	def __downloadPicture(self, pixmap, url, path, callback):
-		def downloadError(error):
-			logger.debug("error: %s, url: %s", error, url)
-			reactor.callFromThread(callback, pixmap, path)  # pylint: disable=E1101
-
-		def downloadSuccess(*_args):
-			reactor.callFromThread(callback, pixmap, path)  # pylint: disable=E1101
+	def __downloadPicture(self, name, url):
+		logger.info("url: %s, name: %s", url, name)
+		d = threads.deferToThread(image_cache.download, name, url)
+		d.addCallback(self.__gotDownload, name)
+		d.addErrback(self.__gotError, name, url)
 
-		logger.info("url: %s, path: %s", url, path)
-		downloadPage(url, path, timeout=5).addCallback(downloadSuccess).addErrback(downloadError)
+	def __gotDownload(self, _result, name):
+		threads.deferToThread(image_cache.persist, name)
+		self.__gotPicture(name, image_cache.getHotPath(name))
@@ -0,0 +1,101 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+import time
+import threading
+from . import tmdbsimple as tmdb
+from .Debug import logger
+
+
+# seconds the list selection has to rest before prefetching resumes
+PAUSE = 1.0
+# rate limiter tokens left to foreground requests
+RESERVE = 10
+
+
+class Prefetcher():
+	"""
+	Runs prefetch jobs one at a time in a background thread. A job only
+	starts while the prefetcher is not paused and the rate limiter has more
+	than RESERVE tokens left, so it never delays a foreground request.
+	"""
+
+	def __init__(self, pause=PAUSE, reserve=RESERVE):
+		self.pause_time = pause
+		self.reserve = reserve
+		self.lock = threading.Lock()
+		self.jobs = []
+		self.resume = 0
+		self.cancelled = threading.Event()
+		self.thread = None
+		self.done = 0
+		self.failed = 0
+		self.dropped = 0
+
+	def start(self, jobs):
+		# replaces the pending jobs of a previous list
+		with self.lock:
+			if self.cancelled.is_set():
+				return
+			self.dropped += len(self.jobs)
+			self.jobs = list(jobs)
+			if self.jobs and self.thread is None:
+				self.thread = threading.Thread(target=self.run)
+				self.thread.daemon = True
+				self.thread.start()
+
+	def pause(self):
+		# called on every selection change: fast scrolling keeps the prefetcher paused
+		self.resume = time.time() + self.pause_time
+
+	def cancel(self):
+		self.cancelled.set()
+		with self.lock:
+			self.dropped += len(self.jobs)
+			self.jobs = []
+
+	def isIdle(self):
+		if time.time() < self.resume:
+			return False
+		limiter = tmdb.RATE_LIMITER
+		return limiter is None or limiter.getTokens() > self.reserve
+
+	def run(self):
+		while not self.cancelled.is_set():
+			if not self.isIdle():
+				self.cancelled.wait(0.1)
+				continue
+			with self.lock:
+				if not self.jobs:
+					# under the lock, so that start() sees the thread is gone
+					self.thread = None
+					return
+				function, args = self.jobs.pop(0)
+			try:
+				function(*args)
+				self.done += 1
+			except Exception as e:
+				logger.debug("args: %s, exception: %s", args, e)
+				self.failed += 1
+
+	def getStats(self):
+		with self.lock:
+			return {"done": self.done, "failed": self.failed, "dropped": self.dropped, "pending": len(self.jobs)}
@@ -20,7 +20,8 @@
 
 import os
 import base64
-from twisted.internet import threads
+import threading
+from twisted.internet import reactor, threads
 from Components.ActionMap import HelpableActionMap
 from Components.Label import Label
 from Components.Pixmap import Pixmap
@@ -37,14 +38,23 @@ from .List import List
 from .ConfigScreen import ConfigScreen
 from .ScreenMovie import ScreenMovie
 from .ScreenPerson import ScreenPerson
-from .Utils import temp_dir, cleanText
+from .Utils import cleanText
 from .Picture import Picture
-from .FileUtils import createDirectory, deleteDirectory, readFile
+from .FileUtils import readFile
 from .Debug import logger
 from .SkinUtils import getSkinPath
 from .DelayTimer import DelayTimer
 from .Json import Json
 from .SearchMain import SearchMain
+from .SearchCache import search_cache, page_cache
+from .SearchMovie import fetchDetails
+from .Prefetcher import Prefetcher
+from .CacheUtils import initResponseCache, initChangesSync, initImageConfig, initImageCache, initTitleIndex, initStats
+from .ImageCache import image_cache
+
+
+# rows of a result list whose details are prefetched
+PREFETCH_ROWS = 3
 
 
 class ScreenMain(SearchMain, Picture, Json, Screen, HelpableScreen):
@@ -59,6 +69,12 @@ class ScreenMain(SearchMain, Picture, Json, Screen, HelpableScreen):
 
 		self.api_key_file = "/etc/enigma2/tmdb_key.txt"
 		tmdb.API_KEY = self.getApiKey(self.api_key_file)
+		initResponseCache()
+		initChangesSync()
+		initImageConfig()
+		initImageCache()
+		initTitleIndex()
+		initStats()
 
 		self.title = "TMDB - The Movie Database - " + _("Overview")
 		self.menu_selection = 0
@@ -70,6 +86,8 @@ class ScreenMain(SearchMain, Picture, Json, Screen, HelpableScreen):
 		self.count = 0
 		self.service_path = ""
 		self.files_saved = False
+		self.search_token = None
+		self.prefetcher = Prefetcher()
 
 		self['searchinfo'] = Label()
 		self['key_red'] = Label(_("Exit"))
@@ -114,11 +132,11 @@ class ScreenMain(SearchMain, Picture, Json, Screen, HelpableScreen):
 
 		logger.debug("text: %s", self.text)
 
-		createDirectory(temp_dir)
 		self.onLayoutFinish.append(self.onDialogShow)
 		self["list"].onSelectionChanged.append(self.onSelectionChanged)
 
 	def onSelectionChanged(self):
+		self.prefetcher.pause()
 		DelayTimer.stopAll()
 		if config.plugins.tmdb.skip_to_movie.value and self.count == 1:
 			DelayTimer(10, self.ok)
@@ -140,16 +158,48 @@ class ScreenMain(SearchMain, Picture, Json, Screen, HelpableScreen):
 			threads.deferToThread(self.getResult, self.menu_selection, self.text, self.ident, self.page, self.gotData)
 		else:
 			if self.text:
+				self.cancelSearch()
+				token = self.search_token = threading.Event()
 				self.search_iteration = 0
 				self.search_words = self.text.split(" ")
 				self.last_text = self.text
 				self["searchinfo"].setText(_("Looking up: %s ...") % self.text)
-				self.search(0, [])
+				if config.plugins.tmdb.parallel_search.value:
+					threads.deferToThread(self.getPrefixResult, self.search_words, token, lambda totalpages, result, text: self.gotPrefixResult(token, totalpages, result, text))
+				else:
+					self.search(0, [], token)
 			else:
 				logger.debug("no search string specified")
 				self["searchinfo"].setText(_("No search string specified."))
 
-	def search(self, totalpages, result):
+	def cancelSearch(self):
+		# results of a running search are dropped, a prefix search stops issuing requests
+		if self.search_token:
+			self.search_token.set()
+
+	def gotPrefixResult(self, token, totalpages, result, text):
+		if token.is_set():
+			return
+		if not result or text != self.text:
+			# as in the sequential search, titles resolved before rank above hits for fewer words
+			index_result = self.getIndexResult(self.text)
+			if index_result:
+				logger.debug("title index: %s", index_result)
+				self.gotData(1, index_result, self.text)
+				return
+		self.last_text = text
+		self.gotData(totalpages, result, text)
+
+	def search(self, totalpages, result, token):
+		if token.is_set():
+			return
+		if not result and self.search_iteration == 1:
+			# the full text has no hits: similar titles resolved before need no round-trip per dropped word
+			result = self.getIndexResult(self.text)
+			if result:
+				logger.debug("title index: %s", result)
+				self.gotData(1, result, self.text)
+				return
 		if self.search_iteration and self.search_words:
 			del self.search_words[-1]
 			text = " ".join(self.search_words)
@@ -160,7 +210,7 @@ class ScreenMain(SearchMain, Picture, Json, Screen, HelpableScreen):
 			self.search_iteration += 1
 			self.last_text = text
 			logger.debug("iteration: %s, text: %s", self.search_iteration, text)
-			threads.deferToThread(self.getResult, self.menu_selection, text, self.ident, self.page, self.search)
+			threads.deferToThread(self.getResult, self.menu_selection, text, self.ident, self.page, lambda totalpages, result: self.search(totalpages, result, token))
 		else:
 			self.gotData(totalpages, result, self.last_text)
 
@@ -184,6 +234,40 @@ class ScreenMain(SearchMain, Picture, Json, Screen, HelpableScreen):
 				self['searchinfo'].setText(_("No results for: %s") % self.text)
 		self["list"].setList(result)
 		self.showPictures()
+		self.prefetch(result)
+
+	def prefetch(self, result):
+		jobs = []
+		if not config.plugins.tmdb.prefetch.value:
+			self.prefetcher.start(jobs)
+			return
+		if self.menu_selection and result:
+			# read ahead the pages paging goes to next, with the pictures shown first on them
+			for page in self.getNeighbourPages():
+				jobs.append((self.readAhead, (self.menu_selection, self.ident, page)))
+		# warm the response cache for the details of the first rows, ScreenMovie then opens without waiting
+		if tmdb.RESPONSE_CACHE:
+			lang = config.plugins.tmdb.lang.value
+			for row in result[:PREFETCH_ROWS]:
+				ident, media = row[0][1], row[0][2]
+				if media in ["movie", "tv"]:
+					jobs.append((fetchDetails, (ident, media, lang)))
+		self.prefetcher.start(jobs)
+
+	def getNeighbourPages(self):
+		pages = []
+		for page in [self.page + 1 if self.page < self.totalpages else 1, self.page - 1]:
+			if page >= 1 and page != self.page and page not in pages:
+				pages.append(page)
+		return pages
+
+	def readAhead(self, menu_selection, ident, page):
+		# runs in the prefetcher thread, the rows go to the page cache of getSearchData
+		_totalpages, res = self.getSearchData(menu_selection, "", ident, page)
+		if res:
+			_title, ident, _media, cover_url, backdrop_url = res[0][0]
+			reactor.callFromThread(self.prefetchPicture, "cover", ident, cover_url)  # pylint: disable=E1101
+			reactor.callFromThread(self.prefetchPicture, "backdrop", ident, backdrop_url)  # pylint: disable=E1101
 
 	def showPictures(self):
 		current = self["list"].getCurrent()
@@ -262,6 +346,7 @@ class ScreenMain(SearchMain, Picture, Json, Screen, HelpableScreen):
 		self.session.open(ConfigScreen)
 
 	def searchString(self):
+		self.cancelSearch()
 		self.menu_selection = 0
 		self.session.openWithCallback(self.goSearch, VirtualKeyBoard, title=(_("Search for Movie:")), text=self.text)
 
@@ -281,6 +366,24 @@ class ScreenMain(SearchMain, Picture, Json, Screen, HelpableScreen):
 
 	def exit(self):
 		logger.info("files_saved: %s", self.files_saved)
+		self.cancelSearch()
+		self.prefetcher.cancel()
+		logger.debug("prefetch stats: %s", self.prefetcher.getStats())
+		logger.debug("search cache stats: %s", search_cache.getStats())
+		logger.debug("page cache stats: %s", page_cache.getStats())
+		logger.debug("image cache stats: %s", image_cache.getStats())
+		if tmdb.RESPONSE_CACHE:
+			logger.debug("cache stats: %s", tmdb.RESPONSE_CACHE.getStats())
+		if tmdb.RATE_LIMITER:
+			logger.debug("rate limiter stats: %s", tmdb.RATE_LIMITER.getStats())
+		if tmdb.NEGATIVE_CACHE:
+			logger.debug("negative cache stats: %s", tmdb.NEGATIVE_CACHE.getStats())
+		if tmdb.CIRCUIT_BREAKER:
+			logger.debug("circuit breaker stats: %s", tmdb.CIRCUIT_BREAKER.getStats())
+		if tmdb.CHANGES_SYNC:
+			logger.debug("changes sync stats: %s", tmdb.CHANGES_SYNC.getStats())
+		if tmdb.TITLE_INDEX:
+			logger.debug("title index stats: %s", tmdb.TITLE_INDEX.getStats())
+			tmdb.TITLE_INDEX.save()
 		self["list"].onSelectionChanged.remove(self.onSelectionChanged)
-		deleteDirectory(temp_dir)
 		self.close(self.files_saved)
@@ -19,7 +19,7 @@
 # <http://www.gnu.org/licenses/>.
 
 import os
-from twisted.internet import threads
+from twisted.internet import threads, reactor
 from enigma import eServiceReference
 from Components.ActionMap import HelpableActionMap
 from Components.Label import Label
@@ -39,9 +39,10 @@ from .FileUtils import copyFile, writeFile, readFile, renameFile
 from .Picture import Picture
 from .Debug import logger
 from .SkinUtils import getSkinPath
-from .Utils import temp_dir
+from .ImageCache import image_cache
 from .DelayTimer import DelayTimer
 from .SearchMovie import SearchMovie
+from . import tmdbsimple as tmdb
 
 
 class ScreenMovie(SearchMovie, Picture, Screen, HelpableScreen):
@@ -133,6 +134,20 @@ class ScreenMovie(SearchMovie, Picture, Screen, HelpableScreen):
 		)
 
 		self.onLayoutFinish.append(self.onDialogShow)
+		if tmdb.RESPONSE_CACHE:
+			tmdb.RESPONSE_CACHE.addListener(self.onRefresh)
+			self.onClose.append(self.removeRefreshListener)
+
+	def removeRefreshListener(self):
+		if tmdb.RESPONSE_CACHE:
+			tmdb.RESPONSE_CACHE.removeListener(self.onRefresh)
+
+	def onRefresh(self, path, _key):
+		# called from the cache refresh thread when outdated data shown here has changed
+		base_path = "%s/%s" % (self.media, self.ident)
+		if path == base_path or path.startswith(base_path + "/"):
+			logger.info("refreshed: %s", path)
+			reactor.callFromThread(self.getData)  # pylint: disable=E1101
 
 	def onDialogShow(self):
 		logger.debug("movie: %s", self.movie)
@@ -203,8 +218,8 @@ class ScreenMovie(SearchMovie, Picture, Screen, HelpableScreen):
 			service_filename = os.path.splitext(self.service_path)[0]
 			logger.debug("service_filename: %s", service_filename)
 			if option in [3, 6, 7, 8, 9]:
-				cover = temp_dir + "cover" + ident + ".jpg"
-				if os.path.isfile(cover):
+				cover = image_cache.getPath("cover", ident)
+				if cover and os.path.isfile(cover):
 					copyFile(cover, service_filename + ".jpg")
 					msg += "\n" + _("Cover saved.")
 					self.files_saved = True
@@ -213,8 +228,8 @@ class ScreenMovie(SearchMovie, Picture, Screen, HelpableScreen):
 					msg += "\n" + _("No cover available")
 
 			if option in [4, 8, 9]:
-				backdrop = temp_dir + "backdrop" + ident + ".jpg"
-				if os.path.isfile(backdrop):
+				backdrop = image_cache.getPath("backdrop", ident)
+				if backdrop and os.path.isfile(backdrop):
 					copyFile(backdrop, service_filename + ".bdp.jpg")
 					msg += "\n" + _("Backdrop saved.")
 					self.files_saved = True
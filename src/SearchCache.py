@@ -0,0 +1,108 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+import time
+import threading
+from collections import OrderedDict
+import six
+from .Utils import cleanText
+
+
+TTL = 6 * 3600
+PAGE_TTL = 3600
+MAX_ENTRIES = 500
+MAX_SIZE = 1024 * 1024
+# rough per row overhead of the tuple, the ident and the media string
+ROW_SIZE = 200
+
+
+def getSearchKey(text, lang, page, *args):
+	# "Tatort - Der Fall" and "tatort der fall" share one entry
+	return (cleanText(text).lower(), lang, page) + args
+
+
+def getRowsSize(rows):
+	size = 0
+	for row in rows:
+		size += ROW_SIZE + sum(len(value) for value in row[0] if isinstance(value, six.string_types))
+	return size
+
+
+class SearchCache():
+	"""
+	Keeps the list rows of recent searches and menu pages in memory, keyed
+	by e.g. the normalized query, language and page, so that repeated
+	lookups need neither a request nor a parse. Least recently used
+	entries are evicted beyond max_entries or an estimated max_size bytes.
+	"""
+
+	def __init__(self, ttl=TTL, max_entries=MAX_ENTRIES, max_size=MAX_SIZE):
+		self.ttl = ttl
+		self.max_entries = max_entries
+		self.max_size = max_size
+		self.lock = threading.Lock()
+		self.entries = OrderedDict()
+		self.size = 0
+		self.hits = 0
+		self.misses = 0
+
+	def get(self, key):
+		with self.lock:
+			entry = self.entries.get(key)
+			if entry is not None and time.time() - entry[0] > self.ttl:
+				self.remove(key)
+				entry = None
+			if entry is None:
+				self.misses += 1
+				return None
+			# move to the most recently used end
+			del self.entries[key]
+			self.entries[key] = entry
+			self.hits += 1
+			return entry[1], list(entry[2])
+
+	def put(self, key, totalpages, rows):
+		rows = list(rows)
+		size = getRowsSize(rows)
+		with self.lock:
+			self.remove(key)
+			self.entries[key] = (time.time(), totalpages, rows, size)
+			self.size += size
+			while self.entries and (len(self.entries) > self.max_entries or self.size > self.max_size):
+				self.remove(next(iter(self.entries)))
+
+	def remove(self, key):
+		entry = self.entries.pop(key, None)
+		if entry is not None:
+			self.size -= entry[3]
+
+	def clear(self):
+		with self.lock:
+			self.entries.clear()
+			self.size = 0
+
+	def getStats(self):
+		with self.lock:
+			return {"entries": len(self.entries), "size": self.size, "hits": self.hits, "misses": self.misses}
+
+
+search_cache = SearchCache()
+page_cache = SearchCache(ttl=PAGE_TTL)
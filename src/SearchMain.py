@@ -18,12 +18,21 @@
 # For more information on the GNU General Public License see:
 # <http://www.gnu.org/licenses/>.
 
+import time
+import threading
 from twisted.internet import reactor
 from Components.config import config
 from . import tmdbsimple as tmdb
 from .__init__ import _
 from .Debug import logger
 from .Json import Json
+from .SearchCache import search_cache, page_cache, getSearchKey
+
+
+# concurrent requests of a prefix search
+PARALLEL = 3
+# seconds to wait for the requests of a prefix search
+JOIN_TIMEOUT = 60
 
 
 class SearchMain(Json):
@@ -32,26 +41,111 @@ class SearchMain(Json):
 		Json.__init__(self)
 
 	def getResult(self, menu_selection, text, ident, page, callback):
+		totalpages, res = self.getSearchData(menu_selection, text, ident, page)
+		reactor.callFromThread(callback, totalpages, res)  # pylint: disable=E1101
+
+	def getPrefixResult(self, words, cancelled, callback, parallel=PARALLEL):
+		# runs in a thread: searches the full text first, after a miss all shorter
+		# prefixes of words concurrently, and calls back with the longest one that has hits
+		prefixes = [" ".join(words[:count]) for count in range(len(words), 0, -1)]
+		results = [None] * len(prefixes)
+		lock = threading.Lock()
+		done = threading.Event()
+
+		def search(index):
+			try:
+				return self.getSearchData(0, prefixes[index], 0, 1)
+			except Exception as e:
+				logger.error("text: %s, exception: %s", prefixes[index], e)
+				return 0, []
+
+		def getBest():
+			# index of the longest prefix with hits once all longer ones are empty,
+			# len(prefixes) if all are empty, None while that is still open
+			for index, result in enumerate(results):
+				if result is None:
+					return None
+				if result[1]:
+					return index
+			return len(prefixes)
+
+		def worker():
+			while not cancelled.is_set() and not done.is_set():
+				with lock:
+					if not queue:
+						return
+					index = queue.pop(0)
+				result = search(index)
+				with lock:
+					results[index] = result
+					if getBest() is not None:
+						done.set()
+
+		queue = []
+		if prefixes:
+			results[0] = search(0)
+			if not results[0][1]:
+				queue = list(range(1, len(prefixes)))
+		workers = []
+		for _i in range(min(parallel, len(queue))):
+			thread = threading.Thread(target=worker)
+			thread.daemon = True
+			thread.start()
+			workers.append(thread)
+		deadline = time.time() + JOIN_TIMEOUT
+		for thread in workers:
+			thread.join(max(deadline - time.time(), 0))
+		if cancelled.is_set():
+			return
+		with lock:
+			best = getBest()
+			if best is None:
+				# workers ran into the deadline: take the longest prefix with hits so far
+				best = next((index for index, result in enumerate(results) if result and result[1]), len(prefixes))
+		if best < len(prefixes):
+			totalpages, res = results[best]
+			text = prefixes[best]
+		else:
+			totalpages, res, text = 0, [], prefixes[0] if prefixes else ""
+		logger.debug("prefixes: %s, best: %s", prefixes, text)
+		reactor.callFromThread(callback, totalpages, res, text)  # pylint: disable=E1101
+
+	def getSearchData(self, menu_selection, text, ident, page):
 		logger.info("menu_selection: %s, text: %s, ident: %s, page: %s", menu_selection, text, ident, page)
 		lang = config.plugins.tmdb.lang.value
 		res = []
 		totalpages = 0
 		json_data = {}
+		keys = ["media_type", "id", "title", "name", "release_date", "first_air_date", "poster_path", "backdrop_path", "profile_path"]
+		fields = ["total_pages"] + ["results." + key for key in keys + ["popularity"]]
+		# rows hold the image urls, so the sizes are part of the keys
+		sizes = (config.plugins.tmdb.cover_size.value, config.plugins.tmdb.backdrop_size.value)
+		if menu_selection:
+			row_cache = page_cache
+			# only similar movies and recommendations depend on the ident
+			row_key = (menu_selection, ident if menu_selection in [4, 5] else 0, lang, page) + sizes
+		else:
+			row_cache = search_cache
+			row_key = getSearchKey(text, lang, page, *sizes)
+		cached = row_cache.get(row_key)
+		if cached is not None:
+			logger.debug("row cache hit: %s", row_key)
+			return cached
 		try:
 			if menu_selection == 1:
-				json_data = tmdb.Movies().now_playing(page=page, language=lang)
+				json_data = tmdb.Movies().now_playing(page=page, language=lang, fields=fields)
 			elif menu_selection == 2:
-				json_data = tmdb.Movies().upcoming(page=page, language=lang)
+				json_data = tmdb.Movies().upcoming(page=page, language=lang, fields=fields)
 			elif menu_selection == 3:
-				json_data = tmdb.Movies().popular(page=page, language=lang)
+				json_data = tmdb.Movies().popular(page=page, language=lang, fields=fields)
 			elif menu_selection == 4:
-				json_data = tmdb.Movies(ident).similar_movies(page=page, language=lang)
+				json_data = tmdb.Movies(ident).similar_movies(page=page, language=lang, fields=fields)
 			elif menu_selection == 5:
-				json_data = tmdb.Movies(ident).recommendations(page=page, language=lang)
+				json_data = tmdb.Movies(ident).recommendations(page=page, language=lang, fields=fields)
 			elif menu_selection == 6:
-				json_data = tmdb.Movies().top_rated(page=page, language=lang)
+				json_data = tmdb.Movies().top_rated(page=page, language=lang, fields=fields)
 			else:
-				json_data = tmdb.Search().multi(query=text, language=lang)
+				json_data = tmdb.Search().multi(query=text, language=lang, fields=fields)
 			# {u'total_results': 0, u'total_pages': 0, u'page': 1, u'results': []}
 			# logger.debug("json_data: %s", json_data)
 		except Exception as e:
@@ -64,7 +158,6 @@ class SearchMain(Json):
 			for entry in results["results"]:
 				logger.debug("entry: %s", entry)
 				result = {}
-				keys = ["media_type", "id", "title", "name", "release_date", "first_air_date", "poster_path", "backdrop_path", "profile_path"]
 				self.parseJsonMultiple(result, entry, keys)
 
 				media = result["media_type"]
@@ -78,27 +171,45 @@ class SearchMain(Json):
 				profile_path = result["profile_path"]
 				backdrop_path = result["backdrop_path"]
 
-				title = ""
+				if media not in ["movie", "tv", "person"]:
+					if not menu_selection:
+						continue
+					media = "movie"
 				if media == "movie":
-					title = "%s (%s, %s)" % (title_movie, _("Movie"), date_movie[:4])
+					name, date = title_movie, date_movie
 				elif media == "tv":
-					title = "%s (%s, %s)" % (title_series, _("Series"), date_tv[:4])
-				elif media == "person":
-					title = "%s (%s)" % (title_person, _("Person"))
-				elif menu_selection:
-					media = "movie"
-					title = "%s (%s, %s)" % (title_movie, _("Movie"), date_movie[:4])
-				else:
-					media = ""
-
-				if media == "person":
-					cover_url = "http://image.tmdb.org/t/p/%s/%s" % (config.plugins.tmdb.cover_size.value, profile_path)
+					name, date = title_series, date_tv
 				else:
-					cover_url = "http://image.tmdb.org/t/p/%s/%s" % (config.plugins.tmdb.cover_size.value, cover_path)
-				backdrop_url = "http://image.tmdb.org/t/p/%s/%s" % (config.plugins.tmdb.backdrop_size.value, backdrop_path)
+					name, date = title_person, None
+					cover_path = profile_path
+				if tmdb.TITLE_INDEX and ident and name != "None":
+					tmdb.TITLE_INDEX.add(ident, media, name, date, cover_path, backdrop_path, entry.get("popularity") or 0.0)
 
-				logger.debug("ident: %s, title: %s, media: %s", ident, title, media)
-				if ident and title and media:
-					res.append(((title, ident, media, cover_url, backdrop_url), ))
+				logger.debug("ident: %s, name: %s, media: %s", ident, name, media)
+				if ident and name:
+					res.append(self.getRow(ident, media, name, date, cover_path, backdrop_path))
+			# empty results are left to the negative cache of tmdbsimple
+			if res:
+				row_cache.put(row_key, totalpages, res)
 		del json_data
-		reactor.callFromThread(callback, totalpages, res)  # pylint: disable=E1101
+		return totalpages, res
+
+	def getRow(self, ident, media, name, date, cover_path, backdrop_path):
+		if media == "movie":
+			title = "%s (%s, %s)" % (name, _("Movie"), (date or "")[:4])
+		elif media == "tv":
+			title = "%s (%s, %s)" % (name, _("Series"), (date or "")[:4])
+		else:
+			title = "%s (%s)" % (name, _("Person"))
+		kind = "profile" if media == "person" else "poster"
+		cover_url = tmdb.getImageUrl(cover_path, config.plugins.tmdb.cover_size.value, kind)
+		backdrop_url = tmdb.getImageUrl(backdrop_path, config.plugins.tmdb.backdrop_size.value, "backdrop")
+		return ((title, ident, media, cover_url, backdrop_url), )
+
+	def getIndexResult(self, text):
+		# candidates from the local title index, no network call
+		res = []
+		if tmdb.TITLE_INDEX:
+			for ident, media, name, date, cover_path, backdrop_path, _popularity in tmdb.TITLE_INDEX.lookup(text):
+				res.append(self.getRow(ident, media, name, date, cover_path, backdrop_path))
+		return res
@@ -26,6 +26,17 @@ from .Debug import logger
 from .Json import Json
 
 
+MOVIE_RESOURCES = ["info", "videos", "credits", "releases"]
+TV_RESOURCES = ["info", "credits", "content_ratings"]
+
+
+def fetchDetails(ident, media, lang):
+	# also used to prefetch details, the requests have to match to be answered from the cache
+	if media == "movie":
+		return tmdb.fetchAppended(tmdb.Movies(ident), MOVIE_RESOURCES, language=lang)
+	return tmdb.fetchAppended(tmdb.TV(ident), TV_RESOURCES, language=lang)
+
+
 class SearchMovie(Json):
 	def __init__(self):
 		Json.__init__(self)
@@ -37,7 +48,9 @@ class SearchMovie(Json):
 		try:
 			keys = ["overview", "year", "vote_average", "vote_count", "runtime", "production_countries", "production_companies", "genres", "tagline", "release_date", "seasons", "videos"]
 			if media == "movie":
-				json_data = tmdb.Movies(ident).info(language=lang, append_to_response="videos")
+				responses = fetchDetails(ident, media, lang)
+				json_data = responses["info"]
+				json_data["videos"] = responses["videos"]
 				# logger.debug("json_data: %s", json_data)
 				result = {}
 				self.parseJsonSingle(result, json_data, "overview")
@@ -46,17 +59,16 @@ class SearchMovie(Json):
 				# logger.debug("json_data: %s", json_data)
 				# logger.debug("keys: %s", keys)
 				self.parseJsonMultiple(result, json_data, keys)
-				json_data = tmdb.Movies(ident).credits(language=lang)
-				# logger.debug("json_data_cast: %s", json_data)
+				# logger.debug("json_data_cast: %s", responses["credits"])
 				keys = ["cast", "crew"]
-				self.parseJsonMultiple(result, json_data, keys)
-				json_data = tmdb.Movies(ident).releases(language=lang)
-				# logger.debug("json_data_fsk: %s", json_data)
+				self.parseJsonMultiple(result, responses["credits"], keys)
+				# logger.debug("json_data_fsk: %s", responses["releases"])
 				keys = ["countries"]
-				self.parseJsonMultiple(result, json_data, keys)
-				del json_data
+				self.parseJsonMultiple(result, responses["releases"], keys)
+				del json_data, responses
 			elif media == "tv":
-				json_data = tmdb.TV(ident).info(language=lang)
+				responses = fetchDetails(ident, media, lang)
+				json_data = responses["info"]
 				# logger.debug("json_data: %s", json_data)
 				result = {}
 				self.parseJsonSingle(result, json_data, "overview")
@@ -66,15 +78,13 @@ class SearchMovie(Json):
 				keys += ["first_air_date", "origin_country", "created_by", "networks", "number_of_seasons", "number_of_episodes"]
 				# logger.debug("keys: %s", keys)
 				self.parseJsonMultiple(result, json_data, keys)
-				json_data = tmdb.TV(ident).credits(language=lang)
-				# logger.debug("json_data_cast: %s", json_data)
+				# logger.debug("json_data_cast: %s", responses["credits"])
 				keys = ["cast", "crew"]
-				self.parseJsonMultiple(result, json_data, keys)
-				json_data = tmdb.TV(ident).content_ratings(language=lang)
-				# logger.debug("json_data_fsk: %s", json_data)
+				self.parseJsonMultiple(result, responses["credits"], keys)
+				# logger.debug("json_data_fsk: %s", responses["content_ratings"])
 				keys = ["results"]
-				self.parseJsonMultiple(result, json_data, keys)
-				del json_data
+				self.parseJsonMultiple(result, responses["content_ratings"], keys)
+				del json_data, responses
 			else:
 				raise Exception("unsupported media: %s" % media)
 		except Exception as e:
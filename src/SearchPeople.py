@@ -33,12 +33,13 @@ class SearchPeople(Json):
 		logger.info("ident: %s", ident)
 		lang = config.plugins.tmdb.lang.value
 		res = []
+		fields = ["cast." + key for key in ["id", "name", "profile_path", "character"]]
 		try:
 			if media == "movie":
-				json_data_cast = tmdb.Movies(ident).credits(language=lang)
+				json_data_cast = tmdb.Movies(ident).credits(language=lang, fields=fields)
 				logger.debug("json_data_cast: %s", json_data_cast)
 			else:
-				json_data_cast = tmdb.TV(ident).credits(language=lang)
+				json_data_cast = tmdb.TV(ident).credits(language=lang, fields=fields)
 				logger.debug("json_data_cast: %s", json_data_cast)
 				json_data_seasons = tmdb.TV(ident).info(language=lang)
 				logger.debug("json_data_seasons: %s", json_data_seasons)
@@ -56,7 +57,7 @@ class SearchPeople(Json):
 				name = result2["name"]
 				title = "%s (%s)" % (result2["name"], result2["character"])
 				cover_path = result2["profile_path"]
-				cover_url = "http://image.tmdb.org/t/p/%s/%s" % (config.plugins.tmdb.cover_size.value, cover_path)
+				cover_url = tmdb.getImageUrl(cover_path, config.plugins.tmdb.cover_size.value, "profile")
 				if cover_ident and title:
 					res.append(((title, name, cover_url, cover_ident), ))
 
@@ -77,7 +78,7 @@ class SearchPeople(Json):
 					title = "%s (%s)" % (name, date)
 					res.append(((title, name, None, ""), ))
 
-					json_data_season = tmdb.TV_Seasons(ident, season_number).credits(language=lang)
+					json_data_season = tmdb.TV_Seasons(ident, season_number).credits(language=lang, fields=fields)
 					result3 = {}
 					self.parseJsonSingle(result3, json_data_season, "cast")
 					for casts in result3["cast"]:
@@ -89,7 +90,7 @@ class SearchPeople(Json):
 						character = result4["character"]
 						title = "    %s (%s)" % (name, character)
 						cover_path = result4["profile_path"]
-						cover_url = "http://image.tmdb.org/t/p/%s/%s" % (config.plugins.tmdb.cover_size.value, cover_path)
+						cover_url = tmdb.getImageUrl(cover_path, config.plugins.tmdb.cover_size.value, "profile")
 
 						if cover_ident and title:
 							res.append(((title, name, cover_url, cover_ident), ))
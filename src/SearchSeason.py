@@ -23,6 +23,7 @@ from Components.config import config
 from . import tmdbsimple as tmdb
 from .Debug import logger
 from .Json import Json
+from .tmdbsimple.models import TV, Season
 
 
 class SearchSeason(Json):
@@ -35,44 +36,27 @@ class SearchSeason(Json):
 		res = []
 		try:
 			# Seasons
-			json_data_seasons = tmdb.TV(ident).info(language=lang)
-			result = {}
-			self.parseJsonSingle(result, json_data_seasons, "seasons")
-			for seasons in result["seasons"]:
-				result1a = {}
-				self.parseJsonMultiple(result1a, seasons, ["season_number", "id"])
-				season_ident = result1a["id"]
-				season = result1a["season_number"]
-				logger.debug("Season: %s", season)
+			tv = TV(tmdb.TV(ident).info(language=lang, fields=["seasons.season_number", "seasons.id"]))
+			for season in tv.seasons:
+				logger.debug("Season: %s", season.season_number)
 
 				# episodes
-				json_data_episodes = tmdb.TV_Seasons(ident, season).info(language=lang)
+				fields = ["name", "air_date", "title", "overview", "poster_path"] + ["episodes." + key for key in ["id", "name", "title", "episode_number", "overview", "still_path"]]
+				json_data_episodes = tmdb.TV_Seasons(ident, season.season_number).info(language=lang, fields=fields)
 				logger.debug("json_data_episodes: %s", json_data_episodes)
-				result2 = {}
-				self.parseJsonMultiple(result2, json_data_episodes, ["name", "air_date", "title", "overview", "poster_path", "episodes"])
-				air_date = "(%s)" % result2["air_date"][:4]
-				title = result2["name"]
-				title = "%s %s" % (title, air_date)
-				overview = result2["overview"]
-				cover_path = result2["poster_path"]
-				logger.debug("cover_path: %s", cover_path)
-				cover_url = "http://image.tmdb.org/t/p/%s/%s" % (config.plugins.tmdb.cover_size.value, cover_path)
+				details = Season(json_data_episodes)
+				title = "%s (%s)" % (details.name, details.air_date[:4])
+				logger.debug("cover_path: %s", details.poster_path)
+				cover_url = tmdb.getImageUrl(details.poster_path, config.plugins.tmdb.cover_size.value, "poster")
 				if ident and title:
-					res.append(((title, cover_url, overview, season_ident), ))
+					res.append(((title, cover_url, details.overview, season.id), ))
 
-				for names in result2["episodes"]:
-					result2a = {}
-					self.parseJsonMultiple(result2a, names, ["id", "name", "title", "episode_number", "overview", "still_path"])
-					episode_ident = result2a["id"]
-					title = result2a["episode_number"]
-					name = result2a["name"]
-					title = "%+6s %s" % (title, name)
-					overview = result2a["overview"]
-					cover_path = result2a["still_path"]
-					logger.debug("cover_path: %s", cover_path)
-					cover_url = "http://image.tmdb.org/t/p/%s/%s" % (config.plugins.tmdb.cover_size.value, cover_path)
+				for episode in details.episodes:
+					title = "%+6s %s" % (episode.episode_number, episode.name)
+					logger.debug("cover_path: %s", episode.still_path)
+					cover_url = tmdb.getImageUrl(episode.still_path, config.plugins.tmdb.cover_size.value, "still")
 					if ident and title:
-						res.append(((title, cover_url, overview, episode_ident), ))
+						res.append(((title, cover_url, episode.overview, episode.id), ))
 		except Exception as e:
 			logger.error("exception: %s", e)
 			res = []
@@ -11,7 +11,6 @@
 
 from Screens.EpgSelection import EPGSelection
 from Components.ActionMap import ActionMap
-from .ScreenMain import ScreenMain
 from .__init__ import _
 
 
@@ -31,6 +30,7 @@ def EPGSelection__init__(self, session, service, zapFunc=None, eventid=None, bou
 	baseEPGSelection__init__(self, session, service, zapFunc, eventid, bouquetChangeCB, serviceChangeCB)
 
 	def yellowClicked():
+		from .ScreenMain import ScreenMain
 		cur = self["list"].getCurrent()
 		if cur[0] is not None:
 			name = cur[0].getEventName()
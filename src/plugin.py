@@ -26,10 +26,12 @@ from .Debug import logger
 from .Version import VERSION
 from .ConfigInit import ConfigInit
 from .TMDBEpgSelection import initEPGSelection
-from .ScreenMain import ScreenMain
+from . import tmdbsimple as tmdb
 
 
 def eventinfo(session, _event_name="", **__):
+	# screens are imported on first use to keep them out of the enigma boot
+	from .ScreenMain import ScreenMain
 	service = session.nav.getCurrentService()
 	info = service.info()
 	event = info.getEvent(0)  # 0 = now, 1 = next
@@ -39,6 +41,7 @@ def eventinfo(session, _event_name="", **__):
 
 def movieList(session, service, **__):
 	logger.info("...")
+	from .ScreenMain import ScreenMain
 	session.open(ScreenMain, service, 1)
 
 
@@ -51,6 +54,13 @@ def autoStart(reason, **kwargs):
 				initEPGSelection()
 	elif reason == 1:  # shutdown
 		logger.info("--- shutdown")
+		if tmdb.isLoaded("WebRequests"):
+			logger.debug("pool stats: %s", tmdb.getPoolStats())
+			tmdb.closePools()
+		if tmdb.CHANGES_SYNC:
+			tmdb.CHANGES_SYNC.stop()
+		if tmdb.STATS:
+			tmdb.STATS.stop()
 	else:
 		logger.info("reason not handled: %s", reason)
 
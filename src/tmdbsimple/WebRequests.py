@@ -20,10 +20,53 @@
 
 
 import random
-import requests
+import threading
+from six.moves.urllib.parse import urlparse
 # from .Debug import logger
 
 
+# connect and read timeout in seconds, used unless REQUESTS_TIMEOUT is set
+TIMEOUT = (5, 15)
+sessions = {}
+sessions_lock = threading.Lock()
+
+
+def getPoolStats():
+	stats = {}
+	with sessions_lock:
+		for host, session in sessions.items():
+			num_requests = num_connections = 0
+			for adapter in set(session.adapters.values()):
+				pools = adapter.poolmanager.pools
+				for key in pools.keys():
+					pool = pools.get(key)
+					if pool:
+						num_requests += pool.num_requests
+						num_connections += pool.num_connections
+			stats[host] = {
+				"requests": num_requests,
+				"connections": num_connections,
+				"reused": max(0, num_requests - num_connections)
+			}
+	return stats
+
+
+def closePools():
+	with sessions_lock:
+		for session in sessions.values():
+			session.close()
+		sessions.clear()
+
+
+def downloadFile(url, path, timeout=None):
+	# e.g. a picture, through the keep-alive pool of its host; raises IOError unless the answer is 200
+	status, _headers, content = WebRequests().getResponse(url, timeout=timeout)
+	if status != 200:
+		raise IOError("%s: %s" % (status, url))
+	with open(path, "wb") as f:
+		f.write(content)
+
+
 class WebRequests():
 
 	def __init__(self):
@@ -48,14 +91,48 @@ class WebRequests():
 		return user_agent
 
 	def getSession(self):
+		# requests is imported on first use, it is the bulk of the import time
+		import requests
 		session = requests.Session()
 		session.headers.update({"user-agent": self.getUserAgent()})
 		return session
 
-	def getContent(self, url, params=None):
+	def getPooledSession(self, url):
+		host = urlparse(url).netloc
+		with sessions_lock:
+			session = sessions.get(host)
+			if session is None:
+				from . import POOL_SIZE
+				from requests.adapters import HTTPAdapter
+				session = self.getSession()
+				session.headers.update({"connection": "keep-alive"})
+				adapter = HTTPAdapter(pool_connections=2, pool_maxsize=POOL_SIZE)
+				session.mount("http://", adapter)
+				session.mount("https://", adapter)
+				sessions[host] = session
+		return session
+
+	def getResponse(self, url, params=None, headers=None, timeout=None):
 		# logger.info("url: %s", url)
-		headers = {"user-agent": self.getUserAgent()}
+		from . import RECORDER, CIRCUIT_BREAKER
 		if params is None:
 			params = {}
-		r = requests.get(url, headers=headers, params=params, allow_redirects=True, verify=False)
-		return r.content
+		if CIRCUIT_BREAKER:
+			CIRCUIT_BREAKER.check(url)
+		try:
+			r = self.getPooledSession(url).get(url, params=params, headers=headers, allow_redirects=True, verify=False, timeout=timeout or TIMEOUT)
+		except Exception:
+			if CIRCUIT_BREAKER:
+				CIRCUIT_BREAKER.failure(url)
+			raise
+		if CIRCUIT_BREAKER:
+			if r.status_code >= 500:
+				CIRCUIT_BREAKER.failure(url)
+			else:
+				CIRCUIT_BREAKER.success(url)
+		if RECORDER:
+			RECORDER.record(url, params, r.status_code, r.headers, r.content)
+		return r.status_code, r.headers, r.content
+
+	def getContent(self, url, params=None):
+		return self.getResponse(url, params)[2]
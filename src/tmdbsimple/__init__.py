@@ -23,34 +23,122 @@ __copyright__ = 'Copyright (c) 2013-2022 Celia Oakley'
 __license__ = 'GPLv3'
 
 import os
-import requests
-
-from .account import Account, Authentication, GuestSessions, Lists
-from .base import APIKeyError
-from .changes import Changes
-from .configuration import Configuration, Certifications
-from .discover import Discover
-from .find import Find, Trending
-from .genres import Genres
-from .movies import Movies, Collections, Companies, Keywords, Reviews
-from .people import People, Credits
-from .search import Search
-from .tv import TV, TV_Seasons, TV_Episodes, TV_Episode_Groups, TV_Changes, Networks
+import sys
+import threading
+import importlib
+from types import ModuleType
+
+# names are resolved on first access, so that importing the package does not
+# pull in requests, sqlite3 or a json backend before they are needed
+_LAZY = {
+    'Account': 'account', 'Authentication': 'account', 'GuestSessions': 'account', 'Lists': 'account',
+    'APIKeyError': 'base', 'RateLimitError': 'base',
+    'Changes': 'changes',
+    'Configuration': 'configuration', 'Certifications': 'configuration',
+    'Discover': 'discover',
+    'Find': 'find', 'Trending': 'find',
+    'Genres': 'genres',
+    'Movies': 'movies', 'Collections': 'movies', 'Companies': 'movies', 'Keywords': 'movies', 'Reviews': 'movies',
+    'People': 'people', 'Credits': 'people',
+    'Search': 'search',
+    'TV': 'tv', 'TV_Seasons': 'tv', 'TV_Episodes': 'tv', 'TV_Episode_Groups': 'tv', 'TV_Changes': 'tv', 'Networks': 'tv',
+    'getPoolStats': 'WebRequests', 'closePools': 'WebRequests', 'downloadFile': 'WebRequests',
+    'ResponseCache': 'cache',
+    'RateLimiter': 'ratelimit',
+    'SingleFlight': 'singleflight',
+    'batch': 'batching',
+    'fetchAppended': 'planner',
+    'iteratePages': 'pager',
+    'selectBackend': 'jsonbackend',
+    'Stats': 'stats',
+    'Recorder': 'replay', 'ReplayServer': 'replay',
+    'NegativeCache': 'breaker', 'CircuitBreaker': 'breaker', 'CircuitOpenError': 'breaker',
+    'ImageConfig': 'images', 'getImageUrl': 'images',
+    'ChangesSync': 'changesync',
+    'TitleIndex': 'titleindex',
+}
+
+# settings whose default values need a submodule, created on first access
+_DEFAULTS = {
+    'RATE_LIMITER': lambda module: module.RateLimiter(),
+    'SINGLE_FLIGHT': lambda module: module.SingleFlight(),
+    'JSON_BACKEND': lambda module: module.selectBackend()[0],
+    'JSON_LOADS': lambda module: module.selectBackend()[1],
+    'NEGATIVE_CACHE': lambda module: module.NegativeCache(),
+    'CIRCUIT_BREAKER': lambda module: module.CircuitBreaker(),
+    'IMAGE_CONFIG': lambda module: module.ImageConfig(base_url=module.IMAGE_BASE_URI),
+}
 
 __all__ = ['Account', 'Authentication', 'GuestSessions', 'Lists',
-           'APIKeyError',
+           'APIKeyError', 'RateLimitError',
            'Changes',
            'Configuration', 'Certifications',
            'Discover',
            'Find', 'Trending',
            'Genres',
            'Movies', 'Collections', 'Companies', 'Keywords', 'Reviews',
-           'People', 'Credits'
+           'People', 'Credits',
            'Search',
-           'TV', 'TV_Seasons', 'TV_Episodes', 'TV_Episode_Groups', 'TV_Changes', 'Networks'
+           'TV', 'TV_Seasons', 'TV_Episodes', 'TV_Episode_Groups', 'TV_Changes', 'Networks',
+           'getPoolStats', 'closePools', 'downloadFile',
+           'ResponseCache', 'RateLimiter', 'SingleFlight',
+           'batch', 'fetchAppended', 'iteratePages', 'selectBackend',
+           'Stats', 'Recorder', 'ReplayServer',
+           'NegativeCache', 'CircuitBreaker', 'CircuitOpenError',
+           'ImageConfig', 'getImageUrl',
+           'ChangesSync', 'TitleIndex'
            ]
 
 API_KEY = os.environ.get('TMDB_API_KEY', None)
+BASE_URI = os.environ.get('TMDB_BASE_URI', 'https://api.themoviedb.org')
+IMAGE_BASE_URI = os.environ.get('TMDB_IMAGE_BASE_URI', None)
 API_VERSION = '3'
 REQUESTS_SESSION = None
 REQUESTS_TIMEOUT = os.environ.get('TMDB_REQUESTS_TIMEOUT', None)
+POOL_SIZE = int(os.environ.get('TMDB_POOL_SIZE', 4))
+RESPONSE_CACHE = None
+STATS = None
+RECORDER = None
+CHANGES_SYNC = None
+TITLE_INDEX = None
+
+
+class _LazyModule(ModuleType):
+    """
+    Package module that imports the submodule behind a public name on first
+    access. Python 2 has no module level __getattr__, so the package replaces
+    itself in sys.modules with an instance of this class.
+    """
+    _lock = threading.RLock()
+
+    def __getattr__(self, name):
+        if name in _DEFAULTS:
+            with self._lock:
+                if name not in self.__dict__:
+                    setattr(self, name, _DEFAULTS[name](self))
+                return self.__dict__[name]
+        if name not in _LAZY:
+            raise AttributeError("module %r has no attribute %r" % (self.__name__, name))
+        with self._lock:
+            if name not in self.__dict__:
+                # importing a submodule binds it on the package, so no
+                # public name may be the name of a submodule
+                module = importlib.import_module('.' + _LAZY[name], self.__name__)
+                setattr(self, name, getattr(module, name))
+            return self.__dict__[name]
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(_LAZY) | set(_DEFAULTS))
+
+    def isLoaded(self, name):
+        """
+        Return True if the submodule has already been imported.
+        """
+        return self.__name__ + '.' + name in sys.modules
+
+
+_module = _LazyModule(__name__, __doc__)
+_module.__dict__.update(globals())
+# python 2 clears the globals of a module once it is garbage collected
+_module._original = sys.modules[__name__]
+sys.modules[__name__] = _module
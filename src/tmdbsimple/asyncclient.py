@@ -0,0 +1,291 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+import json
+import six
+from six.moves.urllib.parse import urlencode
+from zope.interface import implementer
+from twisted.internet import reactor, defer, task, threads
+from twisted.python import failure
+from twisted.internet.ssl import optionsForClientTLS
+from twisted.web.client import Agent, HTTPConnectionPool, FileBodyProducer, ResponseNeverReceived, readBody
+from twisted.web.http_headers import Headers
+from twisted.web.iweb import IPolicyForHTTPS
+from .base import TMDB, RateLimitError
+from .cache import getRequestKey
+from .singleflight import copyResult
+from .WebRequests import TIMEOUT
+from .jsonbackend import projectFields
+from .account import Account, Authentication, GuestSessions, Lists
+from .changes import Changes
+from .configuration import Configuration, Certifications
+from .discover import Discover
+from .find import Find, Trending
+from .genres import Genres
+from .movies import Movies, Collections, Companies, Keywords, Reviews
+from .people import People, Credits
+from .search import Search
+from .tv import TV, TV_Seasons, TV_Episodes, TV_Episode_Groups, TV_Changes, Networks
+
+
+agent = None
+pending = {}
+
+
+class HTTPError(Exception):
+
+	def __init__(self, status, url):
+		Exception.__init__(self, "%s: %s" % (status, url))
+		self.status = status
+
+
+@implementer(IPolicyForHTTPS)
+class WebClientContextFactory(object):
+	# sends SNI and verifies the certificate against the platform trust store
+	def creatorForNetloc(self, hostname, port):
+		return optionsForClientTLS(six.ensure_text(hostname))
+
+
+def getAgent():
+	global agent
+	if agent is None:
+		from . import POOL_SIZE
+		pool = HTTPConnectionPool(reactor, persistent=True)
+		pool.maxPersistentPerHost = POOL_SIZE
+		agent = Agent(reactor, WebClientContextFactory(), pool=pool)
+	return agent
+
+
+class AsyncTMDB(TMDB):
+	"""
+	Mixin that turns the endpoints of a TMDB class into non-blocking
+	calls: every endpoint method returns a Deferred that fires with the
+	dict representation of the JSON response. Must be used from the
+	reactor thread, the response cache is read and written in threads.
+	"""
+
+	def getDeferredResponse(self, url, params=None, headers=None, attempt=0, method=b"GET", body=None):
+		limiter = self.rate_limiter
+		wait = limiter.reserve() if limiter else 0
+
+		def checkThrottled(response):
+			if response[0] != 429:
+				return response
+			if not limiter or attempt >= limiter.retries:
+				raise RateLimitError(url)
+			limiter.throttle(attempt, getHeader(response[1], "Retry-After"))
+			return self.getDeferredResponse(url, params, headers, attempt + 1, method, body)
+
+		d = task.deferLater(reactor, wait, self.requestDeferred, url, params, headers, method, body)
+		d.addCallback(checkThrottled)
+		return d
+
+	def requestDeferred(self, url, params=None, headers=None, method=b"GET", body=None):
+		params = dict((key, six.ensure_str(value) if isinstance(value, six.text_type) else value) for key, value in (params or {}).items())
+		if params:
+			url += "?" + urlencode(params)
+		request_headers = Headers({
+			"User-Agent": [self.getUserAgent()],
+			"Accept": ["application/json"],
+		})
+		for key, value in (headers or {}).items():
+			request_headers.setRawHeaders(key, [value])
+		producer = None
+		if body is not None:
+			request_headers.setRawHeaders("Content-Type", ["application/json"])
+			producer = FileBodyProducer(six.BytesIO(body))
+
+		from . import CIRCUIT_BREAKER
+		if CIRCUIT_BREAKER:
+			try:
+				CIRCUIT_BREAKER.check(url)
+			except Exception:
+				return defer.fail()
+
+		def gotResponse(response):
+			response_headers = dict((key, values[-1]) for key, values in response.headers.getAllRawHeaders())
+			return readBody(response).addCallback(lambda content: (response.code, response_headers, content))
+
+		timed_out = []
+
+		def onTimeout():
+			timed_out.append(True)
+			d.cancel()
+
+		def gotResult(result):
+			if timer.active():
+				timer.cancel()
+			if CIRCUIT_BREAKER:
+				if isinstance(result, tuple):
+					if result[0] < 500:
+						CIRCUIT_BREAKER.success(url)
+					else:
+						CIRCUIT_BREAKER.failure(url)
+				elif timed_out or not isCancelled(result):
+					# a request cancelled by its caller says nothing about the host
+					CIRCUIT_BREAKER.failure(url)
+			return result
+
+		d = getAgent().request(method, six.ensure_binary(url), request_headers, producer)
+		d.addCallback(gotResponse)
+		timeout = self.timeout or TIMEOUT
+		timer = reactor.callLater(sum(timeout) if isinstance(timeout, tuple) else timeout, onTimeout)  # pylint: disable=E1101
+		d.addBoth(gotResult)
+		return d
+
+	def _GET(self, path, params=None):
+		fields = params.pop("fields", None) if params else None
+		params = self._get_params(params)
+		key = getRequestKey(path, params)
+		if fields:
+			key += "#" + ",".join(sorted(fields))
+		if key in pending:
+			d = defer.Deferred()
+			pending[key].append(d)
+			return d
+		pending[key] = []
+
+		def gotContent(content):
+			response = self.json_loads(content)
+			if fields:
+				response = projectFields(response, fields)
+			return response
+
+		def done(result):
+			for d in pending.pop(key):
+				d.callback(result if isinstance(result, failure.Failure) else copyResult(result))
+			return result
+
+		return self.getDeferredContent(path, params).addCallback(gotContent).addBoth(done)
+
+	def getDeferredContent(self, path, params):
+		url = self._get_complete_url(path)
+		negative_cache = self.negative_cache
+		key = getRequestKey(path, params)
+		if negative_cache:
+			content = negative_cache.get(key)
+			if content is not None:
+				return defer.succeed(content)
+		cache = self.cache
+		if cache is None:
+			def gotUncached(response):
+				if negative_cache:
+					negative_cache.putResponse(key, path, response[0], response[2])
+				return response[2]
+			return self.getDeferredResponse(url, params).addCallback(gotUncached)
+
+		# the cache is a sqlite database, its calls would block the reactor
+		def gotCached(content):
+			if content is not None:
+				return content
+			d = threads.deferToThread(cache.getConditionalHeaders, key)
+			d.addCallback(lambda headers: self.getDeferredResponse(url, params, headers))
+			return d.addCallback(gotResponse)
+
+		def gotRevalidated(content):
+			if content is not None:
+				return content
+			return self.getDeferredResponse(url, params).addCallback(gotResponse)
+
+		def gotResponse(response):
+			status, headers, content = response
+			if status == 304:
+				return threads.deferToThread(cache.revalidate, key).addCallback(gotRevalidated)
+			if negative_cache is None or not negative_cache.putResponse(key, path, status, content):
+				if status == 200:
+					d = threads.deferToThread(cache.put, key, path, content, getHeader(headers, "ETag"), getHeader(headers, "Last-Modified"))
+					return d.addCallback(lambda _result: content)
+			return content
+
+		return threads.deferToThread(cache.get, key).addCallback(gotCached)
+
+	def _request(self, method, path, params=None, payload=None):
+		url = self._get_complete_url(path)
+		params = self._get_params(params)
+		body = six.ensure_binary(json.dumps(payload)) if payload else None
+
+		def gotResponse(response):
+			status, _headers, content = response
+			if status >= 400:
+				raise HTTPError(status, url)
+			return self.json_loads(content)
+
+		d = self.getDeferredResponse(url, params, None, 0, six.ensure_binary(method), body)
+		return d.addCallback(gotResponse)
+
+
+def isCancelled(failure):
+	if failure.check(defer.CancelledError):
+		return True
+	# cancelled while waiting for the response
+	return bool(failure.check(ResponseNeverReceived)) and any(reason.check(defer.CancelledError) for reason in failure.value.reasons)
+
+
+def getHeader(headers, name):
+	name = name.lower()
+	for key, value in headers.items():
+		if six.ensure_str(key).lower() == name:
+			return six.ensure_str(value)
+	return None
+
+
+def asyncClass(cls):
+	return type("Async" + cls.__name__, (AsyncTMDB, cls), {})
+
+
+class AsyncAccount(AsyncTMDB, Account):
+
+	def info(self, **kwargs):
+		# Account.info keeps the account id of the response
+		path = self._get_path("info")
+		kwargs.update({"session_id": self.session_id})
+
+		def gotInfo(response):
+			self.id = response["id"]
+			return response
+
+		return self._GET(path, kwargs).addCallback(gotInfo)
+
+
+AsyncAuthentication = asyncClass(Authentication)
+AsyncGuestSessions = asyncClass(GuestSessions)
+AsyncLists = asyncClass(Lists)
+AsyncChanges = asyncClass(Changes)
+AsyncConfiguration = asyncClass(Configuration)
+AsyncCertifications = asyncClass(Certifications)
+AsyncDiscover = asyncClass(Discover)
+AsyncFind = asyncClass(Find)
+AsyncTrending = asyncClass(Trending)
+AsyncGenres = asyncClass(Genres)
+AsyncMovies = asyncClass(Movies)
+AsyncCollections = asyncClass(Collections)
+AsyncCompanies = asyncClass(Companies)
+AsyncKeywords = asyncClass(Keywords)
+AsyncReviews = asyncClass(Reviews)
+AsyncPeople = asyncClass(People)
+AsyncCredits = asyncClass(Credits)
+AsyncSearch = asyncClass(Search)
+AsyncTV = asyncClass(TV)
+AsyncTV_Seasons = asyncClass(TV_Seasons)
+AsyncTV_Episodes = asyncClass(TV_Episodes)
+AsyncTV_Episode_Groups = asyncClass(TV_Episode_Groups)
+AsyncTV_Changes = asyncClass(TV_Changes)
+AsyncNetworks = asyncClass(Networks)
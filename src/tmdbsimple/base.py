@@ -12,32 +12,52 @@ Created by Celia Oakley on 2013-10-31.
 """
 
 import json
-import requests
-from .WebRequests import WebRequests
+import time
+import threading
+from .WebRequests import WebRequests, TIMEOUT
+from .cache import getRequestKey
+from .jsonbackend import projectFields
 
 
 class APIKeyError(Exception):
     pass
 
 
+class RateLimitError(Exception):
+    pass
+
+
 class TMDB(WebRequests, object):
     headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'Connection': 'close'}
+               'Accept': 'application/json'}
     BASE_PATH = ''
     URLS = {}
 
     def __init__(self):
         WebRequests.__init__(self)
-        from . import API_VERSION, REQUESTS_SESSION, REQUESTS_TIMEOUT
-        self.base_uri = 'https://api.themoviedb.org'
+        from . import BASE_URI, API_VERSION, REQUESTS_SESSION, REQUESTS_TIMEOUT, RESPONSE_CACHE, RATE_LIMITER, SINGLE_FLIGHT, JSON_LOADS, STATS, NEGATIVE_CACHE
+        self.base_uri = BASE_URI
         self.base_uri += '/{version}'.format(version=API_VERSION)
         self.session = REQUESTS_SESSION
         self.timeout = REQUESTS_TIMEOUT
+        self.cache = RESPONSE_CACHE
+        self.rate_limiter = RATE_LIMITER
+        self.single_flight = SINGLE_FLIGHT
+        self.json_loads = JSON_LOADS
+        self.stats = STATS
+        self.negative_cache = NEGATIVE_CACHE
 
     def _get_path(self, key):
+        self.endpoint_key = key
         return self.BASE_PATH + self.URLS[key]
 
+    def _get_endpoint_name(self):
+        # e.g. "movies/info" or "tv_seasons/credits", also for derived classes like AsyncMovies
+        for cls in type(self).__mro__:
+            if 'URLS' in cls.__dict__:
+                return '{0}/{1}'.format(cls.__name__.lower(), getattr(self, 'endpoint_key', ''))
+        return ''
+
     def _get_id_path(self, key):
         return self._get_path(key).format(id=self.id)
 
@@ -81,38 +101,160 @@ class TMDB(WebRequests, object):
         return params
 
     def _request(self, method, path, params=None, payload=None):
+        if self.stats is None:
+            return self._request_json(method, path, params, payload)
+        return self._instrumented(self._request_json, method, path, params, payload)
+
+    def _instrumented(self, function, *args):
+        self.stats.begin()
+        start = time.time()
+        error = True
+        try:
+            response = function(*args)
+            error = False
+            return response
+        finally:
+            self.stats.end(self._get_endpoint_name(), time.time() - start, error)
+
+    def _request_json(self, method, path, params=None, payload=None):
         url = self._get_complete_url(path)
         params = self._get_params(params)
 
-        # Create a new request session if no global session is defined
-        if self.session is None:
-            response = requests.request(
-                method,
-                url,
-                params=params,
-                data=json.dumps(payload) if payload else payload,
-                headers=self.headers, timeout=self.timeout
-            )
+        # Use the shared keep-alive pool if no global session is defined
+        session = self.session
+        if session is None:
+            session = self.getPooledSession(url)
 
-        # Use the global requests session the user provided
-        else:
-            response = self.session.request(
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            response = session.request(
                 method,
                 url,
                 params=params,
                 data=json.dumps(payload) if payload else payload,
-                headers=self.headers, timeout=self.timeout
+                headers=self.headers, timeout=self.timeout or TIMEOUT
             )
+            if response.status_code != 429 or not self.rate_limiter or attempt >= self.rate_limiter.retries:
+                break
+            self.rate_limiter.throttle(attempt, response.headers.get('Retry-After'))
+            attempt += 1
 
+        if self.stats:
+            self.stats.note(status=response.status_code, size=len(response.content))
         response.raise_for_status()
         response.encoding = 'utf-8'
         return response.json()
 
+    def _fetch(self, url, params, headers=None):
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            status, response_headers, content = self.getResponse(url, params, headers, self.timeout)
+            if self.stats:
+                self.stats.note(status=status, size=len(content))
+            if status != 429:
+                return status, response_headers, content
+            if not self.rate_limiter or attempt >= self.rate_limiter.retries:
+                raise RateLimitError(url)
+            self.rate_limiter.throttle(attempt, response_headers.get('Retry-After'))
+            attempt += 1
+
     def _GET(self, path, params=None):
-        url = self._get_complete_url(path)
+        if self.stats is None:
+            return self._get_coalesced(path, params)
+        return self._instrumented(self._get_coalesced, path, params)
+
+    def _get_coalesced(self, path, params=None):
+        fields = params.pop('fields', None) if params else None
         params = self._get_params(params)
-        content = self.getContent(url, params)
-        return json.loads(content)
+        if self.single_flight is None:
+            return self._get_json(path, params, fields)
+        # concurrent identical requests share one round-trip and one parsed result
+        key = getRequestKey(path, params)
+        if fields:
+            key += '#' + ','.join(sorted(fields))
+        return self.single_flight.do(key, self._get_json, path, params, fields)
+
+    def _get_json(self, path, params, fields=None):
+        response = self.json_loads(self._get_content(path, params))
+        if fields:
+            response = projectFields(response, fields)
+        return response
+
+    def _get_content(self, path, params):
+        url = self._get_complete_url(path)
+        negative_cache = self.negative_cache
+        if self.cache is None and negative_cache is None:
+            return self._fetch(url, params)[2]
+
+        key = getRequestKey(path, params)
+        if negative_cache:
+            content = negative_cache.get(key)
+            if content is not None:
+                if self.stats:
+                    self.stats.note(cache='negative')
+                return content
+        if self.cache is None:
+            status, headers, content = self._fetch(url, params)
+            negative_cache.putResponse(key, path, status, content)
+            return content
+
+        content = self.cache.get(key)
+        if content is not None:
+            if self.stats:
+                self.stats.note(cache='hit')
+            return content
+        if self.cache.max_stale:
+            # stale-while-revalidate: answer with the expired entry, refresh it in the background
+            content = self.cache.getStale(key)
+            if content is not None:
+                if self.stats:
+                    self.stats.note(cache='stale')
+                if self.cache.startRefresh(key):
+                    thread = threading.Thread(target=self._refresh, args=(url, path, params, key, content))
+                    thread.daemon = True
+                    thread.start()
+                return content
+        # expired or unknown entry: revalidate with the stored validators, if any
+        status, headers, content = self._fetch(url, params, self.cache.getConditionalHeaders(key))
+        if status == 304:
+            content = self.cache.revalidate(key)
+            if content is not None:
+                if self.stats:
+                    self.stats.note(cache='revalidated')
+                return content
+            status, headers, content = self._fetch(url, params)
+        # 404s and empty search results only go to the short lived negative cache
+        if negative_cache is None or not negative_cache.putResponse(key, path, status, content):
+            if status == 200:
+                self.cache.put(key, path, content, headers.get('ETag'), headers.get('Last-Modified'))
+        if self.stats:
+            self.stats.note(cache='miss')
+        return content
+
+    def _refresh(self, url, path, params, key, stale):
+        cache = self.cache
+        try:
+            status, headers, content = self._fetch(url, params, cache.getConditionalHeaders(key))
+            if status == 304:
+                cache.revalidate(key)
+            elif status == 200:
+                cache.put(key, path, content, headers.get('ETag'), headers.get('Last-Modified'))
+                if content != stale:
+                    cache.notify(key, path)
+            elif status == 404:
+                cache.delete(key)
+                if self.negative_cache:
+                    self.negative_cache.putResponse(key, path, status, content)
+                cache.notify(key, path)
+        except Exception:
+            # keep serving the stale entry, e.g. while the circuit is open
+            pass
+        finally:
+            cache.endRefresh(key)
 
     def _POST(self, path, params=None, payload=None):
         return self._request('POST', path, params=params, payload=payload)
@@ -121,17 +263,8 @@ class TMDB(WebRequests, object):
         return self._request('DELETE', path, params=params, payload=payload)
 
     def _set_attrs_to_values(self, response={}):
-        return
-
-	"""
-        Set attributes to dictionary values.
-        - e.g.
-        >>> import tmdbsimple as tmdb
-        >>> movie = tmdb.Movies(103332)
-        >>> response = movie.info()
-        >>> movie.title  # instead of response['title']
         """
-        if isinstance(response, dict):
-            for key in response.keys():
-                if not hasattr(self, key) or not callable(getattr(self, key)):
-                    setattr(self, key, response[key])
+        Kept as a no-op for the endpoint methods: responses are returned as
+        dicts, use tmdbsimple.models for attribute access.
+        """
+        return
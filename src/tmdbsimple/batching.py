@@ -0,0 +1,73 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+import threading
+from six.moves import queue
+
+
+CONCURRENCY = 8
+
+
+def batch(cls, idents, method, concurrency=CONCURRENCY, **kwargs):
+	"""
+	Call an endpoint method for many ids with bounded concurrency, e.g.
+	batch(Movies, ids, 'info', language='de'), or with tuples for classes
+	taking more than one id, e.g. batch(TV_Seasons, [(1399, 1), (1399, 2)], 'info').
+
+	Yields (ident, response, error) tuples in completion order. A failing
+	id yields its exception as error without aborting the batch. All calls
+	go through TMDB._GET and therefore share the global rate limiter.
+	Closing the generator early stops the workers from starting new calls.
+	Raises ValueError right away for a concurrency below 1.
+	"""
+	if concurrency < 1:
+		raise ValueError("concurrency must be at least 1, not %s" % concurrency)
+	return _batch(cls, list(idents), method, concurrency, kwargs)
+
+
+def _batch(cls, idents, method, concurrency, kwargs):
+	jobs = queue.Queue()
+	results = queue.Queue()
+	stop = threading.Event()
+	for ident in idents:
+		jobs.put(ident)
+
+	def worker():
+		while not stop.is_set():
+			try:
+				ident = jobs.get_nowait()
+			except queue.Empty:
+				return
+			try:
+				endpoint = cls(*ident) if isinstance(ident, tuple) else cls(ident)
+				results.put((ident, getattr(endpoint, method)(**dict(kwargs)), None))
+			except Exception as e:
+				results.put((ident, None, e))
+
+	for _i in range(min(concurrency, len(idents))):
+		thread = threading.Thread(target=worker)
+		thread.daemon = True
+		thread.start()
+	try:
+		for _i in range(len(idents)):
+			yield results.get()
+	finally:
+		stop.set()
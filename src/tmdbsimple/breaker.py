@@ -0,0 +1,203 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+import re
+import time
+import threading
+from collections import OrderedDict
+from six.moves.urllib.parse import urlparse
+
+
+NEGATIVE_TTL = 10 * 60
+EMPTY_TTL = 2 * 60
+MAX_ENTRIES = 1000
+FAILURES = 3
+PROBE_INTERVAL = 10
+MAX_PROBE_INTERVAL = 120
+PROBE_TIMEOUT = 5
+EMPTY_RESULT = re.compile(br'"total_results"\s*:\s*0\b')
+
+
+class CircuitOpenError(Exception):
+	pass
+
+
+def isEmptyResult(path, content):
+	# search responses are checked on the raw body, no need to decode them here
+	return path.startswith("search/") and EMPTY_RESULT.search(content) is not None
+
+
+class NegativeCache():
+	"""
+	Short lived in-memory cache of 404 responses and empty search results,
+	keyed by request, so that an unknown id or a query without hits is not
+	asked again on every screen open.
+	"""
+
+	def __init__(self, ttl=NEGATIVE_TTL, empty_ttl=EMPTY_TTL, max_entries=MAX_ENTRIES):
+		self.ttl = ttl
+		self.empty_ttl = empty_ttl
+		self.max_entries = max_entries
+		self.entries = OrderedDict()
+		self.hits = 0
+		self.lock = threading.Lock()
+
+	def get(self, key):
+		with self.lock:
+			entry = self.entries.get(key)
+			if entry is None:
+				return None
+			if entry[0] < time.time():
+				del self.entries[key]
+				return None
+			self.hits += 1
+			return entry[1]
+
+	def put(self, key, content, ttl=None):
+		with self.lock:
+			self.entries.pop(key, None)
+			self.entries[key] = (time.time() + (ttl or self.ttl), content)
+			while len(self.entries) > self.max_entries:
+				self.entries.popitem(last=False)
+
+	def putResponse(self, key, path, status, content):
+		# returns True if the response was stored as negative
+		if status == 404:
+			self.put(key, content, self.ttl)
+		elif status == 200 and isEmptyResult(path, content):
+			self.put(key, content, self.empty_ttl)
+		else:
+			return False
+		return True
+
+	def clear(self):
+		with self.lock:
+			self.entries.clear()
+
+	def getStats(self):
+		with self.lock:
+			return {"hits": self.hits, "entries": len(self.entries)}
+
+
+class Circuit():
+
+	def __init__(self):
+		self.failures = 0
+		self.opened = 0
+		self.rejected = 0
+		self.probing = False
+
+
+class CircuitBreaker():
+	"""
+	Per-host circuit breaker: after FAILURES consecutive connection errors or
+	5xx responses the host is opened and further requests fail fast with
+	CircuitOpenError. A background thread probes the host with increasing
+	intervals and closes the circuit as soon as it answers again.
+	"""
+
+	def __init__(self, failures=FAILURES, probe_interval=PROBE_INTERVAL, max_probe_interval=MAX_PROBE_INTERVAL, probe=None):
+		self.failures = failures
+		self.probe_interval = probe_interval
+		self.max_probe_interval = max_probe_interval
+		self.probe = probe or probeHost
+		self.circuits = {}
+		self.lock = threading.Lock()
+
+	def getCircuit(self, host):
+		circuit = self.circuits.get(host)
+		if circuit is None:
+			circuit = self.circuits[host] = Circuit()
+		return circuit
+
+	def check(self, url):
+		host = urlparse(url).netloc
+		with self.lock:
+			circuit = self.circuits.get(host)
+			if circuit and circuit.opened:
+				circuit.rejected += 1
+				raise CircuitOpenError("%s is unavailable since %d seconds" % (host, time.time() - circuit.opened))
+
+	def isOpen(self, url):
+		circuit = self.circuits.get(urlparse(url).netloc)
+		return bool(circuit and circuit.opened)
+
+	def success(self, url):
+		host = urlparse(url).netloc
+		with self.lock:
+			circuit = self.circuits.get(host)
+			if circuit:
+				circuit.failures = 0
+				circuit.opened = 0
+
+	def failure(self, url):
+		parts = urlparse(url)
+		with self.lock:
+			circuit = self.getCircuit(parts.netloc)
+			circuit.failures += 1
+			if circuit.failures < self.failures or circuit.opened:
+				return
+			circuit.opened = time.time()
+			if circuit.probing:
+				return
+			circuit.probing = True
+		thread = threading.Thread(target=self.probeLoop, args=(parts.scheme + "://" + parts.netloc + "/",))
+		thread.daemon = True
+		thread.start()
+
+	def probeLoop(self, url):
+		host = urlparse(url).netloc
+		interval = self.probe_interval
+		while True:
+			time.sleep(interval)
+			try:
+				available = self.probe(url)
+			except Exception:
+				available = False
+			with self.lock:
+				circuit = self.getCircuit(host)
+				if available or not circuit.opened:
+					circuit.failures = 0
+					circuit.opened = 0
+					circuit.probing = False
+					return
+			interval = min(interval * 2, self.max_probe_interval)
+
+	def reset(self):
+		with self.lock:
+			for circuit in self.circuits.values():
+				circuit.failures = 0
+				circuit.opened = 0
+
+	def getStats(self):
+		with self.lock:
+			return dict(
+				(host, {"open": bool(circuit.opened), "failures": circuit.failures, "rejected": circuit.rejected})
+				for host, circuit in self.circuits.items()
+			)
+
+
+def probeHost(url):
+	# any http answer below 500 means the host is reachable again
+	import requests
+	response = requests.get(url, timeout=PROBE_TIMEOUT, verify=False, stream=True)
+	response.close()
+	return response.status_code < 500
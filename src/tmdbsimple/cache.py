@@ -0,0 +1,238 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+import re
+import time
+import sqlite3
+import threading
+
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# first matching pattern wins, paths are relative to the api version, e.g. "movie/603/credits"
+TTLS = [
+	(r"^(configuration|genre|certification)(/|$)", 3 * DAY),
+	(r"/(now_playing|popular|top_rated|upcoming|airing_today|on_the_air|latest)$", 15 * MINUTE),
+	(r"^(search|discover|trending)/", HOUR),
+	(r"/changes$", 15 * MINUTE),
+	(r"^(movie|tv|person|collection|network|company)/\d+", 6 * HOUR),
+]
+DEFAULT_TTL = HOUR
+MAX_SIZE = 20 * 1024 * 1024
+
+
+def getRequestKey(path, params):
+	params = sorted((key, value) for key, value in (params or {}).items() if key != "api_key")
+	return path + "?" + "&".join("%s=%s" % param for param in params) if params else path
+
+
+class ResponseCache():
+
+	def __init__(self, path, max_size=MAX_SIZE, ttls=None, default_ttl=DEFAULT_TTL, max_stale=0):
+		self.path = path
+		self.max_size = max_size
+		self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in (ttls if ttls is not None else TTLS)]
+		self.default_ttl = default_ttl
+		# seconds past the ttl an entry may still be served while it is refreshed, 0 = off
+		self.max_stale = max_stale
+		self.hits = 0
+		self.misses = 0
+		self.revalidations = 0
+		self.stale = 0
+		self.refreshing = set()
+		self.listeners = []
+		self.lock = threading.Lock()
+		self.db = sqlite3.connect(path, check_same_thread=False)
+		self.db.execute(
+			"CREATE TABLE IF NOT EXISTS responses ("
+			"key TEXT PRIMARY KEY, path TEXT, content BLOB, stored REAL, accessed REAL, size INTEGER, etag TEXT, last_modified TEXT)"
+		)
+		columns = [row[1] for row in self.db.execute("PRAGMA table_info(responses)")]
+		for column in ["etag", "last_modified"]:
+			if column not in columns:
+				self.db.execute("ALTER TABLE responses ADD COLUMN %s TEXT" % column)
+		self.db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+		self.db.execute("CREATE INDEX IF NOT EXISTS responses_path ON responses (path)")
+		self.db.commit()
+		self.size = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+	def getKey(self, path, params):
+		return getRequestKey(path, params)
+
+	def setTTL(self, pattern, ttl):
+		# replaces the ttl of an existing pattern, new patterns take precedence, None removes it
+		ttls = [(regex, value) for regex, value in self.ttls if regex.pattern != pattern]
+		if ttl is not None:
+			ttls.insert(0, (re.compile(pattern), ttl))
+		self.ttls = ttls
+
+	def getTTL(self, path):
+		for pattern, ttl in self.ttls:
+			if pattern.search(path):
+				return ttl
+		return self.default_ttl
+
+	def get(self, key):
+		with self.lock:
+			row = self.db.execute("SELECT path, content, stored FROM responses WHERE key = ?", (key,)).fetchone()
+			now = time.time()
+			if row is None or now - row[2] > self.getTTL(row[0]):
+				self.misses += 1
+				return None
+			self.hits += 1
+			self.db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+			self.db.commit()
+			return bytes(row[1])
+
+	def getStale(self, key):
+		# expired entry within max_stale, the caller is expected to refresh it
+		with self.lock:
+			row = self.db.execute("SELECT path, content, stored FROM responses WHERE key = ?", (key,)).fetchone()
+			if row is None or time.time() - row[2] > self.getTTL(row[0]) + self.max_stale:
+				return None
+			self.stale += 1
+			return bytes(row[1])
+
+	def startRefresh(self, key):
+		# returns False if a refresh of the entry is already running
+		with self.lock:
+			if key in self.refreshing:
+				return False
+			self.refreshing.add(key)
+			return True
+
+	def endRefresh(self, key):
+		with self.lock:
+			self.refreshing.discard(key)
+
+	def addListener(self, callback):
+		# callback(path, key) is called from the refresh thread when a stale entry changed
+		if callback not in self.listeners:
+			self.listeners.append(callback)
+
+	def removeListener(self, callback):
+		if callback in self.listeners:
+			self.listeners.remove(callback)
+
+	def notify(self, key, path):
+		for callback in self.listeners[:]:
+			callback(path, key)
+
+	def getConditionalHeaders(self, key):
+		headers = {}
+		with self.lock:
+			row = self.db.execute("SELECT etag, last_modified FROM responses WHERE key = ?", (key,)).fetchone()
+		if row:
+			if row[0]:
+				headers["If-None-Match"] = row[0]
+			if row[1]:
+				headers["If-Modified-Since"] = row[1]
+		return headers
+
+	def revalidate(self, key):
+		# the server answered 304 not modified: the stored body is fresh again
+		with self.lock:
+			row = self.db.execute("SELECT content FROM responses WHERE key = ?", (key,)).fetchone()
+			if row is None:
+				return None
+			now = time.time()
+			self.revalidations += 1
+			self.db.execute("UPDATE responses SET stored = ?, accessed = ? WHERE key = ?", (now, now, key))
+			self.db.commit()
+			return bytes(row[0])
+
+	def put(self, key, path, content, etag=None, last_modified=None):
+		size = len(content)
+		if size > self.max_size:
+			return
+		with self.lock:
+			now = time.time()
+			row = self.db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+			if row:
+				self.size -= row[0]
+			self.db.execute(
+				"INSERT OR REPLACE INTO responses (key, path, content, stored, accessed, size, etag, last_modified) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+				(key, path, sqlite3.Binary(content), now, now, size, etag, last_modified)
+			)
+			self.size += size
+			self.evict()
+			self.db.commit()
+
+	def evict(self):
+		if self.size > self.max_size:
+			rows = self.db.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall()
+			for key, size in rows:
+				if self.size <= self.max_size * 0.9:
+					break
+				self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+				self.size -= size
+
+	def getPaths(self, prefix):
+		# distinct paths of the entries for prefix and its subpaths, e.g. "tv/1399"
+		with self.lock:
+			rows = self.db.execute(
+				"SELECT DISTINCT path FROM responses WHERE path = ? OR substr(path, 1, ?) = ?",
+				(prefix, len(prefix) + 1, prefix + "/")
+			).fetchall()
+		return [row[0] for row in rows]
+
+	def getContentByPath(self, path):
+		with self.lock:
+			row = self.db.execute("SELECT content FROM responses WHERE path = ? LIMIT 1", (path,)).fetchone()
+		return bytes(row[0]) if row else None
+
+	def expire(self, path, subpaths=True):
+		# marks entries as expired: they are revalidated with their etag on the next request
+		with self.lock:
+			if subpaths:
+				cursor = self.db.execute(
+					"UPDATE responses SET stored = 0 WHERE path = ? OR substr(path, 1, ?) = ?",
+					(path, len(path) + 1, path + "/")
+				)
+			else:
+				cursor = self.db.execute("UPDATE responses SET stored = 0 WHERE path = ?", (path,))
+			self.db.commit()
+			return cursor.rowcount
+
+	def delete(self, key):
+		with self.lock:
+			row = self.db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+			if row:
+				self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+				self.db.commit()
+				self.size -= row[0]
+
+	def clear(self):
+		with self.lock:
+			self.db.execute("DELETE FROM responses")
+			self.db.commit()
+			self.size = 0
+
+	def getStats(self):
+		with self.lock:
+			entries = self.db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+		return {"hits": self.hits, "misses": self.misses, "revalidations": self.revalidations, "stale": self.stale, "entries": entries, "size": self.size, "max_size": self.max_size}
+
+	def close(self):
+		with self.lock:
+			self.db.close()
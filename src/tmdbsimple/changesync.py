@@ -0,0 +1,243 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+import re
+import os
+import json
+import time
+import datetime
+import threading
+
+
+MEDIA = ["movie", "tv", "person"]
+# days per changes query allowed by TMDB
+WINDOW = 14
+# longer gaps are not followed, all entries of the media are expired instead
+MAX_WINDOWS = 4
+INTERVAL = 6 * 3600
+DELAY = 60
+# ttl of id based entries while the sync is running, the feed keeps them current
+TTL = WINDOW * 24 * 3600
+# detail resources covered by the feed, lists like similar_movies or recommendations keep their own ttl
+DETAILS = [
+	"credits", "aggregate_credits", "combined_credits", "movie_credits", "tv_credits", "releases", "release_dates",
+	"content_ratings", "videos", "images", "keywords", "external_ids", "translations", "alternative_titles"
+]
+ID_PATTERN = r"^(movie|tv|person)/\d+(/season/\d+(/episode/\d+)?)?(/(%s))?$" % "|".join(DETAILS)
+SEASON_PATH = re.compile(r"^tv/\d+/season/(\d+)(?:/episode/(\d+))?")
+
+
+def getWindows(start, end):
+	# (start_date, end_date) strings of at most WINDOW days, both inclusive
+	windows = []
+	while start <= end:
+		window_end = min(start + datetime.timedelta(days=WINDOW - 1), end)
+		windows.append((start.isoformat(), window_end.isoformat()))
+		start = window_end + datetime.timedelta(days=1)
+	return windows
+
+
+def checkFeed(response, key):
+	# _GET returns error bodies as well, a failed feed must not count as "no changes"
+	if key not in response:
+		raise IOError("changes feed failed: %s" % response.get("status_message"))
+	return response
+
+
+def getToday():
+	return datetime.datetime.utcnow().date()
+
+
+class ChangesSync():
+	"""
+	Background job that follows the TMDB changes feeds since the last sync
+	and expires the cached movie, tv and person entries whose id changed.
+	For changed tv shows the seasons and episodes in the cache are checked
+	with TV_Changes, so unchanged seasons stay cached. Expired entries are
+	revalidated with their etag on the next request. The sync watermark
+	of each media is persisted to path.
+	"""
+
+	def __init__(self, cache, path=None, interval=INTERVAL, ttl=TTL):
+		self.cache = cache
+		self.path = path
+		self.interval = interval
+		self.ttl = ttl
+		self.watermarks = {}
+		self.runs = 0
+		self.expired = 0
+		self.last_run = 0
+		self.timer = None
+		self.lock = threading.Lock()
+		self.load()
+
+	def load(self):
+		if self.path and os.path.isfile(self.path):
+			try:
+				with open(self.path) as f:
+					data = json.load(f)
+				for media, date in data.get("watermarks", {}).items():
+					self.watermarks[media] = datetime.datetime.strptime(date, "%Y-%m-%d").date()
+			except Exception:
+				pass
+
+	def save(self):
+		if self.path:
+			data = {"watermarks": dict((media, date.isoformat()) for media, date in self.watermarks.items())}
+			with open(self.path, "w") as f:
+				json.dump(data, f)
+
+	def getChangedIds(self, media, windows):
+		from .changes import Changes
+		from .pager import iteratePages
+		method = getattr(Changes(), media)
+
+		def getPage(**kwargs):
+			return checkFeed(method(**kwargs), "results")
+
+		ids = set()
+		for start_date, end_date in windows:
+			for item in iteratePages(getPage, start_date=start_date, end_date=end_date):
+				ids.add(item["id"])
+		return ids
+
+	def hasChanges(self, method, windows):
+		for start_date, end_date in windows:
+			if checkFeed(method(start_date=start_date, end_date=end_date), "changes")["changes"]:
+				return True
+		return False
+
+	def getCachedIds(self, media):
+		ids = set()
+		for path in self.cache.getPaths(media):
+			ident = path.split("/")[1]
+			if ident.isdigit():
+				ids.add(int(ident))
+		return ids
+
+	def getChildIds(self, path, key, number_key):
+		# e.g. season ids by season number from a cached "tv/<id>" response
+		content = self.cache.getContentByPath(path)
+		if content is None:
+			return {}
+		try:
+			children = json.loads(content).get(key) or []
+		except ValueError:
+			return {}
+		return dict((child.get(number_key), child.get("id")) for child in children)
+
+	def expireTV(self, ident, windows):
+		from .tv import TV_Changes
+		expired = 0
+		show_path = "tv/%s" % ident
+		seasons = {}
+		for path in self.cache.getPaths(show_path):
+			match = SEASON_PATH.match(path)
+			if match:
+				seasons.setdefault(int(match.group(1)), set()).add(path)
+			else:
+				expired += self.cache.expire(path, subpaths=False)
+		season_ids = self.getChildIds(show_path, "seasons", "season_number")
+		for number, paths in seasons.items():
+			season_path = "%s/season/%s" % (show_path, number)
+			season_id = season_ids.get(number)
+			if season_id is None or self.hasChanges(TV_Changes(season_id).season, windows):
+				expired += self.cache.expire(season_path)
+				continue
+			episode_ids = self.getChildIds(season_path, "episodes", "episode_number")
+			for path in paths:
+				episode = SEASON_PATH.match(path).group(2)
+				if episode is None:
+					continue
+				episode_id = episode_ids.get(int(episode))
+				if episode_id is None or self.hasChanges(TV_Changes(episode_id).episode, windows):
+					expired += self.cache.expire(path)
+		return expired
+
+	def syncMedia(self, media, today):
+		last = self.watermarks.get(media)
+		cached = self.getCachedIds(media)
+		if last is None or (today - last).days >= WINDOW * MAX_WINDOWS:
+			# no complete feed since the entries were stored
+			return sum(self.cache.expire("%s/%s" % (media, ident)) for ident in cached)
+		if not cached:
+			return 0
+		windows = getWindows(last, today)
+		expired = 0
+		for ident in cached & self.getChangedIds(media, windows):
+			if media == "tv":
+				expired += self.expireTV(ident, windows)
+			else:
+				expired += self.cache.expire("%s/%s" % (media, ident))
+		return expired
+
+	def sync(self):
+		"""
+		Run one sync of all media, returns the number of expired entries.
+		A media whose feed could not be read keeps its watermark and is
+		retried on the next run.
+		"""
+		with self.lock:
+			today = getToday()
+			expired = 0
+			for media in MEDIA:
+				try:
+					expired += self.syncMedia(media, today)
+				except Exception:
+					continue
+				self.watermarks[media] = today
+			if len(self.watermarks) == len(MEDIA):
+				self.cache.setTTL(ID_PATTERN, self.ttl)
+			try:
+				self.save()
+			except (IOError, OSError):
+				pass
+			self.runs += 1
+			self.expired += expired
+			self.last_run = time.time()
+			return expired
+
+	def start(self, delay=DELAY):
+		self.schedule(delay)
+		return self
+
+	def schedule(self, delay):
+		self.timer = threading.Timer(delay, self.syncPeriodically)
+		self.timer.daemon = True
+		self.timer.start()
+
+	def syncPeriodically(self):
+		self.sync()
+		self.schedule(self.interval)
+
+	def stop(self):
+		if self.timer:
+			self.timer.cancel()
+			self.timer = None
+		self.cache.setTTL(ID_PATTERN, None)
+
+	def getStats(self):
+		return {
+			"runs": self.runs,
+			"expired": self.expired,
+			"last_run": self.last_run,
+			"watermarks": dict((media, date.isoformat()) for media, date in self.watermarks.items()),
+		}
@@ -0,0 +1,136 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+import os
+import json
+import time
+import threading
+import six
+
+
+REFRESH_INTERVAL = 3 * 24 * 3600
+RETRY_INTERVAL = 10 * 60
+# images part of the TMDB configuration, used until the first refresh succeeded
+DEFAULTS = {
+	"base_url": "http://image.tmdb.org/t/p/",
+	"secure_base_url": "https://image.tmdb.org/t/p/",
+	"backdrop_sizes": ["w300", "w780", "w1280", "original"],
+	"logo_sizes": ["w45", "w92", "w154", "w185", "w300", "w500", "original"],
+	"poster_sizes": ["w92", "w154", "w185", "w342", "w500", "w780", "original"],
+	"profile_sizes": ["w45", "w185", "h632", "original"],
+	"still_sizes": ["w92", "w185", "w300", "original"],
+}
+
+
+def getWidth(size):
+	# "w500" -> 500, height based and "original" sizes have no width
+	return int(size[1:]) if size.startswith("w") and size[1:].isdigit() else None
+
+
+class ImageConfig():
+	"""
+	Image base url and size ladders from Configuration.info(), persisted to
+	path. getImageUrl only reads them: call refresh() in the background,
+	e.g. at startup, it updates them at most every REFRESH_INTERVAL seconds.
+	base_url overrides the configured host, e.g. to point it at a ReplayServer.
+	"""
+
+	def __init__(self, path=None, refresh_interval=REFRESH_INTERVAL, base_url=None):
+		self.path = path
+		self.refresh_interval = refresh_interval
+		self.base_url = base_url
+		self.images = dict(DEFAULTS)
+		self.updated = 0
+		self.checked = 0
+		self.lock = threading.Lock()
+		self.load()
+
+	def load(self):
+		if self.path and os.path.isfile(self.path):
+			try:
+				with open(self.path) as f:
+					data = json.load(f)
+				self.images.update(data["images"])
+				self.updated = data["updated"]
+			except Exception:
+				pass
+
+	def save(self):
+		if self.path:
+			try:
+				with open(self.path, "w") as f:
+					json.dump({"images": self.images, "updated": self.updated}, f)
+			except (IOError, OSError):
+				pass
+
+	def refresh(self, force=False):
+		# makes a request, returns True if the configuration was updated
+		with self.lock:
+			now = time.time()
+			if not force and (now - self.updated < self.refresh_interval or now - self.checked < RETRY_INTERVAL):
+				return False
+			self.checked = now
+		try:
+			from .configuration import Configuration
+			images = Configuration().info()["images"]
+		except Exception:
+			return False
+		with self.lock:
+			self.images.update(images)
+			self.updated = time.time()
+			self.save()
+		return True
+
+	def getBaseUrl(self):
+		return self.base_url or self.images["secure_base_url"]
+
+	def getSizes(self, kind):
+		return self.images.get(kind + "_sizes") or ["original"]
+
+	def getSize(self, kind, size):
+		# the requested size if valid, else the next larger width of the ladder
+		sizes = self.getSizes(kind)
+		if size in sizes:
+			return size
+		width = getWidth(size)
+		if width:
+			for candidate in sizes:
+				candidate_width = getWidth(candidate)
+				if candidate_width and candidate_width >= width:
+					return candidate
+		return "original"
+
+	def getImageUrl(self, path, size="original", kind="poster"):
+		if not path or path == "None":
+			return None
+		url = self.getBaseUrl().rstrip("/") + "/" + self.getSize(kind, size) + "/" + path.lstrip("/")
+		return six.ensure_str(url)
+
+
+def getImageUrl(path, size="original", kind="poster"):
+	"""
+	Return the url of an image, e.g. a poster_path, in the given size, or
+	None if there is no image.
+	"""
+	from . import IMAGE_CONFIG
+	if not path or path == "None":
+		return None
+	return IMAGE_CONFIG.getImageUrl(path, size, kind)
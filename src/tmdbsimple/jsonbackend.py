@@ -0,0 +1,61 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+import importlib
+
+
+BACKENDS = ["orjson", "ujson", "json"]
+
+
+def selectBackend(backends=None):
+	# use the first importable backend, the stdlib json module is always available
+	for name in backends or BACKENDS:
+		try:
+			module = importlib.import_module(name)
+		except ImportError:
+			continue
+		return name, module.loads
+	import json
+	return "json", json.loads
+
+
+def projectFields(data, fields):
+	"""
+	Keep only the given fields of a decoded response. Nested fields are
+	dotted and apply to every element of lists, e.g.
+	["total_pages", "results.id", "results.title"].
+	"""
+	tree = {}
+	for field in fields:
+		node = tree
+		for part in field.split("."):
+			node = node.setdefault(part, {})
+	return projectTree(data, tree)
+
+
+def projectTree(data, tree):
+	if not tree:
+		return data
+	if isinstance(data, list):
+		return [projectTree(item, tree) for item in data]
+	if isinstance(data, dict):
+		return dict((key, projectTree(data[key], subtree)) for key, subtree in tree.items() if key in data)
+	return data
@@ -0,0 +1,180 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+import six
+
+
+class Model(object):
+	"""
+	Compact response model: the attributes are the keys of FIELDS, filled from
+	a response dict once, with the FIELDS default for missing or null values
+	and text converted to native str. NESTED maps list attributes to the
+	model class of their items.
+	"""
+	__slots__ = ()
+	FIELDS = {}
+	NESTED = {}
+
+	def __init__(self, data=None):
+		data = data or {}
+		for name, default in self.FIELDS.items():
+			value = data.get(name)
+			if value is None:
+				value = list(default) if isinstance(default, list) else default
+			elif name in self.NESTED:
+				value = self.NESTED[name].fromList(value)
+			elif isinstance(value, six.text_type):
+				value = six.ensure_str(value)
+			setattr(self, name, value)
+
+	@classmethod
+	def fromList(cls, items):
+		return [cls(item) for item in items or []]
+
+	def asDict(self):
+		result = {}
+		for name in self.FIELDS:
+			value = getattr(self, name)
+			if name in self.NESTED:
+				value = [item.asDict() for item in value]
+			result[name] = value
+		return result
+
+	def __repr__(self):
+		return "<%s id=%s>" % (self.__class__.__name__, getattr(self, "id", None))
+
+
+class CastMember(Model):
+	FIELDS = {
+		"id": None, "name": "", "character": "", "order": 0, "credit_id": None,
+		"profile_path": None, "gender": 0, "known_for_department": "",
+	}
+	__slots__ = tuple(FIELDS)
+
+
+class CrewMember(Model):
+	FIELDS = {
+		"id": None, "name": "", "job": "", "department": "", "credit_id": None,
+		"profile_path": None, "gender": 0,
+	}
+	__slots__ = tuple(FIELDS)
+
+
+class WithCredits(Model):
+	"""
+	Model with cast and crew, taken from the top level of a credits response
+	or from an appended "credits" object.
+	"""
+	__slots__ = ("cast", "crew")
+
+	def __init__(self, data=None):
+		Model.__init__(self, data)
+		data = data or {}
+		credits = data.get("credits") or data
+		self.cast = CastMember.fromList(credits.get("cast"))
+		self.crew = CrewMember.fromList(credits.get("crew"))
+
+	def asDict(self):
+		result = Model.asDict(self)
+		result["cast"] = [member.asDict() for member in self.cast]
+		result["crew"] = [member.asDict() for member in self.crew]
+		return result
+
+
+class Movie(WithCredits):
+	FIELDS = {
+		"id": None, "title": "", "original_title": "", "original_language": "",
+		"overview": "", "tagline": "", "release_date": "", "runtime": 0,
+		"genres": [], "production_countries": [], "production_companies": [],
+		"vote_average": 0.0, "vote_count": 0, "popularity": 0.0,
+		"poster_path": None, "backdrop_path": None, "imdb_id": None,
+		"homepage": "", "status": "", "budget": 0, "revenue": 0,
+	}
+	__slots__ = tuple(FIELDS)
+
+
+class Episode(Model):
+	FIELDS = {
+		"id": None, "name": "", "overview": "", "air_date": "",
+		"episode_number": 0, "season_number": 0, "still_path": None,
+		"vote_average": 0.0, "runtime": 0, "crew": [], "guest_stars": [],
+	}
+	NESTED = {"crew": CrewMember, "guest_stars": CastMember}
+	__slots__ = tuple(FIELDS)
+
+
+class Season(Model):
+	FIELDS = {
+		"id": None, "name": "", "overview": "", "air_date": "",
+		"season_number": 0, "episode_count": 0, "poster_path": None,
+		"episodes": [],
+	}
+	NESTED = {"episodes": Episode}
+	__slots__ = tuple(FIELDS)
+
+
+class TV(WithCredits):
+	FIELDS = {
+		"id": None, "name": "", "original_name": "", "original_language": "",
+		"overview": "", "first_air_date": "", "last_air_date": "",
+		"episode_run_time": [], "genres": [], "origin_country": [],
+		"networks": [], "created_by": [], "number_of_seasons": 0,
+		"number_of_episodes": 0, "vote_average": 0.0, "vote_count": 0,
+		"popularity": 0.0, "poster_path": None, "backdrop_path": None,
+		"homepage": "", "status": "", "seasons": [],
+	}
+	NESTED = {"seasons": Season}
+	__slots__ = tuple(FIELDS)
+
+
+class Person(Model):
+	FIELDS = {
+		"id": None, "name": "", "biography": "", "birthday": None,
+		"deathday": None, "place_of_birth": "", "gender": 0,
+		"known_for_department": "", "also_known_as": [], "profile_path": None,
+		"popularity": 0.0, "imdb_id": None, "homepage": "",
+	}
+	__slots__ = tuple(FIELDS)
+
+
+class SearchHit(Model):
+	"""
+	One row of a search or discover result. Movies have title and
+	release_date, tv shows name and first_air_date; getTitle and getDate
+	return whichever is present.
+	"""
+	FIELDS = {
+		"id": None, "media_type": "", "title": "", "name": "",
+		"original_title": "", "original_name": "", "release_date": "",
+		"first_air_date": "", "overview": "", "poster_path": None,
+		"backdrop_path": None, "profile_path": None, "popularity": 0.0,
+		"vote_average": 0.0, "vote_count": 0,
+	}
+	__slots__ = tuple(FIELDS)
+
+	def getTitle(self):
+		return self.title or self.name
+
+	def getDate(self):
+		return self.release_date or self.first_air_date
+
+	def getImagePath(self):
+		return self.poster_path or self.profile_path
@@ -0,0 +1,86 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+import threading
+
+
+PREFETCH = 2
+
+
+class PageRequest():
+
+	def __init__(self, method, page, kwargs):
+		self.event = threading.Event()
+		self.response = None
+		self.error = None
+		thread = threading.Thread(target=self.run, args=(method, page, kwargs))
+		thread.daemon = True
+		thread.start()
+
+	def run(self, method, page, kwargs):
+		try:
+			self.response = method(page=page, **dict(kwargs))
+		except Exception as e:
+			self.error = e
+		self.event.set()
+
+	def get(self):
+		self.event.wait()
+		if self.error is not None:
+			raise self.error
+		return self.response
+
+
+def iteratePages(method, prefetch=PREFETCH, max_items=None, start_page=1, **kwargs):
+	"""
+	Yield the "results" entries of a paged endpoint across all pages, e.g.
+	iteratePages(Movies().popular, language="de", max_items=100).
+
+	Once the first page has told how many pages there are, the next
+	prefetch pages are requested in the background while the consumer
+	processes the current one. Iteration ends after max_items entries,
+	after the last page, or when the consumer stops; requests never go
+	beyond the pages needed to fill max_items. With prefetch=0 each page
+	is requested only when the consumer reaches it.
+	"""
+	pages = {start_page: PageRequest(method, start_page, kwargs)}
+	last_page = None
+	page = start_page
+	count = 0
+	while True:
+		request = pages.pop(page, None) or PageRequest(method, page, kwargs)
+		response = request.get()
+		results = response.get("results") or []
+		if last_page is None:
+			last_page = max(int(response.get("total_pages") or page), page)
+			if max_items is not None and results:
+				last_page = min(last_page, page + (max_items - 1) // len(results))
+		for next_page in range(page + 1, min(page + prefetch, last_page) + 1):
+			if next_page not in pages:
+				pages[next_page] = PageRequest(method, next_page, kwargs)
+		for result in results:
+			if max_items is not None and count >= max_items:
+				return
+			count += 1
+			yield result
+		if page >= last_page or not results:
+			return
+		page += 1
@@ -0,0 +1,68 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+MAX_APPEND = 20
+
+
+def getAppendName(endpoint, resource):
+	# the append_to_response name is the sub path below the id, e.g. "/{id}/watch/providers" > "watch/providers"
+	url = endpoint.URLS.get(resource, "")
+	name = url[len("/{id}/"):] if url.startswith("/{id}/") else ""
+	if not name or "{" in name:
+		raise ValueError("%s can not be appended to %s.info" % (resource, endpoint.__class__.__name__))
+	return name
+
+
+def planAppended(endpoint, resources):
+	"""
+	Collapse the requested sub resources of an endpoint into the smallest
+	number of append_to_response chunks honouring TMDB's limit per call.
+	"info" is the base request and is always part of the first chunk.
+	"""
+	names = []
+	for resource in resources:
+		if resource != "info":
+			name = getAppendName(endpoint, resource)
+			if (resource, name) not in names:
+				names.append((resource, name))
+	return [names[i:i + MAX_APPEND] for i in range(0, len(names), MAX_APPEND)] or [[]]
+
+
+def fetchAppended(endpoint, resources, **kwargs):
+	"""
+	Fetch info plus sub resources of an endpoint with as few calls as
+	possible, e.g. fetchAppended(Movies(603), ["info", "credits", "releases"], language="de")
+	makes a single request.
+
+	Returns a dict mapping each requested resource to its own response
+	dict, as if the endpoint methods had been called one by one.
+	"""
+	result = {}
+	for chunk in planAppended(endpoint, resources):
+		params = dict(kwargs)
+		if chunk:
+			params["append_to_response"] = ",".join(name for _resource, name in chunk)
+		response = dict(endpoint.info(**params))
+		for resource, name in chunk:
+			result[resource] = response.pop(name, {})
+		if "info" not in result:
+			result["info"] = response
+	return result
@@ -0,0 +1,113 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+import time
+import random
+import threading
+from email.utils import parsedate_tz, mktime_tz
+
+
+# TMDB documents 40 requests per 10 seconds per client
+RATE = 4.0
+BURST = 40
+RETRIES = 3
+BACKOFF = 1.0
+MAX_BACKOFF = 30.0
+
+
+def parseRetryAfter(value):
+	delay = None
+	if value:
+		try:
+			delay = float(value)
+		except ValueError:
+			date = parsedate_tz(value)
+			if date:
+				delay = mktime_tz(date) - time.time()
+	return max(delay, 0) if delay is not None else None
+
+
+class RateLimiter():
+
+	def __init__(self, rate=RATE, burst=BURST, retries=RETRIES, backoff=BACKOFF):
+		self.rate = rate
+		self.burst = burst
+		self.retries = retries
+		self.backoff = backoff
+		self.tokens = float(burst)
+		self.last = time.time()
+		self.blocked_until = 0
+		self.lock = threading.Lock()
+		self.requests = 0
+		self.waits = 0
+		self.wait_time = 0.0
+		self.max_wait = 0.0
+		self.throttled = 0
+
+	def reserve(self):
+		# take a token and return how long the caller has to wait before using it
+		with self.lock:
+			now = time.time()
+			self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+			self.last = now
+			self.tokens -= 1
+			wait = max(-self.tokens / self.rate, self.blocked_until - now, 0)
+			self.requests += 1
+			if wait:
+				self.waits += 1
+				self.wait_time += wait
+				self.max_wait = max(self.max_wait, wait)
+			return wait
+
+	def getTokens(self):
+		# tokens available right now, without taking one
+		with self.lock:
+			now = time.time()
+			if now < self.blocked_until:
+				return 0.0
+			return min(self.burst, self.tokens + (now - self.last) * self.rate)
+
+	def acquire(self):
+		wait = self.reserve()
+		if wait:
+			time.sleep(wait)
+
+	def throttle(self, attempt, retry_after=None):
+		# server answered 429: hold back all callers for Retry-After or a jittered exponential backoff
+		delay = parseRetryAfter(retry_after)
+		if delay is None:
+			delay = min(self.backoff * 2 ** attempt, MAX_BACKOFF)
+		delay *= random.uniform(1.0, 1.5)
+		with self.lock:
+			self.throttled += 1
+			self.blocked_until = max(self.blocked_until, time.time() + delay)
+		return delay
+
+	def getStats(self):
+		with self.lock:
+			return {
+				"requests": self.requests,
+				"waits": self.waits,
+				"wait_time": self.wait_time,
+				"avg_wait": self.wait_time / self.waits if self.waits else 0.0,
+				"max_wait": self.max_wait,
+				"throttled": self.throttled
+			}
@@ -0,0 +1,201 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+import os
+import sys
+import json
+import time
+import random
+import socket
+import hashlib
+import threading
+import six
+from six.moves import BaseHTTPServer, socketserver
+from six.moves.urllib.parse import urlparse, parse_qsl
+from .cache import getRequestKey
+
+
+RECORDED_STATUS = [200, 404]
+
+
+class Recorder():
+	"""
+	Captures the responses seen by the transport layer into fixture files:
+	<sha1>.json holds path, query, status and content type, <sha1>.body the
+	raw body. Only 200 and 404 responses are recorded. Enable it with
+	tmdbsimple.RECORDER = Recorder(fixture_dir).
+	"""
+
+	def __init__(self, fixture_dir):
+		self.fixture_dir = fixture_dir
+		self.lock = threading.Lock()
+		if not os.path.isdir(fixture_dir):
+			os.makedirs(fixture_dir)
+
+	def record(self, url, params, status, headers, content):
+		# only final answers: a 304 has no body and would overwrite a good fixture
+		if status not in RECORDED_STATUS:
+			return False
+		key = getRequestKey(urlparse(url).path, params)
+		name = getFixtureName(key)
+		meta = {"key": key, "status": status, "content_type": headers.get("Content-Type", "application/json")}
+		with self.lock:
+			with open(os.path.join(self.fixture_dir, name + ".body"), "wb") as f:
+				f.write(content)
+			with open(os.path.join(self.fixture_dir, name + ".json"), "w") as f:
+				json.dump(meta, f)
+		return True
+
+
+def getFixtureName(key):
+	return hashlib.sha1(six.ensure_binary(key)).hexdigest()
+
+
+class ReplayHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+	protocol_version = "HTTP/1.1"
+
+	def setup(self):
+		BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+		# headers and body are written separately, avoid the delayed ack stall
+		self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+	def do_GET(self):
+		server = self.server
+		parsed = urlparse(self.path)
+		key = getRequestKey(parsed.path, dict(parse_qsl(parsed.query)))
+		meta, body = server.getFixture(key)
+		if meta is None and parsed.query:
+			# fall back to a fixture recorded for the path without parameters
+			meta, body = server.getFixture(getRequestKey(parsed.path, {}))
+		latency, error = server.getBehaviour()
+		time.sleep(latency)
+		if error:
+			status, content_type, body = error, "application/json", b'{"success": false, "status_code": 25, "status_message": "injected error"}'
+		elif meta is None:
+			status, content_type, body = 404, "application/json", b'{"success": false, "status_code": 34, "status_message": "The resource you requested could not be found."}'
+		else:
+			status, content_type = meta["status"], meta["content_type"]
+		self.send_response(status)
+		self.send_header("Content-Type", content_type)
+		self.send_header("Content-Length", str(len(body)))
+		if status == 429:
+			self.send_header("Retry-After", "1")
+		self.end_headers()
+		server.sendBody(self.wfile, body)
+
+	def log_message(self, *_args):
+		return
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+	daemon_threads = True
+
+
+class ReplayServer():
+	"""
+	Local stand-in for the TMDB API and image hosts that replays recorded
+	fixtures with configurable latency, jitter, bandwidth (bytes per
+	second) and injected errors. Point tmdbsimple.BASE_URI at base_uri and
+	every TMDB call runs offline with deterministic timing for a given seed.
+	Pictures replay only if they were downloaded through tmdbsimple, e.g.
+	by the plugin, while recording; point IMAGE_BASE_URI at base_uri plus
+	the path of the recorded image base url, e.g. base_uri + "/t/p/".
+	"""
+
+	def __init__(self, fixture_dir, port=0, latency=0.0, jitter=0.0, bandwidth=None, error_rate=0.0, error_status=500, seed=0):
+		self.fixture_dir = fixture_dir
+		self.latency = latency
+		self.jitter = jitter
+		self.bandwidth = bandwidth
+		self.error_rate = error_rate
+		self.error_status = error_status
+		self.random = random.Random(seed)
+		self.lock = threading.Lock()
+		self.httpd = ThreadingHTTPServer(("127.0.0.1", port), ReplayHandler)
+		self.httpd.getFixture = self.getFixture
+		self.httpd.getBehaviour = self.getBehaviour
+		self.httpd.sendBody = self.sendBody
+		self.port = self.httpd.server_address[1]
+		self.base_uri = "http://127.0.0.1:%s" % self.port
+		self.thread = None
+
+	def getFixture(self, key):
+		path = os.path.join(self.fixture_dir, getFixtureName(key))
+		if not os.path.isfile(path + ".json"):
+			return None, b""
+		with open(path + ".json") as f:
+			meta = json.load(f)
+		with open(path + ".body", "rb") as f:
+			body = f.read()
+		return meta, body
+
+	def getBehaviour(self):
+		with self.lock:
+			latency = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+			error = self.error_status if self.random.random() < self.error_rate else None
+		return latency, error
+
+	def sendBody(self, wfile, body):
+		if not self.bandwidth:
+			wfile.write(body)
+			return
+		chunk_size = max(1, int(self.bandwidth / 10))
+		for i in range(0, len(body), chunk_size):
+			chunk = body[i:i + chunk_size]
+			time.sleep(float(len(chunk)) / self.bandwidth)
+			wfile.write(chunk)
+
+	def start(self):
+		self.thread = threading.Thread(target=self.httpd.serve_forever)
+		self.thread.daemon = True
+		self.thread.start()
+		return self
+
+	def stop(self):
+		self.httpd.shutdown()
+		self.httpd.server_close()
+
+
+def main(argv):
+	import argparse
+	parser = argparse.ArgumentParser(description="Replay recorded TMDB responses")
+	parser.add_argument("fixture_dir")
+	parser.add_argument("--port", type=int, default=8080)
+	parser.add_argument("--latency", type=float, default=0.0)
+	parser.add_argument("--jitter", type=float, default=0.0)
+	parser.add_argument("--bandwidth", type=int, default=None)
+	parser.add_argument("--error-rate", type=float, default=0.0)
+	parser.add_argument("--error-status", type=int, default=500)
+	parser.add_argument("--seed", type=int, default=0)
+	args = parser.parse_args(argv)
+	server = ReplayServer(
+		args.fixture_dir, args.port, args.latency, args.jitter, args.bandwidth,
+		args.error_rate, args.error_status, args.seed
+	)
+	print("serving %s on %s" % (args.fixture_dir, server.base_uri))
+	try:
+		server.httpd.serve_forever()
+	except KeyboardInterrupt:
+		server.stop()
+
+
+if __name__ == "__main__":
+	main(sys.argv[1:])
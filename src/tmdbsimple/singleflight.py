@@ -0,0 +1,84 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+import threading
+
+
+def copyResult(data):
+	# decoded JSON is only dicts, lists and immutable values, faster than copy.deepcopy
+	if isinstance(data, dict):
+		return dict((key, copyResult(value)) for key, value in data.items())
+	if isinstance(data, list):
+		return [copyResult(value) for value in data]
+	return data
+
+
+class Call():
+
+	def __init__(self):
+		self.event = threading.Event()
+		self.result = None
+		self.error = None
+		self.waiters = 0
+
+
+class SingleFlight():
+	"""
+	Runs a function only once for concurrent callers using the same key:
+	callers arriving while the first call is in flight wait for it and get
+	a copy of its result (or its exception) instead of starting their own,
+	so a caller changing its result does not change the others'.
+	"""
+
+	def __init__(self):
+		self.lock = threading.Lock()
+		self.calls = {}
+		self.shared = 0
+
+	def do(self, key, function, *args):
+		with self.lock:
+			call = self.calls.get(key)
+			leader = call is None
+			if leader:
+				call = self.calls[key] = Call()
+			else:
+				call.waiters += 1
+				self.shared += 1
+		if not leader:
+			call.event.wait()
+			if call.error is not None:
+				raise call.error
+			return copyResult(call.result)
+		try:
+			call.result = function(*args)
+		except Exception as e:
+			call.error = e
+			raise
+		finally:
+			with self.lock:
+				del self.calls[key]
+			call.event.set()
+		# waiters copy call.result, so the leader must not change it either
+		return copyResult(call.result) if call.waiters else call.result
+
+	def getStats(self):
+		with self.lock:
+			return {"in_flight": len(self.calls), "shared": self.shared}
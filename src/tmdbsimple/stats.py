@@ -0,0 +1,127 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+import json
+import time
+import threading
+
+
+# latency histogram bucket upper bounds in milliseconds, the last bucket is open
+BUCKETS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+DUMP_INTERVAL = 300
+
+
+class Stats():
+	"""
+	Per endpoint call statistics, e.g. for "movies/info" or "tv/credits":
+	calls, errors, latency histogram, bytes transferred, HTTP status and
+	cache outcome. Set tmdbsimple.STATS to an instance to enable it.
+	"""
+
+	def __init__(self, path=None, interval=DUMP_INTERVAL):
+		self.path = path
+		self.interval = interval
+		self.lock = threading.Lock()
+		self.local = threading.local()
+		self.endpoints = {}
+		self.timer = None
+		if path:
+			self.scheduleDump()
+
+	def begin(self):
+		self.local.call = {"status": None, "size": 0, "cache": None}
+
+	def note(self, status=None, size=0, cache=None):
+		call = getattr(self.local, "call", None)
+		if call is not None:
+			if status is not None:
+				call["status"] = status
+			call["size"] += size
+			if cache is not None:
+				call["cache"] = cache
+
+	def end(self, endpoint, latency, error=False):
+		call = getattr(self.local, "call", None) or {"status": None, "size": 0, "cache": None}
+		self.local.call = None
+		latency_ms = latency * 1000
+		bucket = len(BUCKETS)
+		for i, bound in enumerate(BUCKETS):
+			if latency_ms <= bound:
+				bucket = i
+				break
+		with self.lock:
+			entry = self.endpoints.get(endpoint)
+			if entry is None:
+				entry = self.endpoints[endpoint] = {
+					"calls": 0, "errors": 0, "latency_total": 0.0, "latency_max": 0.0,
+					"histogram": [0] * (len(BUCKETS) + 1), "bytes": 0, "status": {}, "cache": {}
+				}
+			entry["calls"] += 1
+			entry["errors"] += 1 if error else 0
+			entry["latency_total"] += latency
+			entry["latency_max"] = max(entry["latency_max"], latency)
+			entry["histogram"][bucket] += 1
+			entry["bytes"] += call["size"]
+			status = str(call["status"] or "none")
+			entry["status"][status] = entry["status"].get(status, 0) + 1
+			# no cache note and no network status: the result came from a coalesced request
+			cache = call["cache"] or ("none" if call["status"] else "shared")
+			entry["cache"][cache] = entry["cache"].get(cache, 0) + 1
+
+	def getStats(self):
+		with self.lock:
+			stats = json.loads(json.dumps(self.endpoints))
+		for entry in stats.values():
+			entry["latency_avg"] = entry["latency_total"] / entry["calls"] if entry["calls"] else 0.0
+		return {"buckets_ms": BUCKETS, "endpoints": stats}
+
+	def reset(self):
+		with self.lock:
+			self.endpoints = {}
+
+	def dump(self, path=None):
+		path = path or self.path
+		data = self.getStats()
+		data["time"] = time.time()
+		with open(path, "w") as f:
+			json.dump(data, f, indent=1, sort_keys=True, separators=(",", ": "))
+
+	def scheduleDump(self):
+		self.timer = threading.Timer(self.interval, self.dumpPeriodically)
+		self.timer.daemon = True
+		self.timer.start()
+
+	def dumpPeriodically(self):
+		try:
+			self.dump()
+		except (IOError, OSError):
+			pass
+		self.scheduleDump()
+
+	def stop(self):
+		if self.timer:
+			self.timer.cancel()
+			self.timer = None
+		if self.path:
+			try:
+				self.dump()
+			except (IOError, OSError):
+				pass
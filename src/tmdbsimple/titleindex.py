@@ -0,0 +1,186 @@
+#!/usr/bin/python
+# coding=utf-8
+#
+# Copyright (C) 2018-2023 by dream-alpha
+#
+# In case of reuse of this source code please do not remove this copyright.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For more information on the GNU General Public License see:
+# <http://www.gnu.org/licenses/>.
+
+
+import re
+import os
+import math
+import bisect
+import gzip
+import json
+import threading
+import unicodedata
+import six
+
+
+MAX_ENTRIES = 200000
+THRESHOLD = 0.3
+LIMIT = 10
+NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize(title):
+	# lower case words without accents and punctuation, e.g. "Amélie!" -> "amelie"
+	title = six.ensure_text(title, errors="ignore")
+	title = unicodedata.normalize("NFKD", title)
+	title = u"".join(char for char in title if not unicodedata.combining(char))
+	return NON_WORD.sub(u" ", title.lower()).strip()
+
+
+def getTrigrams(text):
+	# like pg_trgm: every word padded with two blanks in front and one behind
+	trigrams = set()
+	for word in text.split():
+		word = u"  " + word + u" "
+		for i in range(len(word) - 2):
+			trigrams.add(word[i:i + 3])
+	return trigrams
+
+
+class TitleIndex():
+	"""
+	In-memory trigram index of resolved titles for fuzzy lookups without a
+	network call. Entries are [ident, media, title, date, poster_path,
+	backdrop_path, popularity] and are appended to the json lines file at
+	path by save(). importExport() adds the titles of a TMDB daily id
+	export file.
+	"""
+
+	def __init__(self, path=None, max_entries=MAX_ENTRIES):
+		self.path = path
+		self.max_entries = max_entries
+		self.entries = []
+		self.sizes = []
+		self.keys = {}
+		self.postings = {}
+		self.pending = []
+		self.lookups = 0
+		self.lock = threading.Lock()
+
+	def load(self):
+		if self.path and os.path.isfile(self.path):
+			with open(self.path) as f:
+				for line in f:
+					try:
+						self.addEntry(json.loads(line))
+					except (ValueError, TypeError, IndexError):
+						continue
+
+	def save(self):
+		with self.lock:
+			pending = self.pending
+			self.pending = []
+		if self.path and pending:
+			with open(self.path, "a") as f:
+				for entry in pending:
+					f.write(json.dumps(entry) + "\n")
+
+	def addEntry(self, entry, pending=False):
+		# returns True if the entry is new, with pending new and completed entries are saved by save()
+		entry = [six.ensure_str(value) if isinstance(value, six.text_type) else value for value in entry]
+		ident, media, title = entry[0], entry[1], entry[2]
+		text = normalize(title)
+		if not ident or not text:
+			return False
+		key = (media, ident, text)
+		with self.lock:
+			index = self.keys.get(key)
+			if index is not None:
+				# keep the most complete data, e.g. a search hit after an export line,
+				# load() merges the lines of an entry again
+				merged = [new or old for new, old in zip(entry, self.entries[index])]
+				if merged != self.entries[index]:
+					self.entries[index] = merged
+					if pending:
+						self.pending.append(merged)
+				return False
+			if len(self.entries) >= self.max_entries:
+				return False
+			index = len(self.entries)
+			trigrams = getTrigrams(text)
+			self.keys[key] = index
+			self.entries.append(entry)
+			self.sizes.append(len(trigrams))
+			for trigram in trigrams:
+				self.postings.setdefault(trigram, []).append(index)
+			if pending:
+				self.pending.append(entry)
+			return True
+
+	def add(self, ident, media, title, date=None, poster_path=None, backdrop_path=None, popularity=0.0):
+		# returns True if the title is new
+		return self.addEntry([ident, media, title, date, poster_path, backdrop_path, popularity], pending=True)
+
+	def importExport(self, path, media, min_popularity=0.0):
+		"""
+		Add the titles of a TMDB daily id export, e.g. movie_ids_10_18_2026.json.gz,
+		with at least min_popularity. Returns the number of new titles.
+		"""
+		count = 0
+		opener = gzip.open if path.endswith(".gz") else open
+		with opener(path, "rb") as f:
+			for line in f:
+				try:
+					item = json.loads(line.decode("utf-8"))
+				except ValueError:
+					continue
+				if item.get("adult") or (item.get("popularity") or 0) < min_popularity:
+					continue
+				title = item.get("original_title") or item.get("original_name") or item.get("name")
+				if title and self.add(item["id"], media, title, popularity=item.get("popularity") or 0.0):
+					count += 1
+		return count
+
+	def lookup(self, query, media=None, limit=LIMIT, threshold=THRESHOLD):
+		"""
+		Return up to limit entries whose title is similar to query, best first.
+		Similarity is shared trigrams / all trigrams of both titles.
+		"""
+		trigrams = getTrigrams(normalize(query))
+		if not trigrams:
+			return []
+		counts = {}
+		with self.lock:
+			self.lookups += 1
+			postings = sorted((self.postings.get(trigram, []) for trigram in trigrams), key=len)
+			# a title needs threshold * len(trigrams) shared trigrams, so it contains
+			# at least one of the rarest ones: only their postings yield candidates
+			rare = len(trigrams) - int(math.ceil(threshold * len(trigrams))) + 1
+			for posting in postings[:rare]:
+				for index in posting:
+					counts[index] = counts.get(index, 0) + 1
+			for posting in postings[rare:]:
+				# postings are sorted by index
+				for index in counts:
+					position = bisect.bisect_left(posting, index)
+					if position < len(posting) and posting[position] == index:
+						counts[index] += 1
+			candidates = []
+			for index, shared in counts.items():
+				score = float(shared) / (len(trigrams) + self.sizes[index] - shared)
+				entry = self.entries[index]
+				if score >= threshold and (media is None or entry[1] == media):
+					candidates.append((score, entry[6] or 0.0, entry))
+		candidates.sort(key=lambda candidate: (candidate[0], candidate[1]), reverse=True)
+		return [candidate[2] for candidate in candidates[:limit]]
+
+	def getStats(self):
+		with self.lock:
+			return {"entries": len(self.entries), "trigrams": len(self.postings), "lookups": self.lookups, "pending": len(self.pending)}
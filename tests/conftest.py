@@ -0,0 +1,160 @@
+# coding=utf-8
+
+import os
+import sys
+import json
+import threading
+import pytest
+from six.moves import BaseHTTPServer, socketserver
+from six.moves.urllib.parse import urlparse
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+sys.path.insert(0, SRC)
+
+import tmdbsimple as tmdb  # noqa: E402, pylint: disable=C0413
+from standins import loadPlugin  # noqa: E402, pylint: disable=C0413
+
+
+API = "https://api.themoviedb.org/3/"
+
+
+class Replay(object):
+	# a ReplayServer and the Recorder to put fixtures into it, counts the requests served
+
+	def __init__(self, fixture_dir, **kwargs):
+		self.recorder = tmdb.Recorder(fixture_dir)
+		self.server = tmdb.ReplayServer(fixture_dir, **kwargs)
+		self.requests = []
+		get_behaviour = self.server.httpd.getBehaviour
+
+		def getBehaviour():
+			self.requests.append(True)
+			return get_behaviour()
+
+		self.server.httpd.getBehaviour = getBehaviour
+		self.server.start()
+
+	def add(self, path, data, status=200, **params):
+		content = data if isinstance(data, bytes) else json.dumps(data).encode("utf-8")
+		self.recorder.record(API + path, params, status, {"Content-Type": "application/json"}, content)
+
+
+@pytest.fixture
+def client(monkeypatch):
+	# tmdbsimple with all optional components off, tests switch on what they need
+	for name, value in [
+		("API_KEY", "test"), ("RESPONSE_CACHE", None), ("RATE_LIMITER", None), ("SINGLE_FLIGHT", None),
+		("NEGATIVE_CACHE", None), ("CIRCUIT_BREAKER", None), ("STATS", None), ("RECORDER", None)
+	]:
+		monkeypatch.setattr(tmdb, name, value)
+	yield tmdb
+	tmdb.closePools()
+
+
+@pytest.fixture
+def replay(client, tmp_path, monkeypatch):
+	replay = Replay(str(tmp_path / "fixtures"))
+	monkeypatch.setattr(tmdb, "BASE_URI", replay.server.base_uri)
+	yield replay
+	replay.server.stop()
+
+
+class OriginHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+	# answers with the resources of the server and 304 if the etag matches, accepts POST and DELETE unless the resource is set to None
+	protocol_version = "HTTP/1.1"
+
+	def do_GET(self):
+		path = urlparse(self.path).path[len("/3/"):]
+		self.server.requests.append((path, self.headers.get("If-None-Match")))
+		resource = self.server.resources.get(path)
+		if resource is None:
+			status, etag, body = 404, None, b'{"status_code": 34}'
+		elif resource[0] and self.headers.get("If-None-Match") == resource[0]:
+			status, etag, body = 304, resource[0], b""
+		else:
+			status, etag, body = 200, resource[0], resource[1]
+		self.send_response(status)
+		if etag:
+			self.send_header("ETag", etag)
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def do_POST(self):
+		body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+		path = urlparse(self.path).path[len("/3/"):]
+		self.server.requests.append((self.command, path, body))
+		if path in self.server.resources and self.server.resources[path] is None:
+			status, body = 404, b'{"status_code": 34}'
+		else:
+			status, body = 201, b'{"status_code": 1, "status_message": "Success."}'
+		self.send_response(status)
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	do_DELETE = do_POST
+
+	def log_message(self, *_args):
+		return
+
+
+class OriginServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+	daemon_threads = True
+
+
+@pytest.fixture
+def origin(client, monkeypatch):
+	# a TMDB stand-in whose responses change, set them with origin.resources[path] = (etag, body)
+	server = OriginServer(("127.0.0.1", 0), OriginHandler)
+	server.resources = {}
+	server.requests = []
+	thread = threading.Thread(target=server.serve_forever)
+	thread.daemon = True
+	thread.start()
+	monkeypatch.setattr(tmdb, "BASE_URI", "http://127.0.0.1:%d" % server.server_address[1])
+	yield server
+	tmdb.closePools()
+	server.shutdown()
+	server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+	cache = tmdb.ResponseCache(str(tmp_path / "cache.db"))
+	yield cache
+	cache.close()
+
+
+class Clock(object):
+	# stands in for the time module of the modules under test
+
+	def __init__(self):
+		self.now = 1000000.0
+
+	def time(self):
+		return self.now
+
+	def sleep(self, seconds):
+		self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+	clock = Clock()
+
+	def install(*modules):
+		for module in modules:
+			monkeypatch.setattr(module, "time", clock)
+		return clock
+
+	clock.install = install
+	return clock
+
+
+@pytest.fixture(scope="session")
+def plugin(tmp_path_factory):
+	# the plugin package as "tmdbplugin", sharing the tmdbsimple module of the tests
+	return loadPlugin(str(tmp_path_factory.mktemp("volatile")) + "/")
@@ -0,0 +1,72 @@
+# coding=utf-8
+
+import os
+import sys
+import types
+import logging
+
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+class ConfigElement(object):
+
+	def __init__(self, default=None, **_kwargs):
+		self.value = default
+
+
+class ConfigSubsection(object):
+	pass
+
+
+class Language(object):
+
+	def getLanguage(self):
+		return "en_US"
+
+	def addCallback(self, callback):
+		return
+
+
+def installEnigma():
+	# stand-ins for the enigma2 modules imported by the plugin
+	config = ConfigSubsection()
+	config.plugins = ConfigSubsection()
+	modules = {
+		"Components": {},
+		"Components.config": {
+			"config": config, "ConfigSubsection": ConfigSubsection, "ConfigDirectory": ConfigElement,
+			"ConfigSelection": ConfigElement, "ConfigYesNo": ConfigElement
+		},
+		"Components.Language": {"language": Language()},
+		"Tools": {},
+		"Tools.Directories": {"resolveFilename": lambda scope, path: os.path.join(SRC, path), "SCOPE_PLUGINS": 0},
+		"Tools.LoadPixmap": {"LoadPixmap": lambda path: path},
+	}
+	for name, attributes in modules.items():
+		module = sys.modules.setdefault(name, types.ModuleType(name))
+		module.__dict__.update(attributes)
+	return config
+
+
+def loadPlugin(temp_dir, lang="de"):
+	# the plugin package as "tmdbplugin", sharing the tmdbsimple module of the caller; loaded once
+	if "tmdbplugin" in sys.modules:
+		return sys.modules["tmdbplugin"]
+	import tmdbsimple
+	config = installEnigma()
+	package = types.ModuleType("tmdbplugin")
+	package.__path__ = [SRC]
+	package.tmdbsimple = tmdbsimple
+	sys.modules["tmdbplugin"] = package
+	sys.modules["tmdbplugin.tmdbsimple"] = tmdbsimple
+	# what importing the plugin package does: config subsection, logging, locale
+	__import__("tmdbplugin.__init__")
+	sys.modules["tmdbplugin.Debug"].setLogLevel(logging.ERROR)
+	settings = config.plugins.tmdb
+	for name, value in [("lang", lang), ("cover_size", "w185"), ("backdrop_size", "w1280"), ("prefetch", True)]:
+		setattr(settings, name, ConfigElement(value))
+	# instead of /var/volatile, before the image cache is created in it
+	__import__("tmdbplugin.Utils")
+	sys.modules["tmdbplugin.Utils"].temp_dir = temp_dir
+	return package
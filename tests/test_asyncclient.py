@@ -0,0 +1,108 @@
+# coding=utf-8
+
+import json
+import pytest
+import tmdbsimple as tmdb
+
+pytest.importorskip("twisted")
+
+from twisted.internet import defer  # noqa: E402
+from twisted.trial import unittest  # noqa: E402
+from tmdbsimple import asyncclient  # noqa: E402
+
+
+class AsyncClientTest(unittest.TestCase):
+
+	@pytest.fixture(autouse=True)
+	def setUpOrigin(self, origin, cache, monkeypatch):
+		self.origin = origin
+		self.cache = cache
+		monkeypatch.setattr(tmdb, "RESPONSE_CACHE", cache)
+
+	def tearDown(self):
+		# trial fails tests that leave connections open
+		if asyncclient.agent is None:
+			return None
+		pool = asyncclient.agent._pool  # pylint: disable=W0212
+		asyncclient.agent = None
+		return pool.closeCachedConnections()
+
+	@defer.inlineCallbacks
+	def testGetIsCachedAndRevalidated(self):
+		self.origin.resources["movie/603"] = ('"v1"', b'{"id": 603, "title": "The Matrix"}')
+		info = yield asyncclient.AsyncMovies(603).info()
+		self.assertEqual(info["title"], "The Matrix")
+		yield asyncclient.AsyncMovies(603).info()
+		self.assertEqual(len(self.origin.requests), 1)
+		self.cache.expire("movie/603")
+		info = yield asyncclient.AsyncMovies(603).info()
+		self.assertEqual(info["title"], "The Matrix")
+		self.assertEqual(self.origin.requests[-1], ("movie/603", '"v1"'))
+		self.assertEqual(self.cache.getStats()["revalidations"], 1)
+
+	@defer.inlineCallbacks
+	def testConcurrentGetsShareOneRequest(self):
+		self.origin.resources["movie/603"] = (None, b'{"id": 603, "genres": []}')
+		first, second = yield defer.gatherResults([asyncclient.AsyncMovies(603).info(), asyncclient.AsyncMovies(603).info()])
+		self.assertEqual(first, second)
+		self.assertIsNot(first["genres"], second["genres"])
+		self.assertEqual(len(self.origin.requests), 1)
+		self.assertEqual(asyncclient.pending, {})
+
+	@defer.inlineCallbacks
+	def testNotFoundIsAnErrorOnlyForPostAndDelete(self):
+		self.origin.resources["movie/1/rating"] = None
+		with self.assertRaises(asyncclient.HTTPError) as context:
+			yield asyncclient.AsyncMovies(1).rating_delete()
+		self.assertEqual(context.exception.status, 404)
+		info = yield asyncclient.AsyncMovies(2).info()
+		self.assertEqual(info, {"status_code": 34})
+
+	@defer.inlineCallbacks
+	def testPostAndDeleteSendTheirPayload(self):
+		response = yield asyncclient.AsyncMovies(603).rating(value=8.5)
+		self.assertEqual(response["status_code"], 1)
+		yield asyncclient.AsyncMovies(603).rating_delete()
+		method, path, body = self.origin.requests[0]
+		self.assertEqual((method, path, json.loads(body)), ("POST", "movie/603/rating", {"value": 8.5}))
+		self.assertEqual(self.origin.requests[1][:2], ("DELETE", "movie/603/rating"))
+
+	@defer.inlineCallbacks
+	def testAccountInfoKeepsTheId(self):
+		self.origin.resources["account"] = (None, b'{"id": 77, "username": "test"}')
+		account = asyncclient.AsyncAccount("session")
+		response = yield account.info()
+		self.assertEqual(response["username"], "test")
+		self.assertEqual(account.id, 77)
+
+
+class AsyncCircuitBreakerTest(unittest.TestCase):
+
+	@pytest.fixture(autouse=True)
+	def setUpReplay(self, replay, monkeypatch):
+		replay.add("movie/603", {"id": 603})
+		replay.server.latency = 0.5
+		self.circuit_breaker = tmdb.CircuitBreaker(failures=1, probe_interval=60, probe=lambda url: False)
+		monkeypatch.setattr(tmdb, "CIRCUIT_BREAKER", self.circuit_breaker)
+		monkeypatch.setattr(tmdb, "REQUESTS_TIMEOUT", 0.1)
+
+	tearDown = AsyncClientTest.tearDown
+
+	def getFailures(self):
+		return sum(circuit["failures"] for circuit in self.circuit_breaker.getStats().values())
+
+	@defer.inlineCallbacks
+	def testCancelledByTheCallerIsNoFailure(self):
+		d = asyncclient.AsyncMovies(603).info(language="de")
+		d.addErrback(lambda failure: None if asyncclient.isCancelled(failure) else failure)
+		yield asyncclient.task.deferLater(asyncclient.reactor, 0.01, lambda: None)
+		d.cancel()
+		yield d
+		self.assertEqual(self.getFailures(), 0)
+
+	@defer.inlineCallbacks
+	def testTimeoutIsAFailure(self):
+		with self.assertRaises(Exception):
+			yield asyncclient.AsyncMovies(603).info(language="en")
+		self.assertEqual(self.getFailures(), 1)
+		self.assertTrue(self.circuit_breaker.isOpen(tmdb.BASE_URI))
@@ -0,0 +1,73 @@
+# coding=utf-8
+
+import threading
+import pytest
+import tmdbsimple as tmdb
+
+
+class Endpoint():
+	# counts the calls in flight, fails for negative ids
+	lock = threading.Lock()
+	running = 0
+	max_running = 0
+	calls = 0
+
+	def __init__(self, ident, season=None):
+		self.ident = ident
+		self.season = season
+
+	def info(self, language=None):
+		with Endpoint.lock:
+			Endpoint.calls += 1
+			Endpoint.running += 1
+			Endpoint.max_running = max(Endpoint.max_running, Endpoint.running)
+		try:
+			if self.ident < 0:
+				raise ValueError(self.ident)
+			threading.Event().wait(0.01)
+			return {"id": self.ident, "season": self.season, "language": language}
+		finally:
+			with Endpoint.lock:
+				Endpoint.running -= 1
+
+
+def testAllIdsWithBoundedConcurrency():
+	Endpoint.max_running = 0
+	results = list(tmdb.batch(Endpoint, range(20), "info", concurrency=3, language="de"))
+	assert sorted(ident for ident, _response, _error in results) == list(range(20))
+	assert all(response["language"] == "de" and error is None for _ident, response, error in results)
+	assert Endpoint.max_running <= 3
+
+
+def testErrorsDoNotAbortTheBatch():
+	results = dict((ident, (response, error)) for ident, response, error in tmdb.batch(Endpoint, [1, -2, 3], "info"))
+	assert results[1][0]["id"] == 1
+	assert isinstance(results[-2][1], ValueError)
+	assert results[3][1] is None
+
+
+def testTuplesArePassedAsArguments():
+	results = list(tmdb.batch(Endpoint, [(1399, 1), (1399, 2)], "info"))
+	assert sorted(response["season"] for _ident, response, _error in results) == [1, 2]
+
+
+def testClosingStopsNewCalls():
+	Endpoint.calls = 0
+	generator = tmdb.batch(Endpoint, range(100), "info", concurrency=2)
+	next(generator)
+	generator.close()
+	threading.Event().wait(0.1)
+	assert Endpoint.calls < 10
+
+
+def testConcurrencyBelowOneIsRejected():
+	for concurrency in (0, -1):
+		with pytest.raises(ValueError):
+			tmdb.batch(Endpoint, [1], "info", concurrency=concurrency)
+
+
+def testBatchOfEndpointCalls(replay):
+	for ident in [1, 2, 3]:
+		replay.add("movie/%s" % ident, {"id": ident})
+	results = sorted((ident, response) for ident, response, _error in tmdb.batch(tmdb.Movies, [1, 2, 3], "info"))
+	assert results == [(1, {"id": 1}), (2, {"id": 2}), (3, {"id": 3})]
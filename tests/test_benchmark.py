@@ -0,0 +1,44 @@
+# coding=utf-8
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks"))
+
+import bench_tmdb  # noqa: E402, pylint: disable=C0413
+
+
+REQUESTS_PER_VIEW = {
+	"SearchMovie[movie]": 1, "SearchMovie[tv]": 1, "SearchSeason[20 seasons]": 21,
+	"SearchPeople[movie]": 1, "SearchPeople[tv]": 22
+}
+
+
+def testPercentile():
+	values = list(range(1, 101))
+	assert bench_tmdb.percentile(values, 50) == 51
+	assert bench_tmdb.percentile(values, 99) == 99
+	assert bench_tmdb.percentile([5], 95) == 5
+
+
+def testCompareReportsRegressionsBeyondTheTolerance():
+	base = {"p50_ms": 10.0, "p95_ms": 20.0, "requests_per_view": 1.0, "bytes_per_view": 100.0}
+	report = {"a": dict(base, p50_ms=12.0), "b": dict(base, requests_per_view=2.0), "new": base}
+	assert bench_tmdb.compare(report, {"a": base, "b": base}, 0.25) == ["b requests_per_view: 2.0 > 1.0"]
+
+
+def testWarmupIsNotTimed():
+	calls = []
+	result = bench_tmdb.runScenario(calls.append, (1,), iterations=3, warmup=2)
+	assert len(calls) == 5
+	assert result["requests_per_view"] == 0
+
+
+def testScenariosAgainstTheSyntheticFixtures(plugin, replay, monkeypatch):
+	bench_tmdb.createFixtures(replay.server.fixture_dir)
+	monkeypatch.setattr(bench_tmdb.tmdb, "STATS", None)
+	for name, function, args in bench_tmdb.SCENARIOS:
+		result = bench_tmdb.runScenario(function, args, iterations=2, warmup=0)
+		assert result["requests_per_view"] == REQUESTS_PER_VIEW.get(name, 1), name
+		# far more than a 404 body: every request was answered by a fixture
+		assert result["bytes_per_view"] > 1000 * result["requests_per_view"], name
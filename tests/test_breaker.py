@@ -0,0 +1,86 @@
+# coding=utf-8
+
+import threading
+import pytest
+import tmdbsimple as tmdb
+from tmdbsimple import breaker
+
+URL = "https://api.themoviedb.org/3/movie/603"
+
+
+def testNegativeEntriesExpire(clock):
+	clock.install(breaker)
+	cache = tmdb.NegativeCache(ttl=600, empty_ttl=120)
+	assert cache.putResponse("movie/1", "movie/1", 404, b"{}")
+	assert cache.putResponse("search/multi?query=x", "search/multi", 200, b'{"page": 1, "total_results": 0}')
+	assert not cache.putResponse("search/multi?query=y", "search/multi", 200, b'{"page": 1, "total_results": 10}')
+	assert not cache.putResponse("movie/2", "movie/2", 500, b"{}")
+	clock.sleep(121)
+	assert cache.get("movie/1") == b"{}"
+	assert cache.get("search/multi?query=x") is None
+	clock.sleep(480)
+	assert cache.get("movie/1") is None
+
+
+def testNegativeCacheIsBounded():
+	cache = tmdb.NegativeCache(max_entries=2)
+	for key in ["a", "b", "c"]:
+		cache.put(key, b"{}")
+	assert cache.get("a") is None
+	assert cache.getStats() == {"hits": 0, "entries": 2}
+
+
+def testUnknownIdsAreAskedOnce(replay, monkeypatch):
+	monkeypatch.setattr(tmdb, "NEGATIVE_CACHE", tmdb.NegativeCache())
+	for _i in range(3):
+		assert tmdb.Movies(1).info()["status_code"] == 34
+	assert len(replay.requests) == 1
+
+
+class Probe():
+	# answers False until available is set
+
+	def __init__(self):
+		self.available = threading.Event()
+		self.calls = 0
+
+	def __call__(self, url):
+		self.calls += 1
+		return self.available.is_set()
+
+
+def testCircuitOpensAfterConsecutiveFailuresAndClosesAfterAProbe():
+	probe = Probe()
+	circuit_breaker = tmdb.CircuitBreaker(failures=3, probe_interval=0.01, max_probe_interval=0.01, probe=probe)
+	circuit_breaker.failure(URL)
+	circuit_breaker.failure(URL)
+	circuit_breaker.success(URL)
+	circuit_breaker.failure(URL)
+	circuit_breaker.failure(URL)
+	assert not circuit_breaker.isOpen(URL)
+	circuit_breaker.failure(URL)
+	assert circuit_breaker.isOpen(URL)
+	with pytest.raises(tmdb.CircuitOpenError):
+		circuit_breaker.check(URL)
+	circuit_breaker.check("https://image.tmdb.org/t/p/w185/a.jpg")
+	probe.available.set()
+	for _i in range(500):
+		if not circuit_breaker.isOpen(URL):
+			break
+		threading.Event().wait(0.01)
+	assert not circuit_breaker.isOpen(URL)
+	assert circuit_breaker.getStats()["api.themoviedb.org"] == {"open": False, "failures": 0, "rejected": 1}
+
+
+def testServerErrorsOpenTheCircuit(replay, monkeypatch):
+	circuit_breaker = tmdb.CircuitBreaker(failures=2, probe_interval=60, probe=lambda url: False)
+	monkeypatch.setattr(tmdb, "CIRCUIT_BREAKER", circuit_breaker)
+	replay.add("movie/603", {"id": 603})
+	replay.add("movie/604", {"id": 604})
+	assert tmdb.Movies(604).info() == {"id": 604}
+	replay.server.error_rate = 1.0
+	for _i in range(2):
+		tmdb.Movies(603).info()
+	with pytest.raises(tmdb.CircuitOpenError):
+		tmdb.Movies(604).info()
+	assert len(replay.requests) == 3
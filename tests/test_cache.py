@@ -0,0 +1,79 @@
+# coding=utf-8
+
+import tmdbsimple as tmdb
+from tmdbsimple import cache as cache_module
+
+
+def testGetRequestKeyIgnoresApiKeyAndOrder():
+	key = cache_module.getRequestKey("search/multi", {"query": "Matrix", "api_key": "secret", "language": "de"})
+	assert key == "search/multi?language=de&query=Matrix"
+	assert cache_module.getRequestKey("movie/603", {}) == "movie/603"
+
+
+def testTTLByPath(cache):
+	assert cache.getTTL("movie/popular") == 15 * cache_module.MINUTE
+	assert cache.getTTL("search/multi") == cache_module.HOUR
+	assert cache.getTTL("movie/603/credits") == 6 * cache_module.HOUR
+	assert cache.getTTL("configuration") == 3 * cache_module.DAY
+	assert cache.getTTL("unknown") == cache_module.DEFAULT_TTL
+
+
+def testSetTTLTakesPrecedenceAndIsRemovable(cache):
+	cache.setTTL(r"^movie/\d+$", cache_module.DAY)
+	assert cache.getTTL("movie/603") == cache_module.DAY
+	assert cache.getTTL("movie/603/credits") == 6 * cache_module.HOUR
+	cache.setTTL(r"^movie/\d+$", None)
+	assert cache.getTTL("movie/603") == 6 * cache_module.HOUR
+
+
+def testEntryExpiresAfterTTL(cache, clock):
+	clock.install(cache_module)
+	cache.put("search/multi?query=x", "search/multi", b"{}")
+	clock.sleep(cache_module.HOUR - 1)
+	assert cache.get("search/multi?query=x") == b"{}"
+	clock.sleep(2)
+	assert cache.get("search/multi?query=x") is None
+	assert cache.getStats()["hits"] == 1
+	assert cache.getStats()["misses"] == 1
+
+
+def testLeastRecentlyUsedEntriesAreEvicted(tmp_path, clock):
+	clock.install(cache_module)
+	cache = cache_module.ResponseCache(str(tmp_path / "lru.db"), max_size=300)
+	for name in ["a", "b", "c"]:
+		cache.put(name, "movie/1", b"x" * 100)
+		clock.sleep(1)
+	cache.get("a")
+	clock.sleep(1)
+	cache.put("d", "movie/1", b"x" * 100)
+	assert cache.get("b") is None
+	assert cache.get("a") is not None
+	assert cache.getStats()["size"] <= 300
+	cache.close()
+
+
+def testEntriesTooLargeForTheCacheAreNotStored(tmp_path):
+	cache = cache_module.ResponseCache(str(tmp_path / "small.db"), max_size=10)
+	cache.put("a", "movie/1", b"x" * 11)
+	assert cache.getStats()["entries"] == 0
+	cache.close()
+
+
+def testEntriesSurviveReopening(tmp_path):
+	path = str(tmp_path / "persistent.db")
+	cache = cache_module.ResponseCache(path)
+	cache.put("movie/603", "movie/603", b'{"id": 603}')
+	cache.close()
+	cache = cache_module.ResponseCache(path)
+	assert cache.get("movie/603") == b'{"id": 603}'
+	assert cache.getStats()["size"] == len(b'{"id": 603}')
+	cache.close()
+
+
+def testGetServesRepeatedRequestsFromTheCache(replay, cache, monkeypatch):
+	replay.add("movie/603", {"id": 603, "title": "The Matrix"}, language="de")
+	monkeypatch.setattr(tmdb, "RESPONSE_CACHE", cache)
+	for _i in range(3):
+		assert tmdb.Movies(603).info(language="de")["title"] == "The Matrix"
+	assert len(replay.requests) == 1
+	assert cache.getStats()["hits"] == 2
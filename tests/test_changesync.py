@@ -0,0 +1,85 @@
+# coding=utf-8
+
+import re
+import json
+import datetime
+import pytest
+import tmdbsimple as tmdb
+from tmdbsimple import changesync
+
+TODAY = datetime.date(2023, 8, 20)
+
+
+def testIdPatternCoversDetailsOnly():
+	pattern = re.compile(changesync.ID_PATTERN)
+	for path in ["movie/603", "movie/603/credits", "tv/1399/season/1", "tv/1399/season/1/episode/2/credits", "person/6384/combined_credits"]:
+		assert pattern.match(path), path
+	for path in ["movie/popular", "movie/603/similar_movies", "movie/603/recommendations", "tv/1399/season/1/credits/x", "search/movie", "xmovie/603"]:
+		assert not pattern.match(path), path
+
+
+def testWindowsOfAtMostTwoWeeks():
+	windows = changesync.getWindows(datetime.date(2023, 8, 1), datetime.date(2023, 8, 20))
+	assert windows == [("2023-08-01", "2023-08-14"), ("2023-08-15", "2023-08-20")]
+	assert changesync.getWindows(TODAY, TODAY) == [("2023-08-20", "2023-08-20")]
+
+
+@pytest.fixture
+def feeds(replay, cache, monkeypatch):
+	monkeypatch.setattr(changesync, "getToday", lambda: TODAY)
+	replay.add("movie/changes", {"results": [{"id": 603}], "page": 1, "total_pages": 1})
+	replay.add("tv/changes", {"results": [{"id": 1399}], "page": 1, "total_pages": 1})
+	replay.add("person/changes", {"results": [], "page": 1, "total_pages": 1})
+	replay.add("tv/season/11/changes", {"changes": []})
+	replay.add("tv/season/12/changes", {"changes": [{"key": "episode"}]})
+	for path, data in [
+		("movie/603", {"id": 603}), ("movie/604", {"id": 604}), ("movie/popular", {"results": []}),
+		("tv/1399", {"id": 1399, "seasons": [{"season_number": 1, "id": 11}, {"season_number": 2, "id": 12}]}),
+		("tv/1399/season/1", {"id": 11, "episodes": []}), ("tv/1399/season/2", {"id": 12, "episodes": []}),
+	]:
+		cache.put(path, path, json.dumps(data).encode("utf-8"))
+	return replay
+
+
+def testChangedEntriesAreExpired(feeds, cache, tmp_path):
+	sync = tmdb.ChangesSync(cache, str(tmp_path / "sync.json"))
+	sync.watermarks = dict((media, TODAY - datetime.timedelta(days=3)) for media in changesync.MEDIA)
+	assert sync.sync() == 3
+	assert cache.get("movie/603") is None
+	assert cache.get("tv/1399") is None
+	assert cache.get("tv/1399/season/2") is None
+	for path in ["movie/604", "movie/popular", "tv/1399/season/1"]:
+		assert cache.get(path) is not None, path
+	assert cache.getTTL("movie/604") == changesync.TTL
+	assert cache.getTTL("movie/popular") != changesync.TTL
+	assert tmdb.ChangesSync(cache, str(tmp_path / "sync.json")).watermarks["tv"] == TODAY
+	sync.stop()
+	assert cache.getTTL("movie/604") != changesync.TTL
+
+
+def testFirstSyncExpiresAllIdEntries(feeds, cache):
+	sync = tmdb.ChangesSync(cache)
+	assert sync.sync() == 5
+	assert cache.get("movie/popular") is not None
+	assert len(feeds.requests) == 0
+
+
+def testFailedFeedKeepsItsWatermark(feeds, cache):
+	sync = tmdb.ChangesSync(cache)
+	last = TODAY - datetime.timedelta(days=3)
+	sync.watermarks = dict((media, last) for media in changesync.MEDIA)
+	feeds.server.error_rate = 1.0
+	sync.sync()
+	assert sync.watermarks["movie"] == last
+	assert sync.getStats()["runs"] == 1
+	assert cache.get("movie/603") is not None
+
+
+def testFailedSeasonFeedKeepsTheTVWatermark(feeds, cache):
+	feeds.add("tv/season/11/changes", {"status_code": 34}, status=404)
+	sync = tmdb.ChangesSync(cache)
+	sync.watermarks = dict((media, TODAY - datetime.timedelta(days=3)) for media in changesync.MEDIA)
+	sync.sync()
+	assert sync.watermarks["tv"] == TODAY - datetime.timedelta(days=3)
+	assert sync.watermarks["movie"] == TODAY
+	assert cache.get("tv/1399/season/1") is not None
@@ -0,0 +1,92 @@
+# coding=utf-8
+
+import os
+import pytest
+
+
+@pytest.fixture
+def image_cache_module(plugin):
+	from tmdbplugin import ImageCache
+	return ImageCache
+
+
+def download(cache, name, size):
+	# what a finished downloadPage leaves behind
+	with open(cache.getDownloadPath(name), "wb") as f:
+		f.write(b"x" * size)
+	cache.add(name)
+
+
+def testModuleCacheIsInTheTempDir(image_cache_module, plugin):
+	from tmdbplugin import Utils
+	assert image_cache_module.image_cache.hot.directory == Utils.temp_dir
+
+
+def testHotTierEvictsLeastRecentlyUsed(image_cache_module, tmp_path):
+	cache = image_cache_module.ImageCache(str(tmp_path / "hot"), hot_size=250)
+	for name in ["a.jpg", "b.jpg"]:
+		download(cache, name, 100)
+	assert cache.getHotPath("a.jpg")
+	download(cache, "c.jpg", 100)
+	assert cache.getHotPath("b.jpg") is None
+	assert not os.path.exists(str(tmp_path / "hot" / "b.jpg"))
+	assert cache.getHotPath("a.jpg") and cache.getHotPath("c.jpg")
+	assert cache.getStats()["hot_size"] == 200
+
+
+def testStoreSurvivesRestarts(image_cache_module, tmp_path):
+	cache = image_cache_module.ImageCache(str(tmp_path / "hot"))
+	cache.setStore(str(tmp_path / "store"), 1000)
+	download(cache, "a.jpg", 100)
+	cache.persist("a.jpg")
+	# a restart with an empty RAM tier
+	restarted = image_cache_module.ImageCache(str(tmp_path / "hot2"))
+	restarted.setStore(str(tmp_path / "store"), 1000)
+	assert restarted.getHotPath("a.jpg") is None
+	path = restarted.restore("a.jpg")
+	assert path == str(tmp_path / "hot2" / "a.jpg")
+	assert restarted.getHotPath("a.jpg") == path
+	assert restarted.getStats()["store_hits"] == 1
+	assert restarted.restore("b.jpg") is None
+
+
+def testStoreBudget(image_cache_module, tmp_path):
+	cache = image_cache_module.ImageCache(str(tmp_path / "hot"))
+	cache.setStore(str(tmp_path / "store"), 250)
+	for name in ["a.jpg", "b.jpg", "c.jpg"]:
+		download(cache, name, 100)
+		cache.persist(name)
+	assert cache.getStats()["store_files"] == 2
+	cache.setStore(str(tmp_path / "store"), 150)
+	assert cache.getStats()["store_files"] == 1
+	cache.setStore("", 0)
+	assert "store_files" not in cache.getStats()
+
+
+def testPartialDownloadsAreDroppedOnStartup(image_cache_module, tmp_path):
+	hot = tmp_path / "hot"
+	hot.mkdir()
+	(hot / "a.jpg.tmp").write_bytes(b"x")
+	(hot / "b.jpg").write_bytes(b"xx")
+	cache = image_cache_module.ImageCache(str(hot))
+	assert sorted(os.listdir(str(hot))) == ["b.jpg"]
+	assert cache.getStats()["hot_size"] == 2
+	with open(cache.getDownloadPath("c.jpg"), "wb") as f:
+		f.write(b"x")
+	cache.removeDownload("c.jpg")
+	cache.removeDownload("c.jpg")
+	assert sorted(os.listdir(str(hot))) == ["b.jpg"]
+
+
+def testAliasesFindTheLastPictureOfAnIdent(image_cache_module, tmp_path, monkeypatch):
+	monkeypatch.setattr(image_cache_module, "MAX_ALIASES", 2)
+	cache = image_cache_module.ImageCache(str(tmp_path / "hot"))
+	name = cache.getName("backdrop", 603, "https://image.tmdb.org/t/p/w1280/a.jpg")
+	assert name == image_cache_module.getFileName("https://image.tmdb.org/t/p/w1280/a.jpg")
+	assert cache.getName("backdrop", "603", None) == name
+	download(cache, name, 10)
+	assert cache.getPath("backdrop", 603) == cache.hot.getPath(name)
+	cache.getName("cover", 1, "u1")
+	cache.getName("cover", 2, "u2")
+	assert cache.getName("backdrop", 603, None) is None
+	assert len(cache.aliases) == 2
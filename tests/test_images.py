@@ -0,0 +1,56 @@
+# coding=utf-8
+
+import json
+import tmdbsimple as tmdb
+from tmdbsimple import images
+
+
+def testSizeLadder():
+	config = tmdb.ImageConfig()
+	assert config.getSize("poster", "w185") == "w185"
+	assert config.getSize("poster", "w200") == "w342"
+	assert config.getSize("backdrop", "w1920") == "original"
+	assert config.getSize("profile", "h632") == "h632"
+	assert config.getSize("unknown", "w185") == "original"
+
+
+def testImageUrlWithoutNetwork(monkeypatch):
+	config = tmdb.ImageConfig()
+	monkeypatch.setattr(config, "refresh", None)
+	assert config.getImageUrl("/abc.jpg", "w185") == "https://image.tmdb.org/t/p/w185/abc.jpg"
+	assert config.getImageUrl(None) is None
+	assert config.getImageUrl("None") is None
+	assert tmdb.ImageConfig(base_url="http://127.0.0.1:1/t/p/").getImageUrl("x.jpg", "w500", "still") == "http://127.0.0.1:1/t/p/original/x.jpg"
+
+
+def testModuleLevelImageUrl(monkeypatch):
+	monkeypatch.setattr(tmdb, "IMAGE_CONFIG", tmdb.ImageConfig(base_url="http://images/"))
+	assert tmdb.getImageUrl("/abc.jpg", "w300", "backdrop") == "http://images/w300/abc.jpg"
+	assert tmdb.getImageUrl("") is None
+
+
+def testRefreshUpdatesAndPersists(replay, tmp_path):
+	replay.add("configuration", {"images": dict(images.DEFAULTS, secure_base_url="https://cdn/", poster_sizes=["w100", "original"])})
+	path = str(tmp_path / "images.json")
+	config = tmdb.ImageConfig(path)
+	assert config.refresh()
+	assert not config.refresh()
+	assert config.getImageUrl("a.jpg", "w92") == "https://cdn/w100/a.jpg"
+	assert len(replay.requests) == 1
+	with open(path) as f:
+		assert json.load(f)["images"]["secure_base_url"] == "https://cdn/"
+	assert tmdb.ImageConfig(path).getImageUrl("a.jpg", "w92") == "https://cdn/w100/a.jpg"
+
+
+def testFailedRefreshKeepsTheDefaults(replay, clock):
+	clock.install(images)
+	replay.server.error_rate = 1.0
+	replay.server.error_status = 500
+	config = tmdb.ImageConfig()
+	assert not config.refresh()
+	assert not config.refresh()
+	assert len(replay.requests) == 1
+	clock.sleep(images.RETRY_INTERVAL)
+	config.refresh()
+	assert len(replay.requests) == 2
+	assert config.getBaseUrl() == images.DEFAULTS["secure_base_url"]
@@ -0,0 +1,35 @@
+# coding=utf-8
+
+import json
+import tmdbsimple as tmdb
+from tmdbsimple import jsonbackend
+
+
+def testSelectBackendFallsBackToJson():
+	assert jsonbackend.selectBackend(["no_such_json_module"]) == ("json", json.loads)
+	name, loads = jsonbackend.selectBackend()
+	assert name in jsonbackend.BACKENDS
+	assert loads('{"a": [1]}') == {"a": [1]}
+
+
+def testProjectFields():
+	data = {"page": 1, "total_pages": 5, "results": [{"id": 1, "title": "a", "overview": "x"}, {"id": 2, "overview": "y"}]}
+	assert jsonbackend.projectFields(data, ["total_pages", "results.id", "results.title"]) == {
+		"total_pages": 5, "results": [{"id": 1, "title": "a"}, {"id": 2}]
+	}
+	assert jsonbackend.projectFields(data, ["results", "results.id"]) == {"results": [{"id": 1}, {"id": 2}]}
+	assert jsonbackend.projectFields(data, ["missing"]) == {}
+
+
+def testFieldsAndDecoderOfGet(replay, monkeypatch):
+	decoded = []
+
+	def loads(content):
+		decoded.append(content)
+		return json.loads(content)
+
+	monkeypatch.setattr(tmdb, "JSON_LOADS", loads)
+	replay.add("search/movie", {"page": 1, "results": [{"id": 603, "title": "The Matrix", "overview": "..."}]}, query="matrix")
+	response = tmdb.Search().movie(query="matrix", fields=["results.id", "results.title"])
+	assert response == {"results": [{"id": 603, "title": "The Matrix"}]}
+	assert len(decoded) == 1
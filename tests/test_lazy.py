@@ -0,0 +1,58 @@
+# coding=utf-8
+
+import os
+import sys
+import json
+import pkgutil
+import importlib
+import subprocess
+import pytest
+import tmdbsimple as tmdb
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+
+def runFresh(code):
+	# imports in a fresh interpreter, the test process has loaded everything already
+	script = "import sys, json\nsys.path.insert(0, %r)\n%s" % (SRC, code)
+	return json.loads(subprocess.check_output([sys.executable, "-c", script]))
+
+
+def testPackageImportLoadsNoSubmodules():
+	loaded = runFresh(
+		"import tmdbsimple\n"
+		"print(json.dumps(sorted(name for name in sys.modules if name.startswith(('tmdbsimple.', 'requests', 'sqlite3')))))"
+	)
+	assert loaded == []
+
+
+def testFirstAccessLoadsOnlyItsSubmodule():
+	loaded = runFresh(
+		"import tmdbsimple\n"
+		"before = tmdbsimple.isLoaded('movies')\n"
+		"tmdbsimple.Movies\n"
+		"print(json.dumps([before, tmdbsimple.isLoaded('movies'), tmdbsimple.isLoaded('tv'), 'requests' in sys.modules]))"
+	)
+	assert loaded == [False, True, False, False]
+
+
+def testPublicNames():
+	assert set(tmdb.__all__) <= set(dir(tmdb))
+	assert tmdb.Movies.__module__ == "tmdbsimple.movies"
+	assert callable(tmdb.batch)
+	with pytest.raises(AttributeError):
+		tmdb.NoSuchName  # pylint: disable=W0104
+
+
+def testNoPublicNameIsASubmodule():
+	submodules = set(name for _finder, name, _ispkg in pkgutil.iter_modules(tmdb.__path__))
+	assert not submodules & (set(tmdb.__all__) | set(tmdb._LAZY) | set(tmdb._DEFAULTS))  # pylint: disable=W0212
+	importlib.import_module("tmdbsimple.batching")
+	assert callable(tmdb.batch)
+
+
+def testDefaultsAreCreatedOnce(monkeypatch):
+	monkeypatch.delitem(tmdb.__dict__, "SINGLE_FLIGHT", raising=False)
+	flight = tmdb.SINGLE_FLIGHT
+	assert isinstance(flight, tmdb.SingleFlight)
+	assert tmdb.SINGLE_FLIGHT is flight
@@ -0,0 +1,47 @@
+# coding=utf-8
+
+import pytest
+from tmdbsimple import models
+
+
+def testDefaultsForMissingAndNullValues():
+	movie = models.Movie({"id": 603, "title": u"Matrix", "overview": None})
+	assert movie.id == 603
+	assert movie.title == "Matrix" and isinstance(movie.title, str)
+	assert movie.overview == ""
+	assert movie.genres == []
+	assert movie.genres is not models.Movie().genres
+	assert movie.cast == [] and movie.crew == []
+
+
+def testCreditsAtTheTopLevelOrAppended():
+	cast = [{"id": 1, "name": "Keanu Reeves", "character": "Neo"}]
+	appended = models.Movie({"id": 603, "credits": {"cast": cast, "crew": [{"id": 2, "job": "Director"}]}})
+	credits = models.WithCredits({"cast": cast})
+	assert appended.cast[0].character == "Neo"
+	assert appended.crew[0].job == "Director"
+	assert credits.cast[0].name == "Keanu Reeves"
+
+
+def testNestedModels():
+	tv = models.TV({"id": 1399, "seasons": [{"season_number": 1, "episodes": [{"episode_number": 1, "guest_stars": [{"id": 5}]}]}]})
+	episode = tv.seasons[0].episodes[0]
+	assert isinstance(episode, models.Episode)
+	assert episode.guest_stars[0].id == 5
+	assert tv.asDict()["seasons"][0]["episodes"][0]["guest_stars"][0]["id"] == 5
+
+
+def testAsDictRoundTrip():
+	data = {"id": 1, "name": "Keanu Reeves", "also_known_as": ["Neo"]}
+	person = models.Person(data)
+	assert models.Person(person.asDict()).asDict() == person.asDict()
+	assert dict((key, person.asDict()[key]) for key in data) == data
+
+
+def testModelsHaveNoInstanceDict():
+	hit = models.SearchHit({"id": 1, "name": "Dark", "first_air_date": "2017-12-01", "profile_path": "/p.jpg"})
+	with pytest.raises(AttributeError):
+		hit.unknown = 1
+	assert not hasattr(hit, "__dict__")
+	assert (hit.getTitle(), hit.getDate(), hit.getImagePath()) == ("Dark", "2017-12-01", "/p.jpg")
+	assert repr(hit) == "<SearchHit id=1>"
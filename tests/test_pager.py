@@ -0,0 +1,65 @@
+# coding=utf-8
+
+import threading
+import pytest
+import tmdbsimple as tmdb
+
+
+class Pages():
+	# a paged endpoint with 3 results per page
+
+	def __init__(self, total_pages, fail_page=None):
+		self.total_pages = total_pages
+		self.fail_page = fail_page
+		self.requested = []
+		self.lock = threading.Lock()
+
+	def popular(self, page=1, language=None):
+		with self.lock:
+			self.requested.append(page)
+		if page == self.fail_page:
+			raise IOError(page)
+		results = [(page, i, language) for i in range(3)] if page <= self.total_pages else []
+		return {"page": page, "total_pages": self.total_pages, "results": results}
+
+
+def testAllResultsInOrder():
+	pages = Pages(4)
+	results = list(tmdb.iteratePages(pages.popular, language="de"))
+	assert results == [(page, i, "de") for page in range(1, 5) for i in range(3)]
+	assert sorted(pages.requested) == [1, 2, 3, 4]
+
+
+def testMaxItemsLimitsTheRequestedPages():
+	pages = Pages(100)
+	results = list(tmdb.iteratePages(pages.popular, max_items=7))
+	assert len(results) == 7
+	assert sorted(pages.requested) == [1, 2, 3]
+
+
+def testWithoutPrefetchPagesAreRequestedWhenReached():
+	pages = Pages(3)
+	iterator = tmdb.iteratePages(pages.popular, prefetch=0)
+	assert [next(iterator) for _i in range(4)] == [(1, 0, None), (1, 1, None), (1, 2, None), (2, 0, None)]
+	assert pages.requested == [1, 2]
+	assert len(list(iterator)) == 5
+	assert pages.requested == [1, 2, 3]
+
+
+def testStartPage():
+	pages = Pages(3)
+	assert [result[0] for result in tmdb.iteratePages(pages.popular, start_page=3)] == [3, 3, 3]
+
+
+def testErrorsAreRaisedWhenTheirPageIsReached():
+	pages = Pages(5, fail_page=2)
+	iterator = tmdb.iteratePages(pages.popular)
+	assert [next(iterator) for _i in range(3)] == [(1, i, None) for i in range(3)]
+	with pytest.raises(IOError):
+		next(iterator)
+
+
+def testPagesOfAnEndpoint(replay):
+	for page in [1, 2]:
+		replay.add("movie/popular", {"page": page, "total_pages": 2, "results": [{"id": page}]}, page=str(page))
+	assert list(tmdb.iteratePages(tmdb.Movies().popular)) == [{"id": 1}, {"id": 2}]
@@ -0,0 +1,122 @@
+# coding=utf-8
+
+import os
+import pytest
+
+pytest.importorskip("twisted")
+
+from twisted.internet import defer, reactor, task  # noqa: E402
+from twisted.trial import unittest  # noqa: E402
+import tmdbsimple as tmdb  # noqa: E402
+
+
+class Instance():
+
+	def setPixmap(self, pixmap):
+		self.pixmap = pixmap
+
+
+class Pixmap():
+	# fires shown with the picture path, or None if the picture was hidden
+
+	def __init__(self):
+		self.instance = Instance()
+		self.shown = defer.Deferred()
+
+	def show(self):
+		self.shown.callback(self.instance.pixmap)
+
+	def hide(self):
+		self.shown.callback(None)
+
+
+class PictureTest(unittest.TestCase):
+
+	@pytest.fixture(autouse=True)
+	def setUpOrigin(self, plugin, origin, tmp_path):
+		from tmdbplugin import Picture, ImageCache
+		self.module = Picture
+		self.image_cache = ImageCache.image_cache
+		self.picture = Picture.Picture()
+		self.origin = origin
+		self.store = str(tmp_path / "store")
+		self.base = "http://127.0.0.1:%s/3/" % origin.server_address[1]
+		origin.resources["cover.jpg"] = (None, b"jpeg data")
+
+	def tearDown(self):
+		self.image_cache.setStore("", 0)
+		tmdb.closePools()
+
+	def waitForPending(self):
+		# prefetched pictures have no callback to wait for
+		def check():
+			if self.module.pending:
+				return task.deferLater(reactor, 0.01, check)
+			return None
+		return check()
+
+	@defer.inlineCallbacks
+	def testConcurrentCallersShareOneDownload(self):
+		pixmaps = [Pixmap() for _i in range(3)]
+		for pixmap in pixmaps:
+			self.picture.showPicture(pixmap, "cover", 603, self.base + "cover.jpg")
+		paths = yield defer.gatherResults([pixmap.shown for pixmap in pixmaps])
+		self.assertEqual(len(set(paths)), 1)
+		with open(paths[0], "rb") as f:
+			self.assertEqual(f.read(), b"jpeg data")
+		self.assertEqual(len(self.origin.requests), 1)
+		self.assertEqual(self.module.pending, {})
+		pixmap = Pixmap()
+		self.picture.showPicture(pixmap, "cover", 603, None)
+		path = yield pixmap.shown
+		self.assertEqual(path, paths[0])
+		self.assertEqual(len(self.origin.requests), 1)
+
+	@defer.inlineCallbacks
+	def testPicturesShareOneKeepAliveConnection(self):
+		tmdb.closePools()
+		for ident in range(10, 13):
+			pixmap = Pixmap()
+			self.picture.showPicture(pixmap, "cover", ident, self.base + "cover.jpg?%s" % ident)
+			path = yield pixmap.shown
+			self.assertTrue(path)
+		stats = tmdb.getPoolStats()["127.0.0.1:%s" % self.origin.server_address[1]]
+		self.assertEqual((stats["requests"], stats["connections"], stats["reused"]), (3, 1, 2))
+
+	@defer.inlineCallbacks
+	def testFailedDownloadLeavesNoPartialFile(self):
+		pixmap = Pixmap()
+		self.picture.showPicture(pixmap, "cover", 1, self.base + "missing.jpg")
+		path = yield pixmap.shown
+		self.assertIsNone(path)
+		self.assertEqual(self.module.pending, {})
+		self.assertEqual([name for name in os.listdir(self.image_cache.hot.directory) if name.endswith(".tmp")], [])
+
+	@defer.inlineCallbacks
+	def testPrefetchedPictureIsShownWithoutRequest(self):
+		url = self.base + "cover.jpg?prefetch"
+		self.picture.prefetchPicture("cover", 2, url)
+		yield self.waitForPending()
+		self.assertEqual(len(self.origin.requests), 1)
+		self.picture.prefetchPicture("cover", 2, url)
+		pixmap = Pixmap()
+		self.picture.showPicture(pixmap, "cover", 2, url)
+		path = yield pixmap.shown
+		self.assertTrue(path)
+		self.assertEqual(len(self.origin.requests), 1)
+
+	@defer.inlineCallbacks
+	def testPictureIsRestoredFromTheStore(self):
+		url = self.base + "cover.jpg?store"
+		self.image_cache.setStore(self.store, 1000)
+		name = self.image_cache.getName("cover", 3, url)
+		with open(os.path.join(self.store, name), "wb") as f:
+			f.write(b"stored")
+		self.image_cache.setStore("", 0)
+		self.image_cache.setStore(self.store, 1000)
+		pixmap = Pixmap()
+		self.picture.showPicture(pixmap, "cover", 3, url)
+		path = yield pixmap.shown
+		with open(path, "rb") as f:
+			self.assertEqual(f.read(), b"stored")
+		self.assertEqual(self.origin.requests, [])
@@ -0,0 +1,33 @@
+# coding=utf-8
+
+import pytest
+import tmdbsimple as tmdb
+from tmdbsimple import planner
+
+
+def testPlanCollapsesResourcesIntoOneCall():
+	plan = planner.planAppended(tmdb.Movies(603), ["info", "credits", "releases", "credits"])
+	assert plan == [[("credits", "credits"), ("releases", "releases")]]
+	assert planner.planAppended(tmdb.Movies(603), ["info"]) == [[]]
+	assert planner.planAppended(tmdb.TV(1399), ["watch_providers"]) == [[("watch_providers", "watch/providers")]]
+
+
+def testPlanHonoursTheAppendLimit(monkeypatch):
+	monkeypatch.setattr(planner, "MAX_APPEND", 2)
+	plan = planner.planAppended(tmdb.Movies(603), ["credits", "releases", "images", "videos", "keywords"])
+	assert [len(chunk) for chunk in plan] == [2, 2, 1]
+
+
+def testResourcesWithoutSubPathAreRejected():
+	with pytest.raises(ValueError):
+		planner.planAppended(tmdb.Movies(603), ["latest"])
+
+
+def testFetchAppendedMakesOneRequest(replay):
+	replay.add(
+		"movie/603", {"id": 603, "title": "The Matrix", "credits": {"cast": []}, "releases": {"countries": []}},
+		language="de", append_to_response="credits,releases"
+	)
+	result = tmdb.fetchAppended(tmdb.Movies(603), ["info", "credits", "releases"], language="de")
+	assert result == {"info": {"id": 603, "title": "The Matrix"}, "credits": {"cast": []}, "releases": {"countries": []}}
+	assert len(replay.requests) == 1
@@ -0,0 +1,22 @@
+# coding=utf-8
+
+import tmdbsimple as tmdb
+from tmdbsimple import WebRequests
+
+
+def testRequestsShareOneKeepAliveConnection(replay):
+	replay.add("movie/603", {"id": 603}, language="en")
+	for _i in range(5):
+		assert tmdb.Movies(603).info(language="en") == {"id": 603}
+	stats = tmdb.getPoolStats()
+	assert list(stats.values()) == [{"requests": 5, "connections": 1, "reused": 4}]
+
+
+def testOneSessionPerHost(client):
+	requests = WebRequests.WebRequests()
+	session = requests.getPooledSession("http://localhost:1/3/movie/1")
+	assert requests.getPooledSession("http://localhost:1/3/tv/1") is session
+	assert requests.getPooledSession("http://localhost:2/3/movie/1") is not session
+	tmdb.closePools()
+	assert not WebRequests.sessions
+	assert requests.getPooledSession("http://localhost:1/3/movie/1") is not session
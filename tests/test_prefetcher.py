@@ -0,0 +1,75 @@
+# coding=utf-8
+
+import threading
+import pytest
+import tmdbsimple as tmdb
+
+
+@pytest.fixture
+def prefetcher_module(plugin, client):
+	from tmdbplugin import Prefetcher
+	return Prefetcher
+
+
+def waitFor(condition):
+	for _i in range(500):
+		if condition():
+			return True
+		threading.Event().wait(0.01)
+	return False
+
+
+def testJobsRunInOrderAndFailuresAreCounted(prefetcher_module):
+	prefetcher = prefetcher_module.Prefetcher()
+	done = []
+	prefetcher.start([(done.append, (1,)), (int, ("x",)), (done.append, (2,))])
+	assert waitFor(lambda: prefetcher.getStats()["pending"] == 0 and prefetcher.thread is None)
+	assert done == [1, 2]
+	assert prefetcher.getStats() == {"done": 2, "failed": 1, "dropped": 0, "pending": 0}
+
+
+def testRestartingAfterTheQueueRanEmpty(prefetcher_module):
+	prefetcher = prefetcher_module.Prefetcher()
+	done = []
+	for i in range(200):
+		prefetcher.start([(done.append, (i,))])
+		if i % 2:
+			threading.Event().wait(0.001)
+	assert waitFor(lambda: prefetcher.thread is None)
+	assert done[-1] == 199
+	assert prefetcher.getStats()["done"] + prefetcher.getStats()["dropped"] == 200
+
+
+def testPauseDefersJobs(prefetcher_module):
+	prefetcher = prefetcher_module.Prefetcher(pause=0.3)
+	done = []
+	prefetcher.pause()
+	prefetcher.start([(done.append, (1,))])
+	threading.Event().wait(0.1)
+	assert done == []
+	assert waitFor(lambda: done == [1])
+
+
+def testRateLimiterReserveIsLeftToForegroundRequests(prefetcher_module, monkeypatch):
+	limiter = tmdb.RateLimiter(rate=0.001, burst=11.5)
+	monkeypatch.setattr(tmdb, "RATE_LIMITER", limiter)
+	prefetcher = prefetcher_module.Prefetcher(reserve=10)
+
+	def job():
+		limiter.reserve()
+
+	prefetcher.start([(job, ())] * 5)
+	assert waitFor(lambda: prefetcher.getStats()["done"] == 2)
+	threading.Event().wait(0.2)
+	assert prefetcher.getStats()["done"] == 2
+	prefetcher.cancel()
+
+
+def testCancelDropsPendingJobs(prefetcher_module):
+	prefetcher = prefetcher_module.Prefetcher(pause=60)
+	prefetcher.pause()
+	prefetcher.start([(int, ())] * 3)
+	prefetcher.start([(int, ())] * 2)
+	prefetcher.cancel()
+	prefetcher.start([(int, ())])
+	assert prefetcher.getStats() == {"done": 0, "failed": 0, "dropped": 5, "pending": 0}
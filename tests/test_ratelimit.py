@@ -0,0 +1,62 @@
+# coding=utf-8
+
+import pytest
+import tmdbsimple as tmdb
+from tmdbsimple import ratelimit
+
+
+def testBurstThenRate(clock):
+	clock.install(ratelimit)
+	limiter = ratelimit.RateLimiter(rate=4.0, burst=2)
+	assert limiter.reserve() == 0
+	assert limiter.reserve() == 0
+	assert limiter.reserve() == pytest.approx(0.25)
+	assert limiter.reserve() == pytest.approx(0.5)
+	assert limiter.getStats()["waits"] == 2
+	clock.sleep(10)
+	assert limiter.getTokens() == 2
+
+
+def testAcquireSleepsForTheReservedWait(clock):
+	clock.install(ratelimit)
+	limiter = ratelimit.RateLimiter(rate=2.0, burst=1)
+	start = clock.time()
+	for _i in range(5):
+		limiter.acquire()
+	assert clock.time() - start == pytest.approx(2.0)
+
+
+def testParseRetryAfter(clock):
+	clock.install(ratelimit)
+	assert ratelimit.parseRetryAfter("3") == 3.0
+	assert ratelimit.parseRetryAfter("-1") == 0
+	assert ratelimit.parseRetryAfter(None) is None
+	assert ratelimit.parseRetryAfter("soon") is None
+	clock.now = 1690884000.0  # Tue, 01 Aug 2023 10:00:00 GMT
+	assert ratelimit.parseRetryAfter("Tue, 01 Aug 2023 10:00:30 GMT") == 30.0
+
+
+def testThrottleBlocksAllCallers(clock):
+	clock.install(ratelimit)
+	limiter = ratelimit.RateLimiter()
+	delay = limiter.throttle(0, "2")
+	assert 2.0 <= delay <= 3.0
+	assert limiter.getTokens() == 0
+	assert limiter.reserve() == pytest.approx(delay)
+	clock.sleep(delay)
+	assert limiter.getTokens() > 0
+	assert 4.0 <= limiter.throttle(2) <= 6.0
+
+
+def testTooManyRequestsAreRetriedThenRaised(replay, clock, monkeypatch):
+	clock.install(ratelimit)
+	monkeypatch.setattr(tmdb, "RATE_LIMITER", ratelimit.RateLimiter(retries=2))
+	replay.add("movie/603", {"id": 603})
+	replay.server.error_status = 429
+	replay.server.error_rate = 1.0
+	with pytest.raises(tmdb.RateLimitError):
+		tmdb.Movies(603).info()
+	assert len(replay.requests) == 3
+	assert tmdb.RATE_LIMITER.getStats()["throttled"] == 2
+	replay.server.error_rate = 0.0
+	assert tmdb.Movies(603).info() == {"id": 603}
@@ -0,0 +1,77 @@
+# coding=utf-8
+
+import os
+import time
+import tmdbsimple as tmdb
+from tmdbsimple.replay import ReplayServer
+
+
+def testRecordOnlyFinalAnswers(tmp_path):
+	recorder = tmdb.Recorder(str(tmp_path))
+	url = "https://api.themoviedb.org/3/movie/603"
+	assert recorder.record(url, {"api_key": "x"}, 200, {}, b'{"id": 603}')
+	assert recorder.record(url + "1", {}, 404, {}, b'{"status_code": 34}')
+	for status in [304, 429, 500]:
+		assert not recorder.record(url, {}, status, {}, b"")
+	assert len(os.listdir(str(tmp_path))) == 4
+	server = ReplayServer(str(tmp_path))
+	assert server.getFixture("/3/movie/603")[1] == b'{"id": 603}'
+
+
+def testRecordedSessionReplaysOffline(origin, cache, tmp_path, monkeypatch):
+	fixtures = str(tmp_path / "fixtures")
+	monkeypatch.setattr(tmdb, "RECORDER", tmdb.Recorder(fixtures))
+	monkeypatch.setattr(tmdb, "RESPONSE_CACHE", cache)
+	origin.resources["movie/603"] = ('"v1"', b'{"id": 603}')
+	tmdb.Movies(603).info(language="de")
+	# the 304 of the revalidation must not replace the recorded body
+	cache.expire("movie/603")
+	tmdb.Movies(603).info(language="de")
+	assert origin.requests[-1] == ("movie/603", '"v1"')
+
+	server = ReplayServer(fixtures).start()
+	try:
+		monkeypatch.setattr(tmdb, "BASE_URI", server.base_uri)
+		monkeypatch.setattr(tmdb, "RESPONSE_CACHE", None)
+		assert tmdb.Movies(603).info(language="de") == {"id": 603}
+		assert tmdb.Movies(604).info() == {"success": False, "status_code": 34, "status_message": "The resource you requested could not be found."}
+	finally:
+		tmdb.closePools()
+		server.stop()
+
+
+def testRecordedPicturesReplayOffline(origin, tmp_path, monkeypatch):
+	fixtures = str(tmp_path / "fixtures")
+	monkeypatch.setattr(tmdb, "RECORDER", tmdb.Recorder(fixtures))
+	origin.resources["w185/cover.jpg"] = (None, b"jpeg data")
+	url = tmdb.ImageConfig(base_url=tmdb.BASE_URI + "/3/").getImageUrl("/cover.jpg", "w185")
+	tmdb.downloadFile(url, str(tmp_path / "recorded.jpg"))
+
+	server = ReplayServer(fixtures).start()
+	try:
+		monkeypatch.setattr(tmdb, "RECORDER", None)
+		url = tmdb.ImageConfig(base_url=server.base_uri + "/3/").getImageUrl("/cover.jpg", "w185")
+		path = str(tmp_path / "replayed.jpg")
+		tmdb.downloadFile(url, path)
+		with open(path, "rb") as f:
+			assert f.read() == b"jpeg data"
+		assert len(origin.requests) == 1
+	finally:
+		tmdb.closePools()
+		server.stop()
+
+
+def testFixtureWithoutParametersIsTheFallback(replay):
+	replay.add("movie/603", {"id": 603})
+	assert tmdb.Movies(603).info(language="fr") == {"id": 603}
+
+
+def testInjectedErrorsAndLatency(replay):
+	replay.add("movie/603", {"id": 603})
+	replay.server.error_rate = 1.0
+	assert tmdb.Movies(603).info()["status_code"] == 25
+	replay.server.error_rate = 0.0
+	replay.server.latency = 0.2
+	start = time.time()
+	tmdb.Movies(603).info()
+	assert time.time() - start >= 0.2
@@ -0,0 +1,48 @@
+# coding=utf-8
+
+import tmdbsimple as tmdb
+from tmdbsimple import cache as cache_module
+
+
+def testConditionalHeadersFromStoredValidators(cache):
+	cache.put("a", "movie/1", b"{}", '"v1"', "Tue, 01 Aug 2023 10:00:00 GMT")
+	cache.put("b", "movie/2", b"{}")
+	assert cache.getConditionalHeaders("a") == {"If-None-Match": '"v1"', "If-Modified-Since": "Tue, 01 Aug 2023 10:00:00 GMT"}
+	assert cache.getConditionalHeaders("b") == {}
+	assert cache.getConditionalHeaders("unknown") == {}
+
+
+def testRevalidateRenewsTheEntry(cache, clock):
+	clock.install(cache_module)
+	cache.put("movie/1", "movie/1", b'{"id": 1}', '"v1"')
+	clock.sleep(7 * cache_module.HOUR)
+	assert cache.get("movie/1") is None
+	assert cache.revalidate("movie/1") == b'{"id": 1}'
+	assert cache.get("movie/1") == b'{"id": 1}'
+	assert cache.revalidate("unknown") is None
+
+
+def testExpiredEntryIsRevalidatedWithItsEtag(origin, cache, monkeypatch):
+	monkeypatch.setattr(tmdb, "RESPONSE_CACHE", cache)
+	origin.resources["movie/1"] = ('"v1"', b'{"id": 1, "title": "one"}')
+	assert tmdb.Movies(1).info()["title"] == "one"
+	cache.expire("movie/1")
+	assert tmdb.Movies(1).info()["title"] == "one"
+	assert origin.requests == [("movie/1", None), ("movie/1", '"v1"')]
+	assert cache.getStats()["revalidations"] == 1
+	# the renewed entry is fresh again
+	assert tmdb.Movies(1).info()["title"] == "one"
+	assert len(origin.requests) == 2
+
+
+def testChangedResourceReplacesTheEntry(origin, cache, monkeypatch):
+	monkeypatch.setattr(tmdb, "RESPONSE_CACHE", cache)
+	origin.resources["movie/1"] = ('"v1"', b'{"id": 1, "title": "one"}')
+	tmdb.Movies(1).info()
+	origin.resources["movie/1"] = ('"v2"', b'{"id": 1, "title": "two"}')
+	cache.expire("movie/1")
+	assert tmdb.Movies(1).info()["title"] == "two"
+	assert cache.getStats()["revalidations"] == 0
+	cache.expire("movie/1")
+	tmdb.Movies(1).info()
+	assert origin.requests[-1] == ("movie/1", '"v2"')
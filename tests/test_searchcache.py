@@ -0,0 +1,115 @@
+# coding=utf-8
+
+import pytest
+
+
+@pytest.fixture
+def search_cache_module(plugin):
+	from tmdbplugin import SearchCache
+	return SearchCache
+
+
+def getRows(count, name="x"):
+	return [((name, i, "movie", None, None), ) for i in range(count)]
+
+
+def testSearchKeyIsNormalized(search_cache_module):
+	key = search_cache_module.getSearchKey("Tatort - Der Fall", "de", 1, "w185")
+	assert key == search_cache_module.getSearchKey("tatort der fall", "de", 1, "w185")
+	assert key != search_cache_module.getSearchKey("tatort der fall", "en", 1, "w185")
+
+
+def testEntriesExpire(search_cache_module, clock):
+	clock.install(search_cache_module)
+	cache = search_cache_module.SearchCache(ttl=60)
+	cache.put("a", 3, getRows(2))
+	clock.sleep(60)
+	assert cache.get("a") == (3, getRows(2))
+	clock.sleep(1)
+	assert cache.get("a") is None
+	assert cache.getStats() == {"entries": 0, "size": 0, "hits": 1, "misses": 1}
+
+
+def testLeastRecentlyUsedAreEvicted(search_cache_module):
+	cache = search_cache_module.SearchCache(max_entries=2)
+	cache.put("a", 1, getRows(1))
+	cache.put("b", 1, getRows(1))
+	cache.get("a")
+	cache.put("c", 1, getRows(1))
+	assert cache.get("b") is None
+	assert cache.get("a") is not None
+
+
+def testSizeIsBounded(search_cache_module):
+	size = search_cache_module.getRowsSize(getRows(10))
+	cache = search_cache_module.SearchCache(max_size=2 * size)
+	for key in "abc":
+		cache.put(key, 1, getRows(10))
+	assert cache.getStats()["entries"] == 2
+	assert cache.getStats()["size"] == 2 * size
+	cache.put("a", 1, getRows(1))
+	assert cache.getStats()["size"] == size + search_cache_module.getRowsSize(getRows(1))
+
+
+def testCallersGetTheirOwnRowList(search_cache_module):
+	cache = search_cache_module.SearchCache()
+	cache.put("a", 1, getRows(2))
+	cache.get("a")[1].pop()
+	assert len(cache.get("a")[1]) == 2
+
+
+@pytest.fixture
+def search_main(plugin, replay):
+	from tmdbplugin import SearchMain, SearchCache
+	SearchCache.search_cache.clear()
+	SearchCache.page_cache.clear()
+	yield SearchMain.SearchMain()
+	SearchCache.search_cache.clear()
+	SearchCache.page_cache.clear()
+
+
+def testRepeatedSearchesAreServedFromTheRowCache(search_main, replay):
+	replay.add("search/multi", {"page": 1, "total_pages": 1, "results": [{"media_type": "movie", "id": 603, "title": "The Matrix", "release_date": "1999-03-30"}]})
+	totalpages, rows = search_main.getSearchData(0, "The Matrix", 0, 1)
+	assert totalpages == 1
+	assert rows[0][0][:3] == ("The Matrix (Movie, 1999)", 603, "movie")
+	assert search_main.getSearchData(0, "the  matrix", 0, 1) == (totalpages, rows)
+	assert len(replay.requests) == 1
+
+
+def testEmptySearchesAreNotCached(search_main, replay):
+	replay.add("search/multi", {"page": 1, "total_pages": 0, "results": []})
+	assert search_main.getSearchData(0, "nothing", 0, 1) == (0, [])
+	search_main.getSearchData(0, "nothing", 0, 1)
+	assert len(replay.requests) == 2
+
+
+def addPage(replay, path, page, ident):
+	replay.add(path, {"page": page, "total_pages": 3, "results": [{"id": ident, "title": "Movie %s" % ident}]}, language="de", page=str(page))
+
+
+def testMenuPagesAreCachedPerPage(search_main, replay):
+	for page in [1, 2]:
+		addPage(replay, "movie/popular", page, page)
+	assert search_main.getSearchData(3, "", 0, 2)[1][0][0][1] == 2
+	assert search_main.getSearchData(3, "", 603, 2)[1][0][0][1] == 2
+	assert search_main.getSearchData(3, "", 0, 1)[1][0][0][1] == 1
+	assert len(replay.requests) == 2
+
+
+def testRowsWithoutMediaTypeAreMovies(search_main, replay):
+	addPage(replay, "movie/popular", 1, 603)
+	assert search_main.getSearchData(3, "", 0, 1)[1][0][0][2] == "movie"
+
+
+def testSimilarMoviesDependOnTheIdent(search_main, replay):
+	addPage(replay, "movie/603/similar_movies", 1, 604)
+	addPage(replay, "movie/604/similar_movies", 1, 605)
+	assert search_main.getSearchData(4, "", 603, 1)[1][0][0][1] == 604
+	assert search_main.getSearchData(4, "", 604, 1)[1][0][0][1] == 605
+	assert search_main.getSearchData(4, "", 603, 1)[1][0][0][1] == 604
+	assert len(replay.requests) == 2
+
+
+def testPageCacheExpiresSoonerThanSearches(search_cache_module):
+	assert search_cache_module.page_cache.ttl == search_cache_module.PAGE_TTL < search_cache_module.search_cache.ttl
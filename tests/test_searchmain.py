@@ -0,0 +1,85 @@
+# coding=utf-8
+
+import threading
+import pytest
+
+
+class Reactor():
+	# calls back in the calling thread instead of the reactor thread
+
+	def callFromThread(self, function, *args):
+		function(*args)
+
+
+@pytest.fixture
+def search_main(plugin, monkeypatch):
+	from tmdbplugin import SearchMain
+	monkeypatch.setattr(SearchMain, "reactor", Reactor())
+	return SearchMain.SearchMain()
+
+
+def getPrefixResult(search_main, words, hits, cancelled=None):
+	# hits maps a prefix to its rows, a prefix mapped to an exception raises it
+	searched = []
+	results = []
+
+	def getSearchData(menu_selection, text, ident, page):
+		searched.append(text)
+		result = hits.get(text, [])
+		if isinstance(result, Exception):
+			raise result
+		return (1 if result else 0), result
+
+	search_main.getSearchData = getSearchData
+	search_main.getPrefixResult(words, cancelled or threading.Event(), lambda *args: results.append(args))
+	return searched, results
+
+
+def testFullTitleHitMakesOneSearch(search_main):
+	searched, results = getPrefixResult(search_main, ["the", "matrix", "1999"], {"the matrix 1999": ["row"]})
+	assert searched == ["the matrix 1999"]
+	assert results == [(1, ["row"], "the matrix 1999")]
+
+
+def testLongestPrefixWithHitsWins(search_main):
+	hits = {"the matrix": ["matrix"], "the": ["the"]}
+	searched, results = getPrefixResult(search_main, ["the", "matrix", "reloaded", "xyz"], hits)
+	assert searched[0] == "the matrix reloaded xyz"
+	assert results == [(1, ["matrix"], "the matrix")]
+
+
+def testFailingSearchCountsAsEmpty(search_main):
+	hits = {"the matrix reloaded": IOError("timeout"), "the matrix": ["matrix"]}
+	_searched, results = getPrefixResult(search_main, ["the", "matrix", "reloaded"], hits)
+	assert results == [(1, ["matrix"], "the matrix")]
+	_searched, results = getPrefixResult(search_main, ["the", "matrix"], {"the matrix": IOError("timeout")})
+	assert results == [(0, [], "the matrix")]
+
+
+def testNoHitsAtAll(search_main):
+	searched, results = getPrefixResult(search_main, ["xyz", "abc"], {})
+	assert sorted(searched) == ["xyz", "xyz abc"]
+	assert results == [(0, [], "xyz abc")]
+
+
+def testCancelledSearchDoesNotCallBack(search_main):
+	cancelled = threading.Event()
+	cancelled.set()
+	_searched, results = getPrefixResult(search_main, ["the", "matrix"], {"the": ["the"]}, cancelled)
+	assert results == []
+
+
+def testHangingSearchIsNotWaitedFor(search_main, monkeypatch):
+	from tmdbplugin import SearchMain
+	monkeypatch.setattr(SearchMain, "JOIN_TIMEOUT", 0.2)
+	release = threading.Event()
+
+	class Hanging(dict):
+		def get(self, text, default=None):
+			if text == "the matrix":
+				release.wait(5)
+			return dict.get(self, text, default)
+
+	_searched, results = getPrefixResult(search_main, ["the", "matrix", "xyz"], Hanging({"the": ["the"]}))
+	release.set()
+	assert results == [(1, ["the"], "the")]
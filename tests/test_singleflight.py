@@ -0,0 +1,101 @@
+# coding=utf-8
+
+import time
+import threading
+import pytest
+import tmdbsimple as tmdb
+from tmdbsimple.singleflight import SingleFlight, copyResult
+
+
+def runConcurrently(flight, function, count):
+	# starts count callers, function blocks until all of them joined the flight
+	results = []
+	errors = []
+
+	def call():
+		try:
+			results.append(flight.do("key", function))
+		except Exception as e:
+			errors.append(e)
+
+	threads = [threading.Thread(target=call) for _i in range(count)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join(10)
+	return results, errors
+
+
+def waitForWaiters(flight, count):
+	while True:
+		with flight.lock:
+			call = flight.calls.get("key")
+			if call and call.waiters == count:
+				return
+		time.sleep(0.001)
+
+
+def testConcurrentCallersShareOneCall():
+	flight = SingleFlight()
+	calls = []
+
+	def function():
+		calls.append(True)
+		waitForWaiters(flight, 3)
+		return {"results": [{"id": 1}]}
+
+	results, errors = runConcurrently(flight, function, 4)
+	assert not errors
+	assert len(calls) == 1
+	assert results == [{"results": [{"id": 1}]}] * 4
+	# every caller got its own copy
+	assert len(set(id(result["results"]) for result in results)) == 4
+	assert flight.getStats() == {"in_flight": 0, "shared": 3}
+
+
+def testErrorsAreRaisedForAllCallers():
+	flight = SingleFlight()
+
+	def function():
+		waitForWaiters(flight, 2)
+		raise ValueError("failed")
+
+	results, errors = runConcurrently(flight, function, 3)
+	assert not results
+	assert [str(error) for error in errors] == ["failed"] * 3
+	assert flight.do("key", lambda: 1) == 1
+
+
+def testSingleCallerGetsTheResultItself():
+	result = {"id": 1}
+	assert SingleFlight().do("key", lambda: result) is result
+
+
+def testCopyResult():
+	data = {"a": [{"b": 1}, 2], "c": "d"}
+	copy = copyResult(data)
+	assert copy == data
+	assert copy["a"] is not data["a"]
+	assert copy["a"][0] is not data["a"][0]
+
+
+@pytest.fixture
+def flight(client, monkeypatch):
+	flight = SingleFlight()
+	monkeypatch.setattr(tmdb, "SINGLE_FLIGHT", flight)
+	return flight
+
+
+def testIdenticalRequestsAreCoalesced(replay, flight):
+	replay.add("movie/603", {"id": 603, "genres": [{"id": 28}]})
+	replay.server.latency = 0.2
+	results = []
+	threads = [threading.Thread(target=lambda: results.append(tmdb.Movies(603).info())) for _i in range(4)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join(10)
+	assert len(results) == 4
+	assert len(replay.requests) == 1
+	results[0]["genres"].append({"id": 12})
+	assert results[1]["genres"] == [{"id": 28}]
@@ -0,0 +1,78 @@
+# coding=utf-8
+
+import threading
+import pytest
+import tmdbsimple as tmdb
+from tmdbsimple import cache as cache_module
+
+
+@pytest.fixture
+def stale_cache(tmp_path, clock, monkeypatch):
+	clock.install(cache_module)
+	cache = tmdb.ResponseCache(str(tmp_path / "stale.db"), max_stale=cache_module.DAY)
+	monkeypatch.setattr(tmdb, "RESPONSE_CACHE", cache)
+	yield cache
+	cache.close()
+
+
+def waitForRefresh(cache):
+	for _i in range(500):
+		with cache.lock:
+			if not cache.refreshing:
+				return
+		threading.Event().wait(0.01)
+
+
+def testStaleEntryIsServedAndRefreshed(origin, stale_cache, clock):
+	changed = []
+	stale_cache.addListener(lambda path, key: changed.append(path))
+	origin.resources["movie/1"] = ('"v1"', b'{"title": "one"}')
+	tmdb.Movies(1).info()
+	origin.resources["movie/1"] = ('"v2"', b'{"title": "two"}')
+	clock.sleep(7 * cache_module.HOUR)
+	assert tmdb.Movies(1).info()["title"] == "one"
+	waitForRefresh(stale_cache)
+	assert origin.requests[-1] == ("movie/1", '"v1"')
+	assert changed == ["movie/1"]
+	assert tmdb.Movies(1).info()["title"] == "two"
+	assert len(origin.requests) == 2
+
+
+def testUnchangedEntryIsRevalidatedWithoutNotification(origin, stale_cache, clock):
+	changed = []
+	stale_cache.addListener(lambda path, key: changed.append(path))
+	origin.resources["movie/1"] = ('"v1"', b'{"title": "one"}')
+	tmdb.Movies(1).info()
+	clock.sleep(7 * cache_module.HOUR)
+	tmdb.Movies(1).info()
+	waitForRefresh(stale_cache)
+	assert stale_cache.getStats()["revalidations"] == 1
+	assert changed == []
+
+
+def testDeletedEntryIsRemoved(origin, stale_cache, clock):
+	changed = []
+	stale_cache.addListener(lambda path, key: changed.append(path))
+	origin.resources["movie/1"] = (None, b'{"title": "one"}')
+	tmdb.Movies(1).info()
+	del origin.resources["movie/1"]
+	clock.sleep(7 * cache_module.HOUR)
+	assert tmdb.Movies(1).info()["title"] == "one"
+	waitForRefresh(stale_cache)
+	assert changed == ["movie/1"]
+	assert tmdb.Movies(1).info()["status_code"] == 34
+
+
+def testEntriesBeyondMaxStaleAreFetched(origin, stale_cache, clock):
+	origin.resources["movie/1"] = (None, b'{"title": "one"}')
+	tmdb.Movies(1).info()
+	origin.resources["movie/1"] = (None, b'{"title": "two"}')
+	clock.sleep(6 * cache_module.HOUR + cache_module.DAY + 1)
+	assert tmdb.Movies(1).info()["title"] == "two"
+
+
+def testOnlyOneRefreshPerEntry(stale_cache):
+	assert stale_cache.startRefresh("movie/1")
+	assert not stale_cache.startRefresh("movie/1")
+	stale_cache.endRefresh("movie/1")
+	assert stale_cache.startRefresh("movie/1")
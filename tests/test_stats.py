@@ -0,0 +1,54 @@
+# coding=utf-8
+
+import json
+import tmdbsimple as tmdb
+
+
+def testLatencyHistogramAndOutcomes():
+	stats = tmdb.Stats()
+	for latency, status in [(0.005, 200), (0.3, 200), (10.0, 404)]:
+		stats.begin()
+		stats.note(status=status, size=100)
+		stats.note(cache="miss")
+		stats.end("movies/info", latency)
+	stats.begin()
+	stats.end("movies/info", 0.001, error=True)
+	entry = stats.getStats()["endpoints"]["movies/info"]
+	assert entry["calls"] == 4
+	assert entry["errors"] == 1
+	assert entry["histogram"] == [2, 0, 0, 0, 0, 1, 0, 0, 0, 1]
+	assert entry["bytes"] == 300
+	assert entry["status"] == {"200": 2, "404": 1, "none": 1}
+	assert entry["cache"] == {"miss": 3, "shared": 1}
+	assert entry["latency_max"] == 10.0
+	stats.reset()
+	assert stats.getStats()["endpoints"] == {}
+
+
+def testCallsOfEndpointsAreRecorded(replay, cache, monkeypatch):
+	monkeypatch.setattr(tmdb, "STATS", tmdb.Stats())
+	monkeypatch.setattr(tmdb, "RESPONSE_CACHE", cache)
+	replay.add("movie/603", {"id": 603})
+	tmdb.Movies(603).info()
+	tmdb.Movies(603).info()
+	entry = tmdb.STATS.getStats()["endpoints"]["movies/info"]
+	assert entry["calls"] == 2
+	assert entry["cache"] == {"miss": 1, "hit": 1}
+	assert entry["status"] == {"200": 1, "none": 1}
+	assert entry["bytes"] == len(b'{"id": 603}')
+
+
+def testDumpAndStop(tmp_path):
+	path = tmp_path / "stats.json"
+	stats = tmdb.Stats(str(path), interval=3600)
+	stats.begin()
+	stats.end("movies/info", 0.1)
+	stats.stop()
+	assert stats.timer is None
+	assert json.loads(path.read_text())["endpoints"]["movies/info"]["calls"] == 1
+
+
+def testStopIgnoresAnUnwritablePath(tmp_path):
+	stats = tmdb.Stats(str(tmp_path / "missing" / "stats.json"), interval=3600)
+	stats.stop()
+	assert stats.timer is None
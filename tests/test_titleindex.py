@@ -0,0 +1,113 @@
+# coding=utf-8
+
+import gzip
+import json
+import random
+import tmdbsimple as tmdb
+from tmdbsimple import titleindex
+
+
+def testNormalize():
+	assert titleindex.normalize(u"Amélie!") == u"amelie"
+	assert titleindex.normalize("Star Wars: Episode IV") == u"star wars episode iv"
+	assert titleindex.normalize(b"L\xc3\xa9on") == u"leon"
+	assert titleindex.getTrigrams(u"ab") == set([u"  a", u" ab", u"ab "])
+
+
+def testFuzzyLookup():
+	index = tmdb.TitleIndex()
+	index.add(603, "movie", "The Matrix", "1999-03-30", "/m.jpg", None, 80.0)
+	index.add(604, "movie", "The Matrix Reloaded", popularity=50.0)
+	index.add(1399, "tv", "Game of Thrones")
+	assert [entry[0] for entry in index.lookup("matrix")] == [603, 604]
+	assert index.lookup("The Matrx")[0][0] == 603
+	assert index.lookup("game of throne", media="tv")[0][2] == "Game of Thrones"
+	assert index.lookup("matrix", media="tv") == []
+	assert index.lookup("!!!") == []
+	assert index.lookup("matrix", limit=1)[0][3] == "1999-03-30"
+
+
+def testPopularityBreaksTies():
+	index = tmdb.TitleIndex()
+	index.add(1, "movie", "Solaris", popularity=5.0)
+	index.add(2, "movie", "Solaris", popularity=20.0)
+	assert [entry[0] for entry in index.lookup("Solaris")] == [2, 1]
+
+
+def testLookupFindsWhatAFullScanFinds():
+	rng = random.Random(1)
+	words = ["star", "wars", "matrix", "love", "night", "dark", "city", "the", "of", "return", "king", "lost"]
+	index = tmdb.TitleIndex()
+	for ident in range(1, 500):
+		index.add(ident, "movie", " ".join(rng.choice(words) for _i in range(rng.randint(1, 4))))
+	for query in ["star wars", "dark night", "the lost city", "retrun of the king", "mtrix"]:
+		trigrams = titleindex.getTrigrams(titleindex.normalize(query))
+		expected = set()
+		for entry in index.entries:
+			title_trigrams = titleindex.getTrigrams(titleindex.normalize(entry[2]))
+			if float(len(trigrams & title_trigrams)) / len(trigrams | title_trigrams) >= titleindex.THRESHOLD:
+				expected.add(entry[0])
+		assert set(entry[0] for entry in index.lookup(query, limit=1000)) == expected, query
+
+
+def testDuplicatesKeepTheMostCompleteData():
+	index = tmdb.TitleIndex()
+	assert index.add(603, "movie", "The Matrix")
+	assert not index.add(603, "movie", "the matrix!", "1999-03-30", "/m.jpg")
+	assert index.lookup("matrix")[0][3:5] == ["1999-03-30", "/m.jpg"]
+	assert index.getStats()["entries"] == 1
+
+
+def testMaxEntries():
+	index = tmdb.TitleIndex(max_entries=2)
+	for ident in [1, 2, 3]:
+		index.add(ident, "movie", "Title %s" % ident)
+	assert index.getStats()["entries"] == 2
+
+
+def testSaveAppendsAndLoadRestores(tmp_path):
+	path = str(tmp_path / "titles.jsonl")
+	index = tmdb.TitleIndex(path)
+	index.add(603, "movie", u"Amélie")
+	index.save()
+	index.add(1399, "tv", "Dark")
+	index.save()
+	assert index.getStats()["pending"] == 0
+	with open(path, "a") as f:
+		f.write("broken\n")
+	loaded = tmdb.TitleIndex(path)
+	loaded.load()
+	assert loaded.getStats()["entries"] == 2
+	assert loaded.lookup("amelie")[0][0] == 603
+	assert loaded.getStats()["pending"] == 0
+
+
+def testCompletedEntriesAreSaved(tmp_path):
+	path = str(tmp_path / "titles.jsonl")
+	index = tmdb.TitleIndex(path)
+	index.add(603, "movie", "The Matrix")
+	index.save()
+	index.add(603, "movie", "The Matrix", "1999-03-30", "/m.jpg")
+	index.add(603, "movie", "The Matrix")
+	index.save()
+	with open(path) as f:
+		assert len(f.readlines()) == 2
+	loaded = tmdb.TitleIndex(path)
+	loaded.load()
+	assert loaded.getStats()["entries"] == 1
+	assert loaded.lookup("matrix")[0][3:5] == ["1999-03-30", "/m.jpg"]
+
+
+def testImportExport(tmp_path):
+	path = str(tmp_path / "movie_ids_10_18_2026.json.gz")
+	with gzip.open(path, "wb") as f:
+		for item in [
+			{"id": 1, "original_title": "Popular", "popularity": 10.0, "adult": False},
+			{"id": 2, "original_title": "Obscure", "popularity": 0.1, "adult": False},
+			{"id": 3, "original_title": "Adult", "popularity": 50.0, "adult": True},
+		]:
+			f.write((json.dumps(item) + "\n").encode("utf-8"))
+		f.write(b"not json\n")
+	index = tmdb.TitleIndex()
+	assert index.importExport(path, "movie", min_popularity=1.0) == 1
+	assert index.lookup("popular")[0][:3] == [1, "movie", "Popular"]